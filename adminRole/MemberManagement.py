@@ -1,8 +1,13 @@
-from database import Database
+from adminRole.member_import import import_members, validate_member_fields
+from database import Database, like_prefix
+from userRole import member_profile
+from utils.member_photos import make_thumbnail
+from utils.paged_search import PAGE_SIZE, PagedSearch
+from utils.task_runner import TaskRunner
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import re
-import cv2
+
+SEARCH_COLUMNS = ("member_id", "name", "email", "contact")   # each has an index
 
 class MemberManagement:
     def __init__(self, parent, go_back_callback):
@@ -18,6 +23,7 @@ class MemberManagement:
 
         self.main_frame = tk.Frame(self.parent, padx=15, pady=15)
         self.main_frame.pack(expand=True, fill="both")
+        self.runner = TaskRunner(self.main_frame)
 
         self.input_frame = tk.LabelFrame(self.main_frame, text="Member Details", padx=15, pady=15)
         self.input_frame.pack(padx=10, pady=10, fill="x")
@@ -70,8 +76,17 @@ class MemberManagement:
         tk.Button(self.button_frame, text="Update Member", command=self.update_member, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Delete Member", command=self.delete_member, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Clear Fields", command=self.clear_entries, **button_style).pack(side="left", padx=5)
+        tk.Button(self.button_frame, text="Import…", command=self.import_members, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Back to Admin Panel", command=self.go_back_callback, font=("Arial", 14), bg="#033974", fg="white", bd=0, padx=10, pady=5).pack(side="right", padx=5)
 
+        # Search + paging bar; member_id is the keyset ("" = first page)
+        self.search = PagedSearch(
+            self.main_frame, self.runner, "Search (ID, name, email, contact):",
+            fetch=self._fetch_members, key_of=lambda row: row[0], show=self._show_members,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load members: {e}"),
+            noun="members", first_key="",
+        )
+
         self.tree_frame = tk.Frame(self.main_frame, padx=10, pady=5)
         self.tree_frame.pack(expand=True, fill="both")
 
@@ -106,6 +121,7 @@ class MemberManagement:
             messagebox.showinfo("Photo Loaded", "Image loaded successfully!")
 
     def capture_photo(self):
+        import cv2  # OpenCV is slow to import; only the camera needs it
         cap = cv2.VideoCapture(0)
         ret, frame = cap.read()
         if ret:
@@ -136,67 +152,67 @@ class MemberManagement:
             self.entries["contact"].insert(0, values[4])
 
     def validate_inputs(self):
-        member_id = self.entries["member_id"].get().strip()
-        name = self.entries["name"].get().strip()
-        age = self.entries["age"].get().strip()
-        email = self.entries["email"].get().strip()
-        contact = self.entries["contact"].get().strip()
-
-        if not re.fullmatch(r'\d{3}', member_id):
-            messagebox.showwarning("Input Error", "Member ID must be exactly 3 digits (numbers only).")
-            return None
-        if not name:
-            messagebox.showwarning("Input Error", "Name is required.")
-            return None
-        if not re.fullmatch(r'\d{2}', age):
-            messagebox.showwarning("Input Error", "Invalid Age format.")
-            return None
-        if not re.fullmatch(r"[^@]+@[^@]+\.[^@]+", email):
-            messagebox.showwarning("Input Error", "Invalid email format.")
-            return None
-        if not re.fullmatch(r'\d{10}', contact):
-            messagebox.showwarning("Input Error", "Contact number must be exactly 10 digits (numbers only).")
+        try:
+            return validate_member_fields(*(self.entries[f].get() for f in ("member_id", "name", "age", "email", "contact")))
+        except ValueError as e:
+            messagebox.showwarning("Input Error", str(e))
             return None
 
-        return member_id, name,age, email, contact
+    def _execute(self, sql, params):
+        """Worker thread: run one write statement, return the affected row count."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+            rows = cursor.rowcount
+            cursor.close()
+        member_profile.invalidate()   # names/photos shown from the profile cache
+        return rows
+
+    def _save_member(self, sql, before, photo, after):
+        """Worker thread: write a member with its photo and a thumbnail made from it."""
+        thumb = make_thumbnail(photo) if photo else None
+        return self._execute(sql, (*before, photo, thumb, *after))
 
     def add_member(self):
         data = self.validate_inputs()
         if not data:
             return
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO members (member_id, name,age, email, contact, photo) VALUES (%s, %s,%s, %s, %s, %s)", (*data, self.photo_data))
-            conn.commit()
+
+        def done(_rows):
             messagebox.showinfo("Success", "Member added successfully!")
             self.load_members()
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add member: {e}")
-        finally:
-            conn.close()
+
+        self.runner.submit(
+            self._save_member,
+            "INSERT INTO members (member_id, name,age, email, contact, photo, photo_thumb) VALUES (%s, %s,%s, %s, %s, %s, %s)",
+            data, self.photo_data, (),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to add member: {e}"),
+        )
 
     def update_member(self):
         data = self.validate_inputs()
         if not data:
             return
         member_id, name, age,email, contact = data
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE members SET name=%s, age=%s,email=%s, contact=%s, photo=%s WHERE member_id=%s", (name, age,email, contact, self.photo_data, member_id))
-            conn.commit()
-            if cursor.rowcount:
+
+        def done(rows):
+            if rows:
                 messagebox.showinfo("Success", "Member updated successfully!")
             else:
                 messagebox.showwarning("Not Found", "Member ID not found.")
             self.load_members()
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update member: {e}")
-        finally:
-            conn.close()
+
+        self.runner.submit(
+            self._save_member,
+            "UPDATE members SET name=%s, age=%s,email=%s, contact=%s, photo=%s, photo_thumb=%s WHERE member_id=%s",
+            (name, age,email, contact), self.photo_data, (member_id,),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to update member: {e}"),
+        )
 
     def delete_member(self):
         member_id = self.entries["member_id"].get().strip()
@@ -205,33 +221,85 @@ class MemberManagement:
             return
         if not messagebox.askyesno("Confirm", f"Delete member ID: {member_id}?"):
             return
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM members WHERE member_id=%s", (member_id,))
-            conn.commit()
-            if cursor.rowcount:
+
+        def done(rows):
+            if rows:
                 messagebox.showinfo("Deleted", "Member deleted successfully!")
             else:
                 messagebox.showwarning("Not Found", "Member not found.")
             self.load_members()
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete member: {e}")
-        finally:
-            conn.close()
 
+        self.runner.submit(
+            self._execute, "DELETE FROM members WHERE member_id=%s", (member_id,),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to delete member: {e}"),
+        )
+
+    # ---------- Bulk import ----------
+    def import_members(self):
+        path = filedialog.askopenfilename(title="Import members", filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        # Optional: members without a photo file are imported without one
+        photo_dir = filedialog.askdirectory(title="Folder with member photos (Cancel for none)") or None
+
+        def finished(stats):
+            member_profile.invalidate()
+            msg = (f"{stats['inserted']} member(s) imported in {stats['seconds']:.1f}s "
+                   f"({stats['photos']} with photos)\n"
+                   f"{stats['duplicates']} already members\n"
+                   f"{stats['rejected']} rejected")
+            for line, reason in stats["reject_sample"][:5]:
+                msg += f"\n  line {line}: {reason}"
+            messagebox.showinfo("Import", msg)
+
+        def failed(e):
+            member_profile.invalidate()
+            messagebox.showerror("Import Error", f"Import failed: {e}")
+
+        self.search.run_import(
+            import_members, path, photo_dir, self.db,
+            progress_text=lambda s: f"Importing… {s['inserted']} added, {s['duplicates']} existing, {s['rejected']} rejected",
+            on_success=finished, on_error=failed,
+        )
+
+    # ---------- Search and paging ----------
     def load_members(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        try:
-            conn = self.db.connect()
+        """(Re)load the current page of the current search."""
+        self.search.reload()
+
+    def _fetch_members(self, term, after):
+        """Worker thread: up to PAGE_SIZE + 1 members with member_id > after.
+
+        A search is a UNION of prefix matches, one per indexed column, each
+        already cut to one page in key order, so no branch reads more than
+        a page past the keyset position.
+        """
+        cols = "member_id, name, age, email, contact"
+        limit = PAGE_SIZE + 1       # one extra row tells us there's a next page
+        if term:
+            pattern = like_prefix(term)
+            branches = " UNION ".join(
+                f"(SELECT {cols} FROM members WHERE {col} LIKE %s AND member_id > %s "
+                f"ORDER BY member_id LIMIT {limit})"
+                for col in SEARCH_COLUMNS
+            )
+            sql = f"SELECT {cols} FROM ({branches}) AS hits ORDER BY member_id LIMIT {limit}"
+            params = tuple(v for _col in SEARCH_COLUMNS for v in (pattern, after))
+        else:
+            sql = f"SELECT {cols} FROM members WHERE member_id > %s ORDER BY member_id LIMIT {limit}"
+            params = (after,)
+
+        with self.db.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT member_id, name, age,email, contact FROM members ORDER BY member_id")
-            for row in cursor.fetchall():
-                self.tree.insert("", tk.END, values=row)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load members: {e}")
-        finally:
-            conn.close()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
 
+    def _show_members(self, rows):
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        for row in rows:
+            self.tree.insert("", tk.END, values=row)
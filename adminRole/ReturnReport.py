@@ -3,7 +3,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import mysql.connector
 from database import Database
-from datetime import datetime
+from adminRole import return_stats
+from utils.task_runner import TaskRunner
+from collections import deque
+
+COLUMNS = ("user_id", "book_id", "borrow_date", "expected_return_date", "actual_return_date", "overdue_days", "fine")
+# Appended to every sort so the keyset is (nearly) unique and pages never overlap
+TIE_BREAK = ("user_id", "book_id", "borrow_date", "actual_return_date")
+PAGE_SIZE = 200
+MAX_PAGES = 3          # rows kept in the Treeview: at most PAGE_SIZE * MAX_PAGES
+EDGE = 0.1             # load more when the view is this close to either end
 
 class ReturnReport:
     def __init__(self, parent, content_frame, title_font, label_font, button_font, go_back_callback):
@@ -15,6 +24,16 @@ class ReturnReport:
         self.go_back_callback = go_back_callback
         self.db = Database()
 
+        # Paging state (reset by _reset_pages)
+        self.sort_col = "actual_return_date"
+        self.sort_desc = True
+        self._pages = deque()       # [(iids, first_key, last_key)], top to bottom
+        self._offset = 0            # absolute position of the first loaded row
+        self._more_after = False
+        self._fetching = False
+        self._gen = 0               # bumps on re-sort; late pages of an old sort are dropped
+        self._total = None
+
     def clear_frame(self):
         for widget in self.content_frame.winfo_children():
             widget.destroy()
@@ -28,14 +47,21 @@ class ReturnReport:
         # Treeview for return history
         tree_frame = tk.Frame(self.content_frame, bg="white")
         tree_frame.pack(fill="both", expand=True, padx=0, pady=0)
+        self.runner = TaskRunner(tree_frame)
 
-        columns = ("user_id", "book_id", "borrow_date", "expected_return_date", "actual_return_date", "overdue_days", "fine")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        self.count_label = tk.Label(tree_frame, font=self.label_font, bg="white", fg="#555", anchor="w")
+        self.count_label.pack(fill="x", padx=4)
 
-        for col in columns:
-            self.tree.heading(col, text=col.replace("_", " ").title())
+        self.tree = ttk.Treeview(tree_frame, columns=COLUMNS, show="headings")
+
+        for col in COLUMNS:
+            self.tree.heading(col, text=col.replace("_", " ").title(),
+                              command=lambda c=col: self._sort_by(c))
             self.tree.column(col, anchor="center")
 
+        self.yscroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        self.yscroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
 
         # Fetch data
@@ -72,37 +98,202 @@ class ReturnReport:
             bd=0
         ).pack(pady=10)
 
+    # ---------- Paged history ----------
     def populate_treeview(self):
-        try:
-            conn = self.db.connect()
+        """(Re)load the history from the top in the current sort order."""
+        self._reset_pages()
+        self.runner.submit(self._count_rows, on_success=self._set_total, on_error=self._on_db_error)
+        self._load()
+
+    def _reset_pages(self):
+        self._gen += 1
+        self._pages.clear()
+        self._offset = 0
+        self._more_after = False
+        self._fetching = False
+        self.tree.delete(*self.tree.get_children())
+        for col in COLUMNS:
+            arrow = (" ▼" if self.sort_desc else " ▲") if col == self.sort_col else ""
+            self.tree.heading(col, text=col.replace("_", " ").title() + arrow)
+
+    def _sort_by(self, col):
+        # Server-side sort: a second click on the same column flips the direction
+        if col == self.sort_col:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_col, self.sort_desc = col, False
+        self.populate_treeview()
+
+    def _key_columns(self):
+        return (self.sort_col,) + tuple(c for c in TIE_BREAK if c != self.sort_col)
+
+    def _key_of(self, row):
+        return tuple(row[COLUMNS.index(c)] for c in self._key_columns())
+
+    def _pages_key(self, last):
+        if not self._pages:
+            return None
+        return self._pages[-1][2] if last else self._pages[0][1]
+
+    def _count_rows(self):
+        # The summary buckets already hold the count; no scan of return_records
+        with self.db.connection() as conn:
+            return return_stats.read_summary(conn)[0]
+
+    @staticmethod
+    def _beyond(key_cols, bound, before):
+        """WHERE clause for rows strictly after (or before) bound in key order.
+
+        Any key column may be NULL (book_id is, and TIE_BREAK holds dates that
+        can be too), and a row-value comparison is NULL as soon as one side is.
+        So the order is spelled out per column, with NULLs sorting last
+        (ORDER BY col IS NULL, col) and <=> for the equal prefix.
+        """
+        terms, params = [], []
+        for i, (col, value) in enumerate(zip(key_cols, bound)):
+            if before:
+                cmp, args = (f"{col} IS NOT NULL", ()) if value is None else (f"{col} < %s", (value,))
+            elif value is None:
+                continue                      # nothing sorts after NULL
+            else:
+                cmp, args = f"({col} > %s OR {col} IS NULL)", (value,)
+            same = [f"{c} <=> %s" for c in key_cols[:i]]
+            terms.append("(" + " AND ".join(same + [cmp]) + ")")
+            params += list(bound[:i]) + list(args)
+        return ("(" + " OR ".join(terms) + ")" if terms else "FALSE"), params
+
+    def _fetch_page(self, key_cols, desc, after=None, before=None):
+        """Worker thread: one page of rows strictly after/before a key, in display order."""
+        backward = before is not None
+        # Walking backwards means flipping both the comparison and the order
+        reverse = desc != backward
+        order = "DESC" if reverse else "ASC"
+        sql = f"SELECT {', '.join(COLUMNS)} FROM return_records"
+        params = ()
+        bound = before if backward else after
+        if bound is not None:
+            where, params = self._beyond(key_cols, bound, before=reverse)
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {', '.join(f'{c} IS NULL {order}, {c} {order}' for c in key_cols)} LIMIT {PAGE_SIZE}"
+
+        with self.db.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT user_id, book_id, borrow_date, expected_return_date, actual_return_date, overdue_days, fine FROM return_records")
+            cursor.execute(sql, params)
             rows = cursor.fetchall()
-            for row in rows:
-                self.tree.insert("", "end", values=row)
             cursor.close()
-            conn.close()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
+        if backward:
+            rows.reverse()
+        return rows
 
-    def populate_summary(self):
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
+    def _load(self, after=None, before=None):
+        if self._fetching:
+            return
+        self._fetching = True
+        gen = self._gen
+        self.runner.submit(
+            self._fetch_page, self._key_columns(), self.sort_desc, after=after, before=before,
+            on_success=lambda rows: self._add_page(gen, rows, at_top=before is not None),
+            on_error=self._on_page_error,
+        )
 
-            cursor.execute("SELECT COUNT(*), SUM(fine), AVG(overdue_days) FROM return_records")
-            total, total_fine, avg_overdue = cursor.fetchone()
+    def _on_page_error(self, err):
+        self._fetching = False
+        self._on_db_error(err)
 
-            month_start = datetime.today().replace(day=1).strftime("%Y-%m-%d")
-            cursor.execute("SELECT COUNT(*) FROM return_records WHERE actual_return_date >= %s", (month_start,))
-            monthly_returns = cursor.fetchone()[0]
+    def _add_page(self, gen, rows, at_top):
+        if gen != self._gen:
+            return          # sort changed while this page was loading
+        self._fetching = False
+        if not rows:
+            if at_top:
+                self._offset = 0        # rows above were deleted meanwhile
+            else:
+                self._more_after = False
+            self._update_count()
+            return
 
-            self.total_returns_label.config(text=f"Total Returns: {total}")
-            self.total_fines_label.config(text=f"Total Fines Collected: Rs. {total_fine:.2f}" if total_fine else "Total Fines Collected: Rs. 0.00")
-            self.avg_overdue_label.config(text=f"Average Overdue Days: {avg_overdue:.2f}" if avg_overdue else "Average Overdue Days: 0")
-            self.this_month_label.config(text=f"Books Returned This Month: {monthly_returns}")
+        anchor = self._top_visible()
+        if at_top:
+            iids = [self.tree.insert("", i, values=row) for i, row in enumerate(rows)]
+            self._pages.appendleft((iids, self._key_of(rows[0]), self._key_of(rows[-1])))
+            # A short page means we've reached the top
+            self._offset = max(0, self._offset - len(rows)) if len(rows) == PAGE_SIZE else 0
+            self._keep_visible(anchor)
+            if len(self._pages) > MAX_PAGES:
+                self._drop_page(last=True)
+                self._keep_visible(anchor)
+        else:
+            iids = [self.tree.insert("", "end", values=row) for row in rows]
+            self._pages.append((iids, self._key_of(rows[0]), self._key_of(rows[-1])))
+            self._more_after = len(rows) == PAGE_SIZE
+            self._keep_visible(anchor)
+            if len(self._pages) > MAX_PAGES:
+                self._drop_page(last=False)
+                self._keep_visible(anchor)
+        self._update_count()
 
-            cursor.close()
-            conn.close()
-        except mysql.connector.Error as err:
+    def _drop_page(self, last):
+        iids, _first, _last = self._pages.pop() if last else self._pages.popleft()
+        self.tree.delete(*iids)
+        if last:
+            self._more_after = True
+        else:
+            self._offset += len(iids)
+
+    def _top_visible(self):
+        # From the scroll position, not identify_row(): y=0 is the heading row
+        children = self.tree.get_children()
+        if not children:
+            return None
+        index = int(float(self.tree.yview()[0]) * len(children))
+        return children[min(index, len(children) - 1)]
+
+    def _keep_visible(self, iid):
+        # Inserting or dropping rows above the view would make it jump; put the
+        # row that was at the top back at the top
+        if iid and self.tree.exists(iid):
+            children = self.tree.get_children()
+            self.tree.yview_moveto(children.index(iid) / max(1, len(children)))
+
+    def _on_yscroll(self, first, last):
+        self.yscroll.set(first, last)
+        if self._fetching or not self._pages:
+            return
+        if float(last) >= 1.0 - EDGE and self._more_after:
+            self._load(after=self._pages_key(last=True))
+        elif float(first) <= EDGE and self._offset > 0:
+            self._load(before=self._pages_key(last=False))
+
+    def _set_total(self, total):
+        self._total = total
+        self._update_count()
+
+    def _update_count(self):
+        loaded = sum(len(p[0]) for p in self._pages)
+        total = "…" if self._total is None else self._total
+        if loaded:
+            text = f"{total} returns · showing {self._offset + 1}–{self._offset + loaded}"
+        else:
+            text = f"{total} returns"
+        self.count_label.config(text=text)
+
+    def populate_summary(self):
+        self.runner.submit(self._load_summary, on_success=self._show_summary, on_error=self._on_db_error)
+
+    def _load_summary(self):
+        # Reads the per-month buckets kept by return_stats, not the whole history
+        with self.db.connection() as conn:
+            return return_stats.read_summary(conn)
+
+    def _show_summary(self, summary):
+        total, total_fine, avg_overdue, monthly_returns = summary
+        self.total_returns_label.config(text=f"Total Returns: {total}")
+        self.total_fines_label.config(text=f"Total Fines Collected: Rs. {total_fine:.2f}" if total_fine else "Total Fines Collected: Rs. 0.00")
+        self.avg_overdue_label.config(text=f"Average Overdue Days: {avg_overdue:.2f}" if avg_overdue else "Average Overdue Days: 0")
+        self.this_month_label.config(text=f"Books Returned This Month: {monthly_returns}")
+
+    def _on_db_error(self, err):
+        if isinstance(err, mysql.connector.Error):
             messagebox.showerror("Database Error", str(err))
+        else:
+            print(f"[ERROR] Return report load failed: {err}")
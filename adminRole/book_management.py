@@ -1,9 +1,13 @@
 
-from database import Database
+from adminRole.catalogue_import import import_catalogue, validate_book_fields
+from database import Database, like_prefix
+from utils.paged_search import PAGE_SIZE, PagedSearch
+from utils.task_runner import TaskRunner
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry  
-import re
+
+PREFIX_COLUMNS = ("book_name", "author", "title")   # each has an index
 
 class BookManagement:
     def __init__(self, parent, go_back_callback):
@@ -18,6 +22,7 @@ class BookManagement:
 
         self.main_frame = tk.Frame(self.parent, padx=15, pady=15)
         self.main_frame.pack(expand=True, fill="both")
+        self.runner = TaskRunner(self.main_frame)
 
         self.input_frame = tk.LabelFrame(self.main_frame, text="Book Details", padx=15, pady=15)
         self.input_frame.pack(padx=10, pady=10, fill="x")
@@ -73,8 +78,17 @@ class BookManagement:
         tk.Button(self.button_frame, text="Update Book", command=self.update_book, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Delete Book", command=self.delete_book, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Clear Fields", command=self.clear_entries, **button_style).pack(side="left", padx=5)
+        tk.Button(self.button_frame, text="Import…", command=self.import_books, **button_style).pack(side="left", padx=5)
         tk.Button(self.button_frame, text="Back to Admin Panel", command=self.go_back_callback, font=("Arial", 16), bg="#033974", fg="white", bd=0, padx=10, pady=5, activebackground="#7f8c8d").pack(side="right", padx=5)
 
+        # Search + paging bar; (title, book_id) is the keyset
+        self.search = PagedSearch(
+            self.main_frame, self.runner, "Search (name, author, title, year, ID):",
+            fetch=self._fetch_books, key_of=lambda row: (row[1], row[0]), show=self._show_books,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load books: {e}"),
+            noun="books",
+        )
+
         self.tree_frame = tk.Frame(self.main_frame, padx=10, pady=5)
         self.tree_frame.pack(expand=True, fill="both")
 
@@ -124,83 +138,67 @@ class BookManagement:
             
 
     def validate_inputs(self):
-        
-
-        book_id = self.book_id_entry.get().strip()
-        title = self.title_entry.get().strip()
-        book_name = self.name_entry.get().strip()
-        author = self.author_entry.get().strip()
-        year = self.year_entry.get_date().year  # Only get the year part
-        
-        if not re.fullmatch(r'\d{1,10}', book_id):
-            messagebox.showwarning("Input Error", "Book ID must be numeric and up to 10 digits.")
-            return None
-
-        if title not in ["fiction", "history", "non-fiction", "science"]:
-            messagebox.showwarning("Input Error", "Title must be selected from the dropdown list.")
-            return None
-        if len(book_name) > 300:
-            messagebox.showwarning("Input Error", "Book Name cannot exceed 300 characters.")
-            return None
-
-        if len(author) > 300:
-            messagebox.showwarning("Input Error", "Author name cannot exceed 300 characters.")
-            return None
-
         try:
-            year_int = int(year)
-            if not (1000 <= year_int <= 9999):
-                messagebox.showwarning("Input Error", "Year must be a 4-digit number.")
-                return None
-        except ValueError:
-            messagebox.showwarning("Input Error", "Year must be a valid number.")
+            return validate_book_fields(
+                self.book_id_entry.get(),
+                self.title_entry.get(),
+                self.name_entry.get(),
+                self.author_entry.get(),
+                self.year_entry.get_date().year,  # Only get the year part
+            )
+        except ValueError as e:
+            messagebox.showwarning("Input Error", str(e))
             return None
 
-        return book_id, title, book_name, author, year
 
+    def _execute(self, sql, params):
+        """Worker thread: run one write statement, return the affected row count."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+            rows = cursor.rowcount
+            cursor.close()
+        return rows
 
     def add_book(self):
         validated = self.validate_inputs()
         if not validated:
             return
         book_id, title, book_name,author, year = validated
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            sql = "INSERT INTO books (book_id, title, book_name,author, year) VALUES (%s, %s, %s, %s,%s)"
-            cursor.execute(sql, (book_id, title, book_name,author, year))
-            conn.commit()
+
+        def done(_rows):
             messagebox.showinfo("Success", "Book added successfully!")
-            self.load_books()
+            self._put_row((book_id, title, book_name, author, year))
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to add book: {e}")
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+
+        sql = "INSERT INTO books (book_id, title, book_name,author, year) VALUES (%s, %s, %s, %s,%s)"
+        self.runner.submit(
+            self._execute, sql, (book_id, title, book_name,author, year),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to add book: {e}"),
+        )
 
     def update_book(self):
         validated = self.validate_inputs()
         if not validated:
             return
         book_id, title,book_name, author, year = validated
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            sql = "UPDATE books SET title=%s, book_name=%s,author=%s, year=%s WHERE book_id=%s"
-            cursor.execute(sql, (title, book_name,author, year, book_id))
-            conn.commit()
-            if cursor.rowcount > 0:
+
+        def done(rows):
+            if rows > 0:
                 messagebox.showinfo("Success", "Book updated successfully!")
+                self._put_row((book_id, title, book_name, author, year))
             else:
                 messagebox.showwarning("Not Found", "No book found with the given Book ID.")
-            self.load_books()
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to update book: {e}")
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+
+        sql = "UPDATE books SET title=%s, book_name=%s,author=%s, year=%s WHERE book_id=%s"
+        self.runner.submit(
+            self._execute, sql, (title, book_name,author, year, book_id),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to update book: {e}"),
+        )
 
     def delete_book(self):
         book_id = self.book_id_entry.get().strip()
@@ -211,35 +209,130 @@ class BookManagement:
         if not messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete book ID: {book_id}?"):
             return
 
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            sql = "DELETE FROM books WHERE book_id=%s"
-            cursor.execute(sql, (book_id,))
-            conn.commit()
-            if cursor.rowcount > 0:
+        def done(rows):
+            if rows > 0:
                 messagebox.showinfo("Success", "Book deleted successfully!")
+                self._drop_row(book_id)
             else:
                 messagebox.showwarning("Not Found", "No book found with the given Book ID.")
-            self.load_books()
             self.clear_entries()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to delete book: {e}")
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
 
+        sql = "DELETE FROM books WHERE book_id=%s"
+        self.runner.submit(
+            self._execute, sql, (book_id,),
+            on_success=done,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to delete book: {e}"),
+        )
+
+    # ---------- Bulk import ----------
+    def import_books(self):
+        path = filedialog.askopenfilename(
+            title="Import books",
+            filetypes=[("Catalogue files", "*.csv *.parquet"), ("CSV", "*.csv"), ("Parquet", "*.parquet")],
+        )
+        if not path:
+            return
+
+        def finished(stats):
+            msg = (f"{stats['inserted']} book(s) imported in {stats['seconds']:.1f}s\n"
+                   f"{stats['duplicates']} already in the catalogue\n"
+                   f"{stats['rejected']} rejected")
+            for line, reason in stats["reject_sample"][:5]:
+                msg += f"\n  line {line}: {reason}"
+            messagebox.showinfo("Import", msg)
+
+        self.search.run_import(
+            import_catalogue, path, self.db,
+            progress_text=lambda s: f"Importing… {s['read']} read, {s['inserted']} added, {s['rejected']} rejected",
+            on_success=finished,
+            on_error=lambda e: messagebox.showerror("Import Error", f"Import failed: {e}"),
+        )
+
+    # ---------- Search and paging ----------
     def load_books(self):
+        """(Re)load the current page of the current search."""
+        self.search.reload()
+
+    @staticmethod
+    def _search_terms(term):
+        """(column, operator, value) conditions for a search term; each hits an index."""
+        terms = [(col, "LIKE", like_prefix(term)) for col in PREFIX_COLUMNS]
+        if term.isdigit():
+            terms.append(("book_id", "=", int(term)))
+            if len(term) == 4:
+                terms.append(("year", "=", int(term)))
+        return terms
+
+    def _fetch_books(self, term, after):
+        """Worker thread: up to PAGE_SIZE + 1 books after the (title, book_id) key."""
+        cols = "book_id, title, book_name, author, year"
+        limit = PAGE_SIZE + 1       # one extra row tells us there's a next page
+        keyset, key_params = "", ()
+        if after is not None:
+            keyset, key_params = " AND (title, book_id) > (%s, %s)", tuple(after)
+
+        if term:
+            terms = self._search_terms(term)
+            branches = " UNION ".join(
+                f"(SELECT {cols} FROM books WHERE {col} {op} %s{keyset} "
+                f"ORDER BY title, book_id LIMIT {limit})"
+                for col, op, _value in terms
+            )
+            sql = f"SELECT {cols} FROM ({branches}) AS hits ORDER BY title, book_id LIMIT {limit}"
+            params = tuple(v for _col, _op, value in terms for v in (value, *key_params))
+        else:
+            sql = f"SELECT {cols} FROM books WHERE 1=1{keyset} ORDER BY title, book_id LIMIT {limit}"
+            params = key_params
+
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    def _show_books(self, rows):
         for item in self.tree.get_children():
             self.tree.delete(item)
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("SELECT book_id, title, book_name,author, year FROM books ORDER BY title")
-            for row in cursor.fetchall():
-                self.tree.insert("", tk.END, values=row)
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to load books: {e}")
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+        for row in rows:
+            self.tree.insert("", tk.END, iid=str(row[0]), values=row)
+
+    # ---------- In-place row updates after add/update/delete ----------
+    def _matches(self, row):
+        term = self.search.term.lower()
+        if not term:
+            return True
+        book_id, title, book_name, author, year = row
+        if term.isdigit() and (term == str(book_id) or term == str(year)):
+            return True
+        return any(str(v).lower().startswith(term) for v in (book_name, author, title))
+
+    def _put_row(self, row):
+        """Insert or refresh one book in the current page, keeping (title, book_id) order."""
+        row = (int(row[0]),) + tuple(row[1:])     # '0042' from the entry is book 42
+        iid = str(row[0])
+        key = (str(row[1]), row[0])
+        start, last = self.search.page_starts[-1], self.search.last_key
+        in_page = (
+            self._matches(row)
+            and (start is None or key > (str(start[0]), int(start[1])))
+            and (not self.search.has_next or last is None or key <= (str(last[0]), int(last[1])))
+        )
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+        if not in_page:
+            return
+
+        index = 0
+        for other in self.tree.get_children():
+            vals = self.tree.item(other, "values")
+            if (str(vals[1]), int(vals[0])) > key:
+                break
+            index += 1
+        self.tree.insert("", index, iid=iid, values=row)
+        self.tree.see(iid)
+
+    def _drop_row(self, book_id):
+        iid = str(int(book_id))
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
@@ -0,0 +1,215 @@
+# catalogue_import.py
+"""Bulk import of books from a CSV or Parquet file.
+
+The file is streamed in chunks (never loaded whole), each row is checked
+with the same rules as the BookManagement form, and every chunk goes in
+as one multi-row INSERT with its own commit. Rows whose book_id already
+exists (one IN (...) query per chunk) are counted as duplicates and left
+untouched; rows the server refuses are rejected with its error.
+
+    python -m adminRole.catalogue_import books.csv --rejects rejects.csv
+
+Expected columns: book_id, title, book_name, author, year
+(title is the category: fiction, history, non-fiction or science).
+"""
+import argparse
+import csv
+import os
+import re
+import time
+
+import mysql.connector
+
+from database import Database
+
+FIELDS = ("book_id", "title", "book_name", "author", "year")
+CATEGORIES = ("fiction", "history", "non-fiction", "science")
+CHUNK_SIZE = 5000
+REJECT_SAMPLE = 100      # rejects kept in memory for the summary
+
+_INSERT = "INSERT INTO books (book_id, title, book_name, author, year) VALUES (%s, %s, %s, %s, %s)"
+
+
+def validate_book_fields(book_id, title, book_name, author, year):
+    """Normalised (book_id, title, book_name, author, year), or ValueError with the reason.
+
+    Shared by the BookManagement form and the importer so both accept
+    exactly the same rows.
+    """
+    book_id = str(book_id).strip()
+    title = str(title).strip()
+    book_name = str(book_name or "").strip()
+    author = str(author or "").strip()
+
+    if not re.fullmatch(r'\d{1,10}', book_id):
+        raise ValueError("Book ID must be numeric and up to 10 digits.")
+    if title not in CATEGORIES:
+        raise ValueError("Title must be selected from the dropdown list.")
+    if len(book_name) > 300:
+        raise ValueError("Book Name cannot exceed 300 characters.")
+    if len(author) > 300:
+        raise ValueError("Author name cannot exceed 300 characters.")
+    try:
+        year_int = int(str(year).strip())
+    except ValueError:
+        raise ValueError("Year must be a valid number.") from None
+    if not (1000 <= year_int <= 9999):
+        raise ValueError("Year must be a 4-digit number.")
+
+    return book_id, title, book_name, author, year_int
+
+
+# ---------- Readers ----------
+def _csv_chunks(path, chunk_size):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [h.strip().lower() for h in (reader.fieldnames or [])]
+        _check_columns(reader.fieldnames, path)
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _parquet_chunks(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet engine missing. Install with:  pip install pyarrow") from e
+    pf = pq.ParquetFile(path)
+    names = {n.strip().lower(): n for n in pf.schema_arrow.names}
+    _check_columns(names, path)
+    for batch in pf.iter_batches(batch_size=chunk_size, columns=[names[f] for f in FIELDS]):
+        yield [{f: row[names[f]] for f in FIELDS} for row in batch.to_pylist()]
+
+
+def _check_columns(found, path):
+    missing = [f for f in FIELDS if f not in found]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} is missing column(s): {', '.join(missing)}")
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    """Lists of row dicts (keys = FIELDS), chunk_size at a time."""
+    if path.lower().endswith((".parquet", ".pq")):
+        return _parquet_chunks(path, chunk_size)
+    return _csv_chunks(path, chunk_size)
+
+
+# ---------- Import ----------
+def _existing_ids(cursor, ids):
+    marks = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"SELECT book_id FROM books WHERE book_id IN ({marks})", list(ids))
+    return {int(row[0]) for row in cursor.fetchall()}
+
+
+def import_catalogue(path, db=None, chunk_size=CHUNK_SIZE, on_progress=None, rejects_path=None):
+    """Import every valid row of path into books.
+
+    on_progress(stats) is called after each chunk (from the calling thread).
+    Rejected rows go to rejects_path as CSV with a `reason` column, if
+    given; the first REJECT_SAMPLE are also kept in stats["reject_sample"].
+    Returns the stats dict: read, inserted, duplicates, rejected, seconds.
+    """
+    db = db or Database()
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "rejected": 0,
+             "reject_sample": [], "seconds": 0.0}
+    start = time.perf_counter()
+
+    rejects_file = writer = None
+    if rejects_path:
+        rejects_file = open(rejects_path, "w", newline="", encoding="utf-8")
+        writer = csv.writer(rejects_file)
+        writer.writerow(("line",) + FIELDS + ("reason",))
+
+    def reject(line, values, reason):
+        stats["rejected"] += 1
+        if len(stats["reject_sample"]) < REJECT_SAMPLE:
+            stats["reject_sample"].append((line, reason))
+        if writer:
+            writer.writerow((line,) + values + (reason,))
+
+    try:
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                line = 1                              # header is line 1
+                for chunk in iter_chunks(path, chunk_size):
+                    good = {}                         # int book_id -> (line, raw values, fields)
+                    for row in chunk:
+                        line += 1
+                        values = tuple(row.get(f) for f in FIELDS)
+                        try:
+                            fields = validate_book_fields(*values)
+                        except ValueError as e:
+                            reject(line, values, str(e))
+                            continue
+                        book_id = int(fields[0])      # '0042' and '42' are the same BIGINT
+                        if book_id in good:
+                            stats["duplicates"] += 1  # repeated within the chunk
+                        else:
+                            good[book_id] = (line, values, fields)
+
+                    if good:
+                        existing = _existing_ids(cursor, list(good))
+                        stats["duplicates"] += len(existing)
+                        fresh = [v for book_id, v in good.items() if book_id not in existing]
+                        if fresh:
+                            try:
+                                # mysql.connector turns this into one multi-row INSERT
+                                cursor.executemany(_INSERT, [fields for _line, _values, fields in fresh])
+                                conn.commit()
+                                stats["inserted"] += len(fresh)
+                            except mysql.connector.Error:
+                                # Some row was refused: redo the chunk row by row to find which
+                                conn.rollback()
+                                for row_line, values, fields in fresh:
+                                    try:
+                                        cursor.execute(_INSERT, fields)
+                                        stats["inserted"] += 1
+                                    except mysql.connector.Error as e:
+                                        reject(row_line, values, f"Rejected by the database: {e.msg}")
+                                conn.commit()
+                    stats["read"] += len(chunk)
+                    stats["seconds"] = time.perf_counter() - start
+                    if on_progress:
+                        on_progress(dict(stats))
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import books from a CSV or Parquet file.")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--rejects", default=None, help="write rejected rows (with reasons) to this CSV")
+    args = parser.parse_args(argv)
+
+    def progress(s):
+        print(f"\r{s['read']} read, {s['inserted']} inserted, {s['duplicates']} duplicate, "
+              f"{s['rejected']} rejected ({s['seconds']:.1f}s)", end="", flush=True)
+
+    stats = import_catalogue(args.path, chunk_size=args.chunk_size,
+                             on_progress=progress, rejects_path=args.rejects)
+    print()
+    for line, reason in stats["reject_sample"][:10]:
+        print(f"  line {line}: {reason}")
+    if stats["rejected"] > 10:
+        print(f"  ... {stats['rejected'] - 10} more" + (f" in {args.rejects}" if args.rejects else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,24 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from prediction_model import predict_holding_days
+from collections import deque
+from tkinter import messagebox
+from prediction_model import build_features, predict_holding_days, predict_holding_days_batch
 import mysql.connector
 from datetime import datetime, timedelta
 from database import Database
 from adminRole.notification_sidebar import SidebarNotifications
+from userRole import member_profile
+from utils.notification_bus import Subscriber
+from utils.task_runner import TaskRunner
+
+_INSERT_LENDING = """
+    INSERT INTO lending_records (user_id, book_id, borrow_date, return_date, predict_date,pages,
+        user_role_staff, user_role_student, book_category_fiction, book_category_history,
+        book_category_nonfiction, book_category_science)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,%s, %s)
+"""
+
+BASKET_MAX = 20     # books per checkout
+
 
 class lending:
     """Class for managing lending records in the library system"""
@@ -20,6 +34,15 @@ class lending:
         self.go_back_callback = go_back_callback
         self.db = Database()
         self.sidebar = None 
+        self.runner = None
+        self.toggle_btn = None
+        # Requests confirmed in the sidebar, prefilled one lending at a time
+        self._prefill_queue = deque()
+        self._prefill_active = False
+        # Multi-book checkout: [(book_id, pages)] for the user in the form
+        self._basket = []
+        self.basket_list = None
+        self.checkout_btn = None
         
 
     def clear_frame(self):
@@ -68,6 +91,9 @@ class lending:
             )
             form_container.pack(fill="both", expand=True, padx=20, pady=20)  # 20px padding
 
+            # DB work for this form runs off the Tk thread; cancelled if the form is left
+            self.runner = TaskRunner(form_container)
+
             # Form header (blue bar)
             header = tk.Frame(form_container, bg="#3498db", height=50)  # 50px tall
             header.pack(fill="x", pady=(0, 20))  # Fill width with 20px bottom padding
@@ -84,20 +110,23 @@ class lending:
             # )
             # toggle_btn.pack(side="right", padx=10, pady=6)
             
-            # Check notification status
-            has_notifs = self._has_pending_notifications()
-
             toggle_btn = tk.Button(
                 header,
                 text="🔔 Notifications",bd=2, highlightbackground="#000000", 
                 font=self.button_font,
-                bg=("#e74c3c" if has_notifs else "#27ae60"),  # Red if has pending, Green if none
+                bg="#27ae60",  # Red if has pending, Green if none (set once checked)
                 fg="white", 
                 activebackground="#2c3e50", activeforeground="white",
                 cursor="hand2",
                 command=lambda: self._toggle_sidebar(parent=body)
             )
             toggle_btn.pack(side="right", padx=10, pady=6)
+            self.toggle_btn = toggle_btn
+
+            # Check notification status in the background
+            self.runner.submit(self._has_pending_notifications, on_success=self._set_notification_color, busy=False)
+            # ...and turn it red as soon as a user sends a new request
+            Subscriber(form_container, lambda _event: self._set_notification_color(True))
             
             
 
@@ -184,6 +213,16 @@ class lending:
                     entry.pack(side="right", fill="x", expand=True, ipady=4)  # Right-aligned input
                     self.entries[field_name] = entry  # Store reference
 
+            # Basket for checking out several books to one user at once
+            basket_frame = tk.LabelFrame(left_column, text="Basket (double-click to remove)",
+                                         font=self.label_font, bg="white", fg="#2c3e50", padx=10, pady=5)
+            basket_frame.pack(fill="both", expand=True, pady=(10, 0))
+            self.basket_list = tk.Listbox(basket_frame, height=4, font=self.label_font, bg="#ecf0f1",
+                                          fg="#2c3e50", relief="flat", activestyle="none")
+            self.basket_list.pack(fill="both", expand=True)
+            self.basket_list.bind("<Double-Button-1>", self._remove_from_basket)
+            self._basket = []
+
             # Right column for radio buttons
             right_column = tk.Frame(form_fields, bg="white", width=250)
             right_column.pack(side="right", fill="both", padx=(20, 0)) 
@@ -275,6 +314,21 @@ class lending:
                 command=self.submit_lending
             ).pack(side="left", padx=10)  # Left-aligned with 10px padding
 
+            tk.Button(
+                button_frame, text="Add to Basket", font=self.button_font,
+                bg="#2980b9", fg="white", bd=0, padx=25, pady=10,
+                activebackground="#1f6391", activeforeground="white",
+                cursor="hand2", command=self.add_to_basket
+            ).pack(side="left", padx=10)
+
+            self.checkout_btn = tk.Button(
+                button_frame, text="Checkout Basket", font=self.button_font,
+                bg="#27ae60", fg="white", bd=0, padx=25, pady=10,
+                activebackground="#219653", activeforeground="white",
+                cursor="hand2", state="disabled", command=self.checkout_basket
+            )
+            self.checkout_btn.pack(side="left", padx=10)
+
             # Back button (dark blue)
             tk.Button(
                 button_frame, 
@@ -290,6 +344,10 @@ class lending:
                 cursor="hand2", 
                 command=self.go_back_callback
             ).pack(side="right", padx=10)  # Right-aligned with 10px padding
+
+            # Pick up where we left off if confirmed requests are still queued
+            self._prefill_active = False
+            self._advance_prefill()
     
         
        
@@ -305,140 +363,268 @@ class lending:
                 pages_str = self.entries["pages"].get().strip()
 
                 # Validate all required fields
-                if not user_id:
-                    self.show_validation_error("user_id", "User ID is required!")
-                    return
-                if len(user_id) > 3:
-                    self.show_validation_error("user_id", "User ID must be 3 digits or less!")
-                    return
-                if not user_id.isdigit():
-                    self.show_validation_error("user_id", "User ID must be numeric!")
-                    return
-
-                if not book_id:
-                    self.show_validation_error("book_id", "Book ID is required!")
-                    return
-                if len(book_id) > 10:
-                    self.show_validation_error("book_id", "Book ID must be 10 digits or less!")
-                    return
-                if not book_id.isdigit():
-                    self.show_validation_error("book_id", "Book ID must be numeric!")
-                    return
-
-                if not pages_str:
-                    self.show_validation_error("pages", "Pages is required!")
-                    return
-                if len(pages_str) > 7:
-                    self.show_validation_error("pages", "Pages must be 7 digits or less!")
+                if not self._valid_user_id(user_id) or not self._valid_book(book_id, pages_str):
                     return
-                if not pages_str.isdigit():
-                    self.show_validation_error("pages", "Pages must be numeric!")
-                    return
-
                 pages = int(pages_str)
-                if pages <= 0:
-                    self.show_validation_error("pages", "Pages must be greater than 0!")
-                    return
 
                 # Get selected values from radio buttons
                 user_role = self.user_role.get()
                 book_category = self.book_category.get()
 
-                # Prepare features for prediction
-                features = [
-                    pages,
-                    1 if user_role == "staff" else 0,
-                    1 if user_role == "student" else 0,
-                    1 if book_category == "fiction" else 0,
-                    1 if book_category == "history" else 0,
-                    1 if book_category == "non-fiction" else 0,
-                    1 if book_category == "science" else 0,
-                    int(user_id),
-                    int(book_id)
-                ]
-
-            
-                conn = self.db.connect()
-                cursor = conn.cursor()
+                # Prepare features for prediction (order: prediction_model.FEATURE_NAMES)
+                features = build_features(pages, user_role, book_category, user_id, book_id)
 
-            
-                
-                # --- Normalize IDs once ---
-                uid_int = int(user_id)          # e.g. 1
-                bid_int = int(book_id)          # e.g. 239
-                uid_pad = str(uid_int).zfill(3) # '001' style
-                bid_pad = str(bid_int).zfill(3) # '239' -> '239' (still fine)
-
-                # --- Check existence (works whether columns are VARCHAR like '001' or INT like 1) ---
-                cursor.execute("""SELECT 1 FROM members WHERE member_id = %s            
-                    OR CAST(member_id AS UNSIGNED) = %s  -- numeric match (handles 1)
-                    LIMIT 1
-                """, (uid_pad, uid_int))
-                user_exists = cursor.fetchone() is not None
-
-                cursor.execute("""
-                    SELECT 1
-                    FROM books
-                    WHERE book_id = %s
-                    OR CAST(book_id AS UNSIGNED) = %s
-                    LIMIT 1
-                """, (bid_pad, bid_int))
-                book_exists = cursor.fetchone() is not None
-
-                if not user_exists:
-                    messagebox.showerror("Error", f"User ID {user_id} does not exist.")
-                    return
 
-                if not book_exists:
-                    messagebox.showerror("Error", f"Book ID {book_id} does not exist.")
-                    return
-                
+                # --- Normalize IDs once (same forms migrations.py stores) ---
+                uid_pad = str(int(user_id)).zfill(3) # '001' style
+                bid_int = int(book_id)               # BIGINT
 
-                # Get prediction and show success message
-                prediction = predict_holding_days(features)
-                messagebox.showinfo(
-                    "Success", 
-                    f"Lending record created successfully!\n\n"
-                    f"Predicted Holding Days: {prediction:.2f} days"
+                # Existence checks and the prediction run off the Tk thread
+                self.runner.submit(
+                    self._check_and_predict, uid_pad, bid_int, features,
+                    on_success=lambda result: self._on_lending_checked(
+                        result, uid_pad, bid_int, borrow_date, return_date, pages, features),
+                    on_error=self._on_lending_error,
                 )
-                
-
-                # SQL query to insert lending record
-                sql = """
-                INSERT INTO lending_records (user_id, book_id, borrow_date, return_date, predict_date,pages,
-                    user_role_staff, user_role_student, book_category_fiction, book_category_history,
-                    book_category_nonfiction, book_category_science)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,%s, %s)
-                """
-                 
-                # Values for the SQL query
-                values = (
-                    user_id,  # user_id
-                    book_id,  # book_id
-                    borrow_date,
-                    return_date,
-                    int(prediction),
-                    pages,
-                    features[1],  # user_role_staff
-                    features[2],  # user_role_student
-                    features[3],  # book_category_fiction
-                    features[4],  # book_category_history
-                    features[5],  # book_category_nonfiction
-                    features[6]   # book_category_science
-                )
-                cursor.execute(sql, values)
-                conn.commit()
-                cursor.close()
-                conn.close()
-
-                messagebox.showinfo("Success","Insert Success")
             except ValueError as ve:
                 messagebox.showerror("Input Error", str(ve))
-            except mysql.connector.Error as err:
-                messagebox.showerror("Database Error", f"Error: {err}")
             except Exception as e:
                 messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
 
+    def _valid_user_id(self, user_id):
+            if not user_id:
+                self.show_validation_error("user_id", "User ID is required!")
+                return False
+            if len(user_id) > 3:
+                self.show_validation_error("user_id", "User ID must be 3 digits or less!")
+                return False
+            if not user_id.isdigit():
+                self.show_validation_error("user_id", "User ID must be numeric!")
+                return False
+            return True
+
+    def _valid_book(self, book_id, pages_str):
+            if not book_id:
+                self.show_validation_error("book_id", "Book ID is required!")
+                return False
+            if len(book_id) > 10:
+                self.show_validation_error("book_id", "Book ID must be 10 digits or less!")
+                return False
+            if not book_id.isdigit():
+                self.show_validation_error("book_id", "Book ID must be numeric!")
+                return False
+
+            if not pages_str:
+                self.show_validation_error("pages", "Pages is required!")
+                return False
+            if len(pages_str) > 7:
+                self.show_validation_error("pages", "Pages must be 7 digits or less!")
+                return False
+            if not pages_str.isdigit():
+                self.show_validation_error("pages", "Pages must be numeric!")
+                return False
+            if int(pages_str) <= 0:
+                self.show_validation_error("pages", "Pages must be greater than 0!")
+                return False
+            return True
+
+    def _check_and_predict(self, uid_pad, bid_int, features):
+        """Worker thread: (user_exists, book_exists, prediction or None)."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            # One round trip; both lookups are plain primary-key probes
+            cursor.execute("""
+                SELECT EXISTS(SELECT 1 FROM members WHERE member_id = %s),
+                       EXISTS(SELECT 1 FROM books WHERE book_id = %s)
+            """, (uid_pad, bid_int))
+            user_exists, book_exists = (bool(v) for v in cursor.fetchone())
+            cursor.close()
+
+        if not (user_exists and book_exists):
+            return user_exists, book_exists, None
+        return user_exists, book_exists, predict_holding_days(features)
+
+    def _on_lending_checked(self, result, user_id, book_id, borrow_date, return_date, pages, features):
+        user_exists, book_exists, prediction = result
+        if not user_exists:
+            messagebox.showerror("Error", f"User ID {user_id} does not exist.")
+            return
+
+        if not book_exists:
+            messagebox.showerror("Error", f"Book ID {book_id} does not exist.")
+            return
+
+        # Show prediction and success message
+        messagebox.showinfo(
+            "Success", 
+            f"Lending record created successfully!\n\n"
+            f"Predicted Holding Days: {prediction:.2f} days"
+        )
+
+        # Values for the SQL query
+        values = (
+            user_id,  # user_id
+            book_id,  # book_id
+            borrow_date,
+            return_date,
+            int(prediction),
+            pages,
+            features[1],  # user_role_staff
+            features[2],  # user_role_student
+            features[3],  # book_category_fiction
+            features[4],  # book_category_history
+            features[5],  # book_category_nonfiction
+            features[6]   # book_category_science
+        )
+        self.runner.submit(
+            self._insert_lending, values,
+            on_success=self._on_lending_inserted,
+            on_error=self._on_lending_error,
+        )
+
+    def _on_lending_inserted(self, _rows):
+        messagebox.showinfo("Success","Insert Success")
+        # Move straight on to the next confirmed request, if any
+        if self._prefill_active:
+            self._advance_prefill()
+
+    def _insert_lending(self, values):
+        """Worker thread: insert one lending record."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_INSERT_LENDING, values)
+            conn.commit()
+            rows = cursor.rowcount
+            cursor.close()
+        member_profile.invalidate(values[0])   # borrowed list/count changed
+        return rows
+
+    # ---------- Multi-book checkout ----------
+    def add_to_basket(self):
+        """Put the Book ID / Pages in the form into the basket and clear them for the next book."""
+        book_id = self.entries["book_id"].get().strip()
+        pages_str = self.entries["pages"].get().strip()
+        if not self._valid_book(book_id, pages_str):
+            return
+        bid_int = int(book_id)
+        if any(b == bid_int for b, _pages in self._basket):
+            messagebox.showwarning("Basket", f"Book ID {bid_int} is already in the basket.")
+            return
+        if len(self._basket) >= BASKET_MAX:
+            messagebox.showwarning("Basket", f"A checkout holds at most {BASKET_MAX} books.")
+            return
+
+        self._basket.append((bid_int, int(pages_str)))
+        self._refresh_basket()
+        self.entries["book_id"].delete(0, tk.END)
+        self.entries["pages"].delete(0, tk.END)
+        self.entries["book_id"].focus_set()
+
+    def _remove_from_basket(self, _event=None):
+        for index in reversed(self.basket_list.curselection()):
+            del self._basket[index]
+        self._refresh_basket()
+
+    def _refresh_basket(self):
+        self.basket_list.delete(0, tk.END)
+        for book_id, pages in self._basket:
+            self.basket_list.insert(tk.END, f"Book {book_id}  ·  {pages} pages")
+        n = len(self._basket)
+        self.checkout_btn.configure(text="Checkout Basket" + (f" ({n})" if n else ""),
+                                    state=("normal" if n else "disabled"))
+
+    def checkout_basket(self):
+        user_id = self.entries["user_id"].get().strip()
+        if not self._valid_user_id(user_id) or not self._basket:
+            return
+        uid_pad = str(int(user_id)).zfill(3)
+
+        self.checkout_btn.configure(state="disabled")   # no double submit while it runs
+        self.runner.submit(
+            self._checkout, uid_pad, list(self._basket), self.user_role.get(),
+            self.entries["borrow_date"], self.entries["return_date"],
+            on_success=lambda result: self._on_checkout_done(uid_pad, result),
+            on_error=self._on_checkout_error,
+        )
+
+    def _checkout(self, uid_pad, basket, user_role, borrow_date, return_date):
+        """Worker thread: validate, predict and insert a whole basket.
+
+        One query checks the member and every book (and reads each book's
+        category, books.title), one model call predicts every holding
+        period, and all rows go in with executemany in one transaction.
+        Returns {"user_exists", "missing": [book_id], "predictions": [(book_id, days)]};
+        nothing is inserted unless the member and all books exist.
+        """
+        book_ids = [book_id for book_id, _pages in basket]
+        marks = ", ".join(["%s"] * len(book_ids))
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # The derived row keeps the member check even if no book matches
+                cursor.execute(f"""
+                    SELECT m.ok, b.book_id, b.title
+                    FROM (SELECT EXISTS(SELECT 1 FROM members WHERE member_id = %s) AS ok) m
+                    LEFT JOIN books b ON b.book_id IN ({marks})
+                """, (uid_pad, *book_ids))
+                rows = cursor.fetchall()
+                user_exists = bool(rows[0][0])
+                categories = {book_id: title for _ok, book_id, title in rows if book_id is not None}
+                missing = [book_id for book_id in book_ids if book_id not in categories]
+                if not user_exists or missing:
+                    return {"user_exists": user_exists, "missing": missing, "predictions": []}
+
+                features = [build_features(pages, user_role, categories[book_id], uid_pad, book_id)
+                            for book_id, pages in basket]
+                predictions = predict_holding_days_batch(features)
+
+                cursor.executemany(_INSERT_LENDING, [
+                    (uid_pad, book_id, borrow_date, return_date, int(days), pages, *f[1:7])
+                    for (book_id, pages), f, days in zip(basket, features, predictions)
+                ])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        member_profile.invalidate(uid_pad)   # borrowed list/count changed
+        return {"user_exists": True, "missing": [],
+                "predictions": [(book_id, float(days)) for book_id, days in zip(book_ids, predictions)]}
+
+    def _on_checkout_done(self, uid_pad, result):
+        if not result["user_exists"]:
+            messagebox.showerror("Error", f"User ID {uid_pad} does not exist.")
+        elif result["missing"]:
+            messagebox.showerror("Error", "Book ID(s) not found: " + ", ".join(map(str, result["missing"]))
+                                 + "\n\nRemove them from the basket and check out again.")
+        else:
+            lines = "\n".join(f"Book {book_id}: {days:.2f} days" for book_id, days in result["predictions"])
+            messagebox.showinfo(
+                "Success",
+                f"{len(result['predictions'])} lending record(s) created for user {uid_pad}.\n\n"
+                f"Predicted Holding Days:\n{lines}"
+            )
+            self._basket = []
+            if self.entries["user_id"].winfo_exists():
+                self.entries["user_id"].delete(0, tk.END)
+            if self._prefill_active:
+                self._advance_prefill()
+        if self.basket_list is not None and self.basket_list.winfo_exists():
+            self._refresh_basket()
+
+    def _on_checkout_error(self, err):
+        if self.checkout_btn is not None and self.checkout_btn.winfo_exists():
+            self._refresh_basket()
+        self._on_lending_error(err)
+
+    def _on_lending_error(self, err):
+        if isinstance(err, mysql.connector.Error):
+            messagebox.showerror("Database Error", f"Error: {err}")
+        else:
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(err)}")
+
 
     def _toggle_sidebar(self, parent):
         """Show/hide the right sidebar with notifications."""
@@ -457,7 +643,26 @@ class lending:
         )
 
     def _prefill_from_notification(self, user_id: str, book_id: str):
-        """Callback used by the sidebar 'Confirm' button to prefill form fields."""
+        """Callback used by the sidebar 'Confirm' button, once per confirmed row.
+
+        Rows are queued; the first is prefilled now and each successful
+        lending prefills the next, so a batch can be worked through back to back.
+        """
+        self._prefill_queue.append((user_id, book_id))
+        if not self._prefill_active:
+            self._advance_prefill()
+        else:
+            self._update_queue_badge()
+
+    def _advance_prefill(self):
+        if not self._prefill_queue:
+            self._prefill_active = False
+            self._update_queue_badge()
+            return
+        user_id, book_id = self._prefill_queue.popleft()
+        self._prefill_active = True
+        self._update_queue_badge()
+
         # Ensure entries exist and are editable
         if "user_id" in self.entries and hasattr(self.entries["user_id"], "delete"):
             self.entries["user_id"].delete(0, tk.END)
@@ -473,14 +678,23 @@ class lending:
             pass
 
 
+    def _update_queue_badge(self):
+        if self.toggle_btn is not None and self.toggle_btn.winfo_exists():
+            n = len(self._prefill_queue)
+            self.toggle_btn.configure(text="🔔 Notifications" + (f" ({n} queued)" if n else ""))
+
+    def _set_notification_color(self, has_notifs):
+        if self.toggle_btn is not None and self.toggle_btn.winfo_exists():
+            self.toggle_btn.configure(bg=("#e74c3c" if has_notifs else "#27ae60"))
+
     def _has_pending_notifications(self):
         """Return True if there are pending notifications in the table."""
         try:
-            conn = self.db.connect()
-            cur = conn.cursor()
-            cur.execute(f"SELECT COUNT(*) FROM user_notifications WHERE status='PENDING'")
-            count = cur.fetchone()[0]
-            cur.close(); conn.close()
+            with self.db.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"SELECT COUNT(*) FROM user_notifications WHERE status='PENDING'")
+                count = cur.fetchone()[0]
+                cur.close()
             return count > 0
         except Exception as e:
             print("DB check failed:", e)
@@ -0,0 +1,224 @@
+# member_import.py
+"""Bulk member import from a CSV file plus a folder of photos.
+
+    python -m adminRole.member_import intake.csv --photos intake_photos/ --rejects rejects.csv
+
+Expected columns: member_id, name, age, email, contact and an optional
+`photo` column with a file name inside the photo folder. Without it,
+<member_id>.jpg / .jpeg / .png is looked up in the folder.
+
+Rows are checked with the MemberManagement rules. Ids already in members
+are found with one IN (...) query and skipped. Photos are decoded and
+resized in a process pool (with thumbnails, see utils.member_photos).
+Rows then go in with executemany, one transaction per batch.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from database import Database
+from utils.member_photos import make_thumbnail
+
+FIELDS = ("member_id", "name", "age", "email", "contact")
+PHOTO_EXTS = (".jpg", ".jpeg", ".png")
+PHOTO_MAX_SIDE = 1024    # stored photos are downscaled to this; originals can be 12 MP
+# executemany sends a batch as one multi-row INSERT, which has to fit in the
+# server's max_allowed_packet (4 MB on 5.7, 64 MB on 8.0); batches are cut by
+# the bytes of photo data they carry, not by row count
+BATCH_BYTES = 3 * 1024 * 1024
+REJECT_SAMPLE = 100
+
+_INSERT = """
+    INSERT INTO members (member_id, name, age, email, contact, photo, photo_thumb)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def validate_member_fields(member_id, name, age, email, contact):
+    """Normalised (member_id, name, age, email, contact), or ValueError with the reason.
+
+    Shared by the MemberManagement form and the importer.
+    """
+    member_id, name, age, email, contact = (str(v or "").strip() for v in (member_id, name, age, email, contact))
+
+    if not re.fullmatch(r'\d{3}', member_id):
+        raise ValueError("Member ID must be exactly 3 digits (numbers only).")
+    if not name:
+        raise ValueError("Name is required.")
+    if not re.fullmatch(r'\d{2}', age):
+        raise ValueError("Invalid Age format.")
+    if not re.fullmatch(r"[^@]+@[^@]+\.[^@]+", email):
+        raise ValueError("Invalid email format.")
+    if not re.fullmatch(r'\d{10}', contact):
+        raise ValueError("Contact number must be exactly 10 digits (numbers only).")
+
+    return member_id, name, age, email, contact
+
+
+def _prepare_photo(path):
+    """Process-pool worker: (photo, thumbnail, error) for one file; JPEG bytes or the error text."""
+    try:
+        with Image.open(path) as img:
+            img = img.convert("RGB")
+            img.thumbnail((PHOTO_MAX_SIDE, PHOTO_MAX_SIDE), Image.LANCZOS)
+            out = BytesIO()
+            img.save(out, format="JPEG", quality=90)
+        photo = out.getvalue()
+        return photo, make_thumbnail(photo), None
+    except Exception as e:
+        return None, None, f"Unreadable photo {os.path.basename(path)}: {e}"
+
+
+def _photo_path(row, photo_dir):
+    if not photo_dir:
+        return None
+    name = (row.get("photo") or "").strip()
+    if name:
+        path = os.path.join(photo_dir, name)
+        return path if os.path.isfile(path) else None
+    for ext in PHOTO_EXTS:
+        path = os.path.join(photo_dir, row["member_id"] + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _existing_ids(db, ids):
+    if not ids:
+        return set()
+    marks = ", ".join(["%s"] * len(ids))
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT member_id FROM members WHERE member_id IN ({marks})", list(ids))
+        found = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+    return found
+
+
+def import_members(csv_path, photo_dir=None, db=None, workers=None, on_progress=None, rejects_path=None):
+    """Import the members in csv_path. Returns stats: read, inserted, duplicates,
+    rejected, photos, seconds (plus reject_sample). on_progress(stats) runs after each batch.
+    """
+    db = db or Database()
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "rejected": 0, "photos": 0,
+             "reject_sample": [], "seconds": 0.0}
+    start = time.perf_counter()
+    rejects = []
+
+    def reject(line, row, reason):
+        stats["rejected"] += 1
+        if len(stats["reject_sample"]) < REJECT_SAMPLE:
+            stats["reject_sample"].append((line, reason))
+        rejects.append((line,) + tuple(row.get(f, "") for f in FIELDS) + (reason,))
+
+    # 1. Validate (member ids are 3 digits, so an intake is at most 1000 rows)
+    valid = {}          # member_id -> (line, fields, raw row)
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [h.strip().lower() for h in (reader.fieldnames or [])]
+        missing = [c for c in FIELDS if c not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"{os.path.basename(csv_path)} is missing column(s): {', '.join(missing)}")
+        for line, row in enumerate(reader, start=2):
+            stats["read"] += 1
+            try:
+                fields = validate_member_fields(*(row.get(c) for c in FIELDS))
+            except ValueError as e:
+                reject(line, row, str(e))
+                continue
+            row["member_id"] = fields[0]
+            if fields[0] in valid:
+                reject(line, row, f"Member ID {fields[0]} appears more than once in the file.")
+                continue
+            valid[fields[0]] = (line, fields, row)
+
+    # 2. Dedupe against the table in one query
+    for member_id in _existing_ids(db, list(valid)):
+        del valid[member_id]
+        stats["duplicates"] += 1
+
+    # 3. Photos, decoded and resized in parallel processes
+    entries = list(valid.values())
+    paths = [_photo_path(row, photo_dir) for _line, _fields, row in entries]
+    images = [(None, None, None)] * len(entries)
+    todo = [i for i, p in enumerate(paths) if p]
+    if todo:
+        # spawn, not fork: this runs on a worker thread of the Tk app, and
+        # forking a process with Tk, pool and bus threads running can deadlock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for i, result in zip(todo, pool.map(_prepare_photo, [paths[i] for i in todo], chunksize=8)):
+                images[i] = result
+
+    # 4. Insert in batches, one transaction each
+    batch = []
+    batch_bytes = 0
+
+    def flush():
+        nonlocal batch_bytes
+        if not batch:
+            return
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(_INSERT, batch)
+                conn.commit()
+                stats["inserted"] += cursor.rowcount
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        batch.clear()
+        batch_bytes = 0
+        stats["seconds"] = time.perf_counter() - start
+        if on_progress:
+            on_progress(dict(stats))
+
+    for (line, fields, row), (photo, thumb, error) in zip(entries, images):
+        if error:
+            reject(line, row, error)
+            continue
+        if photo is not None:
+            stats["photos"] += 1
+        size = len(photo or b"") + len(thumb or b"") + 512    # 512: the text fields, generously
+        if batch and batch_bytes + size > BATCH_BYTES:
+            flush()
+        batch.append(fields + (photo, thumb))
+        batch_bytes += size
+    flush()
+
+    if rejects_path:
+        with open(rejects_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("line",) + FIELDS + ("reason",))
+            writer.writerows(sorted(rejects))
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import members from a CSV file and a photo folder.")
+    parser.add_argument("csv_path")
+    parser.add_argument("--photos", default=None, help="folder with the member photos")
+    parser.add_argument("--workers", type=int, default=None, help="photo processes (default: CPU count)")
+    parser.add_argument("--rejects", default=None, help="write rejected rows (with reasons) to this CSV")
+    args = parser.parse_args(argv)
+
+    stats = import_members(args.csv_path, args.photos, workers=args.workers, rejects_path=args.rejects)
+    print(f"{stats['read']} read, {stats['inserted']} inserted ({stats['photos']} with photos), "
+          f"{stats['duplicates']} already members, {stats['rejected']} rejected "
+          f"in {stats['seconds']:.1f}s")
+    for line, reason in stats["reject_sample"][:10]:
+        print(f"  line {line}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+from utils.notification_bus import Subscriber
+from utils.task_runner import TaskRunner
+
+POLL_MIN_MS = 5000     # poll rate while notifications are coming in
+POLL_MAX_MS = 60000    # ceiling for the backoff when nothing changes
+MAX_ROWS = 100
+
 class SidebarNotifications:
   
     def __init__(self, parent, db, on_confirm=None, table_name="user_notifications"):
@@ -9,11 +16,18 @@ class SidebarNotifications:
         self.on_confirm = on_confirm
         self.table = table_name
         self._job = None
+        self._loading = None
+        self._max_id = 0                 # high-water mark of notification_id seen so far
+        self._interval = POLL_MIN_MS
+        self._pushed = False             # a push arrived while a sync was running
 
         # OUTER: still use pack to dock at right
         self.frame = tk.Frame(parent, bg="#f7f9fc", width=340, bd=1, relief="solid")
         self.frame.pack(side="right", fill="y")
         self.frame.pack_propagate(False)
+        self.runner = TaskRunner(self.frame)
+        # New requests are pushed by the user side; polling stays as the fallback
+        self.bus = Subscriber(self.frame, self._on_push)
 
         # ----- INSIDE: use GRID so buttons never disappear -----
         self.frame.grid_columnconfigure(0, weight=1)   # single column
@@ -34,7 +48,8 @@ class SidebarNotifications:
         body.grid_rowconfigure(0, weight=1)
 
         cols = ("notification_id", "user_id", "book_id", "book_title", "created_at")
-        self.tree = ttk.Treeview(body, columns=cols, show="headings")
+        # extended: Ctrl/Shift-click to confirm or reject several requests at once
+        self.tree = ttk.Treeview(body, columns=cols, show="headings", selectmode="extended")
         for c, w, a in (
             ("notification_id", 80,  "center"),
             ("user_id",         70,  "center"),
@@ -70,54 +85,141 @@ class SidebarNotifications:
             activebackground="#2c3e50", command=self.refresh, cursor="hand2"
         ).pack(side="right")
 
-        # Initial load + auto-refresh
+        # Initial load + auto-refresh (next poll is scheduled when a sync finishes)
         self.refresh()
-        self._job = self.frame.after(5000, self._tick)
 
     # ---------- Lifecycle ----------
     def destroy(self):
+        self._cancel_tick()
+        self.bus.close()
+        self.runner.close()
+        self.frame.destroy()
+
+    def _cancel_tick(self):
         if self._job:
             try:
                 self.frame.after_cancel(self._job)
             except Exception:
                 pass
             self._job = None
-        self.frame.destroy()
 
     def _tick(self):
-        self.refresh()
-        self._job = self.frame.after(5000, self._tick)
+        self._job = None
+        self.refresh(manual=False)
+
+    def _schedule_tick(self, changed):
+        # Back off while nothing changes; snap back to the fast rate on activity.
+        # With the bus connected, new requests arrive as pushes and the poll
+        # only has to catch status changes made on other terminals.
+        if changed:
+            self._interval = POLL_MIN_MS
+        elif self.bus.connected:
+            self._interval = POLL_MAX_MS
+        else:
+            self._interval = min(self._interval * 2, POLL_MAX_MS)
+        self._cancel_tick()
+        delay = 0 if self._pushed else self._interval
+        self._pushed = False
+        self._job = self.frame.after(delay, self._tick)
+
+    def _on_push(self, _event):
+        if self._loading is not None and not self._loading.future.done():
+            self._pushed = True      # sync again as soon as this one lands
+            return
+        self.refresh(manual=False)
 
     # ---------- Data ops ----------
-    def refresh(self):
-        try:
-            conn = self.db.connect()
+    def refresh(self, manual=True):
+        # Skip if the previous sync hasn't come back yet
+        if self._loading is not None and not self._loading.future.done():
+            return
+        self._cancel_tick()
+        if manual:
+            self._interval = POLL_MIN_MS
+
+        shown = [int(iid) for iid in self.tree.get_children()]
+        self._loading = self.runner.submit(
+            self._load_delta, self._max_id, shown,
+            on_success=self._apply_delta,
+            on_error=lambda e: self._on_load_error(e, manual),
+            busy=manual,        # timed polls and pushes run without the watch cursor
+        )
+
+    def _load_delta(self, since_id, shown):
+        """Worker thread: (new pending rows above since_id, shown ids no longer
+        pending, older pending rows to fill the list back up to MAX_ROWS).
+
+        Every query is bounded by MAX_ROWS, so the cost per poll doesn't
+        grow with how long the sidebar has been open.
+        """
+        with self.db.connection() as conn:
             cur = conn.cursor(dictionary=True)
             cur.execute(f"""
                 SELECT notification_id, user_id, book_id, book_title, created_at
                 FROM {self.table}
-                WHERE status='PENDING'
-                ORDER BY created_at DESC
-                LIMIT 100
-            """)
-            rows = cur.fetchall()
-            cur.close(); conn.close()
-        except Exception as e:
+                WHERE status='PENDING' AND notification_id > %s
+                ORDER BY notification_id DESC
+                LIMIT {MAX_ROWS}
+            """, (since_id,))
+            added = cur.fetchall()
+
+            gone = []
+            if shown:
+                marks = ", ".join(["%s"] * len(shown))
+                cur.execute(f"""
+                    SELECT notification_id FROM {self.table}
+                    WHERE notification_id IN ({marks}) AND status='PENDING'
+                """, shown)
+                still = {r["notification_id"] for r in cur.fetchall()}
+                gone = [nid for nid in shown if nid not in still]   # handled or deleted
+
+            # Requests below the high-water mark that aren't listed (older than
+            # the newest MAX_ROWS, or trimmed off earlier) come back as room frees up
+            listed = [nid for nid in shown if nid not in gone]
+            listed += [r["notification_id"] for r in added if r["notification_id"] not in listed]
+            room = MAX_ROWS - len(listed)
+            older = []
+            if room > 0:
+                exclude = ""
+                if listed:
+                    exclude = f"AND notification_id NOT IN ({', '.join(['%s'] * len(listed))})"
+                cur.execute(f"""
+                    SELECT notification_id, user_id, book_id, book_title, created_at
+                    FROM {self.table}
+                    WHERE status='PENDING' AND notification_id <= %s {exclude}
+                    ORDER BY notification_id DESC
+                    LIMIT {room}
+                """, (max([since_id] + listed), *listed))
+                older = cur.fetchall()
+            cur.close()
+        return added, gone, older
+
+    def _on_load_error(self, e, manual):
+        if manual:
             messagebox.showerror("DB Error", f"Load failed:\n{e}")
-            rows = []
+        else:
+            print(f"[WARNING] Notification sync failed: {e}")
+        self._schedule_tick(changed=False)
+
+    def _apply_delta(self, delta):
+        added, gone, older = delta
 
-        # Clear + repopulate
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        for nid in gone:
+            if self.tree.exists(str(nid)):
+                self.tree.delete(str(nid))
 
-        for r in rows:
+        for r in added + older:
+            nid = r.get("notification_id")
+            self._max_id = max(self._max_id, nid)
+            if self.tree.exists(str(nid)):
+                continue
             ts = r.get("created_at")
             if isinstance(ts, datetime):
                 ts = ts.strftime("%Y-%m-%d %H:%M")
             self.tree.insert(
-                "", "end",
+                "", "end", iid=str(nid),
                 values=(
-                    r.get("notification_id"),
+                    nid,
                     r.get("user_id"),
                     r.get("book_id"),
                     r.get("book_title", ""),
@@ -125,51 +227,96 @@ class SidebarNotifications:
                 )
             )
 
+        # Newest on top, bounded like the old LIMIT 100 view
+        if added or older:
+            order = sorted(self.tree.get_children(), key=int, reverse=True)
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+            for iid in order[MAX_ROWS:]:
+                self.tree.delete(iid)
+
+        self._schedule_tick(changed=bool(added or gone or older))
+
     def _selected(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showinfo("Info", "Select a notification row.")
-            return None
+            return []
         # values: [notification_id, user_id, book_id, book_title, created_at]
-        return self.tree.item(sel[0])["values"]
+        return [self.tree.item(iid)["values"] for iid in sel]
 
-    def _confirm(self):
-        vals = self._selected()
-        if not vals:
-            return
-        notif_id, user_id, book_id = vals[0], vals[1], vals[2]
+    def _set_status(self, notif_ids, status):
+        """Worker thread: move the still-pending rows among notif_ids to status.
 
-        # Send IDs back to lending form first
-        if self.on_confirm:
+        One transaction: lock the rows that are still PENDING, update them
+        with a single IN (...) statement and return the ids actually changed,
+        so a request another terminal already handled isn't processed twice.
+        """
+        marks = ", ".join(["%s"] * len(notif_ids))
+        with self.db.connection() as conn:
+            cur = conn.cursor()
             try:
-                self.on_confirm(str(user_id), str(book_id))
-            except Exception as e:
-                messagebox.showwarning("Prefill", f"Callback failed:\n{e}")
-
-     
-        try:
-            conn = self.db.connect(); cur = conn.cursor()
-            cur.execute(f"UPDATE {self.table} SET status = 'CONFIRMED' WHERE notification_id = %s", (notif_id,))
-            conn.commit(); cur.close(); conn.close()
-        except Exception as e:
-            messagebox.showerror("DB Error", f"Status Change failed:\n{e}")
+                cur.execute(f"""
+                    SELECT notification_id FROM {self.table}
+                    WHERE notification_id IN ({marks}) AND status = 'PENDING'
+                    FOR UPDATE
+                """, notif_ids)
+                claimed = [r[0] for r in cur.fetchall()]
+                if claimed:
+                    marks = ", ".join(["%s"] * len(claimed))
+                    cur.execute(
+                        f"UPDATE {self.table} SET status = %s WHERE notification_id IN ({marks})",
+                        (status, *claimed),
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+        return claimed
+
+    def _drop_rows(self, notif_ids):
+        # Handled here, so patch the list instead of waiting for the next poll
+        for nid in notif_ids:
+            if self.tree.exists(str(nid)):
+                self.tree.delete(str(nid))
+
+    def _on_status_error(self, e):
+        messagebox.showerror("DB Error", f"Status Change failed:\n{e}")
+
+    def _confirm(self):
+        rows = self._selected()
+        if not rows:
             return
+        ids = [vals[0] for vals in rows]
 
-        self.refresh()
+        def done(claimed):
+            self._drop_rows(ids)
+            claimed = set(claimed)
+            # Send IDs back to lending form, oldest request first; it queues them
+            if self.on_confirm:
+                for notif_id, user_id, book_id, *_rest in sorted(rows, key=lambda v: v[0]):
+                    if notif_id not in claimed:
+                        continue
+                    try:
+                        self.on_confirm(str(user_id), str(book_id))
+                    except Exception as e:
+                        messagebox.showwarning("Prefill", f"Callback failed:\n{e}")
+                        break
+            skipped = len(ids) - len(claimed)
+            if skipped:
+                messagebox.showinfo("Info", f"{skipped} request(s) were already handled elsewhere.")
+
+        self.runner.submit(self._set_status, ids, "CONFIRMED", on_success=done, on_error=self._on_status_error)
 
     def _reject(self):
-        vals = self._selected()
-        if not vals:
-            return
-        notif_id = vals[0]
-
-       
-        try:
-            conn = self.db.connect(); cur = conn.cursor()
-            cur.execute(f"UPDATE {self.table} SET status = 'REJECTED' WHERE notification_id = %s", (notif_id,))
-            conn.commit(); cur.close(); conn.close()
-        except Exception as e:
-            messagebox.showerror("DB Error", f"Status Change failed:\n{e}")
+        rows = self._selected()
+        if not rows:
             return
+        ids = [vals[0] for vals in rows]
 
-        self.refresh()
+        self.runner.submit(
+            self._set_status, ids, "REJECTED",
+            on_success=lambda _claimed: self._drop_rows(ids), on_error=self._on_status_error,
+        )
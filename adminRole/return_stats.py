@@ -0,0 +1,144 @@
+# return_stats.py
+"""Per-day and per-month return totals, kept up to date as returns are made.
+
+Returns.submit_return calls record_return() in the same transaction as the
+return_records insert, so the report reads a few summary rows instead of
+aggregating the whole history. If the summary ever drifts (rows edited by
+hand, a failed deploy...), regenerate it:
+
+    python -m adminRole.return_stats rebuild
+"""
+import argparse
+import threading
+from datetime import date, datetime
+
+from database import Database
+
+DAILY = "return_stats_daily"
+MONTHLY = "return_stats_monthly"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        bucket        DATE           NOT NULL PRIMARY KEY,
+        returns       INT            NOT NULL DEFAULT 0,
+        total_fine    DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        total_overdue BIGINT         NOT NULL DEFAULT 0
+    )
+"""
+
+_UPSERT = """
+    INSERT INTO {table} (bucket, returns, total_fine, total_overdue)
+    VALUES (%s, 1, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        returns = returns + 1,
+        total_fine = total_fine + VALUES(total_fine),
+        total_overdue = total_overdue + VALUES(total_overdue)
+"""
+
+_ready = False
+_ready_lock = threading.Lock()
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d").date()
+
+
+def ensure_tables(conn):
+    """Create the summary tables on first use, seeding them from history."""
+    global _ready
+    if _ready:
+        return
+    with _ready_lock:
+        if _ready:
+            return
+        cursor = conn.cursor()
+        cursor.execute("SHOW TABLES LIKE %s", (MONTHLY,))
+        exists = cursor.fetchone() is not None
+        cursor.close()
+        if not exists:
+            _rebuild(conn)
+        _ready = True
+
+
+def record_return(cursor, actual_return_date, overdue_days, fine):
+    """Add one return to its day and month buckets. The caller commits."""
+    day = _as_date(actual_return_date)
+    for table, bucket in ((DAILY, day), (MONTHLY, day.replace(day=1))):
+        cursor.execute(_UPSERT.format(table=table), (bucket, fine or 0, overdue_days or 0))
+
+
+def read_summary(conn, today=None):
+    """(total returns, total fine, average overdue days, returns this month)."""
+    ensure_tables(conn)
+    month = (today or date.today()).replace(day=1)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT SUM(returns), SUM(total_fine), SUM(total_overdue) FROM {MONTHLY}")
+    total, total_fine, total_overdue = cursor.fetchone()
+    cursor.execute(f"SELECT returns FROM {MONTHLY} WHERE bucket = %s", (month,))
+    row = cursor.fetchone()
+    cursor.close()
+
+    total = int(total or 0)
+    avg_overdue = float(total_overdue) / total if total else None
+    return total, total_fine, avg_overdue, (row[0] if row else 0)
+
+
+def _rebuild(conn):
+    cursor = conn.cursor()
+    try:
+        for table in (DAILY, MONTHLY):
+            cursor.execute(_SCHEMA.format(table=table))
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {DAILY} (bucket, returns, total_fine, total_overdue)
+            SELECT DATE(actual_return_date), COUNT(*), COALESCE(SUM(fine), 0), COALESCE(SUM(overdue_days), 0)
+            FROM return_records
+            WHERE actual_return_date IS NOT NULL
+            GROUP BY DATE(actual_return_date)
+        """)
+        cursor.execute(f"""
+            INSERT INTO {MONTHLY} (bucket, returns, total_fine, total_overdue)
+            SELECT DATE_SUB(bucket, INTERVAL DAYOFMONTH(bucket) - 1 DAY),
+                   SUM(returns), SUM(total_fine), SUM(total_overdue)
+            FROM {DAILY}
+            GROUP BY DATE_SUB(bucket, INTERVAL DAYOFMONTH(bucket) - 1 DAY)
+        """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def rebuild(db=None):
+    """Regenerate both summary tables from return_records. Returns the day count."""
+    global _ready
+    db = db or Database()
+    with db.connection() as conn:
+        _rebuild(conn)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {DAILY}")
+        days = cursor.fetchone()[0]
+        cursor.close()
+    _ready = True
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintenance for the return statistics summary.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="regenerate the daily/monthly buckets from return_records")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        days = rebuild()
+        print(f"Rebuilt {DAILY} and {MONTHLY}: {days} day(s) of returns")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 
-from tkinter import messagebox, ttk
+from tkinter import messagebox
 import tkinter as tk
-from datetime import datetime, timedelta
+from datetime import datetime
 import mysql.connector
 from database import Database
+from adminRole import return_stats
+from userRole import member_profile
+from utils.task_runner import TaskRunner
 
 class Returns:
     
@@ -16,6 +19,7 @@ class Returns:
         self.show_admin_main_menu = go_back_callback
         self.db = Database()
         self.return_entries = {}
+        self.runner = None
         
 
     def clear_frame(self):
@@ -28,6 +32,7 @@ class Returns:
         form_container = tk.Frame(self.content_frame, bg="white", bd=0,
                                   highlightbackground="#d1d8e0", highlightthickness=1)
         form_container.pack(fill="both", expand=True, padx=20, pady=20)
+        self.runner = TaskRunner(form_container)
 
         header = tk.Frame(form_container, bg="#e67e22", height=50)
         header.pack(fill="x", pady=(0, 20))
@@ -110,8 +115,6 @@ class Returns:
                 messagebox.showerror("Validation Error", "Please fetch record and fill required fields.")
                 return
 
-            conn = self.db.connect()
-            cursor = conn.cursor()
             insert_sql = """
                 INSERT INTO return_records (
                     user_id, book_id, borrow_date, expected_return_date, actual_return_date,predicted_date,
@@ -123,34 +126,56 @@ class Returns:
                 actual_return_date, predicted_date,int(overdue_days), float(fine)
             )
 
-            cursor.execute(insert_sql, values)
-            conn.commit()
-            
-            
-            # 2. Delete the lending record after return
-            delete_sql = """
-                DELETE FROM lending_records
-                WHERE user_id = %s AND book_id = %s AND borrow_date = %s
-            """
-            cursor.execute(delete_sql, (user_id, book_id, borrow_date))
-
-            conn.commit()
-            cursor.close()
-            conn.close()
+            self.runner.submit(
+                self._store_return, insert_sql, values, (user_id, book_id, borrow_date),
+                (actual_return_date, int(overdue_days), float(fine)),
+                on_success=self._on_return_stored, on_error=self._on_return_error,
+            )
 
-            messagebox.showinfo("Success", "Return record submitted successfully.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Unexpected error: {str(e)}")
 
-            # ✅ Clear all fields after success
-            for key, entry in self.return_entries.items():
-                entry.config(state="normal")
-                entry.delete(0, tk.END)
-                if key in ["borrow_date", "expected_return_date", "actual_return_date","predicted_date", "overdue_days", "fine"]:
-                    entry.config(state="readonly")
+    def _store_return(self, insert_sql, values, lending_key, stats):
+        """Worker thread: record the return, update the summary and drop the lending row."""
+        with self.db.connection() as conn:
+            return_stats.ensure_tables(conn)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(insert_sql, values)
+
+                # 2. Day/month totals for the report, in the same transaction
+                return_stats.record_return(cursor, *stats)
+
+                # 3. Delete the lending record after return
+                delete_sql = """
+                    DELETE FROM lending_records
+                    WHERE user_id = %s AND book_id = %s AND borrow_date = %s
+                """
+                cursor.execute(delete_sql, lending_key)
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        member_profile.invalidate(lending_key[0])   # fines and borrowed list changed
+
+    def _on_return_stored(self, _result):
+        messagebox.showinfo("Success", "Return record submitted successfully.")
+
+        # ✅ Clear all fields after success
+        for key, entry in self.return_entries.items():
+            entry.config(state="normal")
+            entry.delete(0, tk.END)
+            if key in ["borrow_date", "expected_return_date", "actual_return_date","predicted_date", "overdue_days", "fine"]:
+                entry.config(state="readonly")
 
-        except mysql.connector.Error as err:
+    def _on_return_error(self, err):
+        if isinstance(err, mysql.connector.Error):
             messagebox.showerror("Database Error", f"Error: {err}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error: {str(e)}")
+        else:
+            messagebox.showerror("Error", f"Unexpected error: {str(err)}")
 
 
     def fetch_borrow_info(self):
@@ -162,7 +187,18 @@ class Returns:
                 messagebox.showwarning("Input Error", "Please enter both User ID and Book ID.")
                 return
 
-            conn = self.db.connect()
+            self.runner.submit(
+                self._load_borrow_info, user_id, book_id,
+                on_success=self._show_borrow_info,
+                on_error=lambda e: messagebox.showerror("Database Error", str(e)),
+            )
+
+        except Exception as e:
+            messagebox.showerror("Database Error", str(e))
+
+    def _load_borrow_info(self, user_id, book_id):
+        """Worker thread: latest lending row for (user, book), or None."""
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT borrow_date, return_date,predict_date FROM lending_records
@@ -170,31 +206,28 @@ class Returns:
                 ORDER BY borrow_date DESC LIMIT 1
             """, (user_id, book_id))
             row = cursor.fetchone()
+            cursor.close()
+        return row
 
-            if row:
-                self.return_entries["borrow_date"].config(state="normal")
-                self.return_entries["expected_return_date"].config(state="normal")
-                self.return_entries["predicted_date"].config(state="normal")
-                
-                self.return_entries["borrow_date"].delete(0, tk.END)
-                self.return_entries["expected_return_date"].delete(0, tk.END)
-                self.return_entries["predicted_date"].delete(0, tk.END)
-                
-                self.return_entries["borrow_date"].insert(0, row[0])
-                self.return_entries["expected_return_date"].insert(0, row[1])
-                self.return_entries["predicted_date"].insert(0, row[2])
-                
-                self.return_entries["borrow_date"].config(state="readonly")
-                self.return_entries["expected_return_date"].config(state="readonly")
-                self.return_entries["predicted_date"].config(state="readonly")
-            else:
-                messagebox.showinfo("Not Found", "No lending record found.")
-
-        except Exception as e:
-            messagebox.showerror("Database Error", str(e))
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+    def _show_borrow_info(self, row):
+        if row:
+            self.return_entries["borrow_date"].config(state="normal")
+            self.return_entries["expected_return_date"].config(state="normal")
+            self.return_entries["predicted_date"].config(state="normal")
+            
+            self.return_entries["borrow_date"].delete(0, tk.END)
+            self.return_entries["expected_return_date"].delete(0, tk.END)
+            self.return_entries["predicted_date"].delete(0, tk.END)
+            
+            self.return_entries["borrow_date"].insert(0, row[0])
+            self.return_entries["expected_return_date"].insert(0, row[1])
+            self.return_entries["predicted_date"].insert(0, row[2])
+            
+            self.return_entries["borrow_date"].config(state="readonly")
+            self.return_entries["expected_return_date"].config(state="readonly")
+            self.return_entries["predicted_date"].config(state="readonly")
+        else:
+            messagebox.showinfo("Not Found", "No lending record found.")
 
 
     def calculate_fine(self):
@@ -1,13 +1,8 @@
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from prediction_model import predict_holding_days
-from adminRole.returns import Returns
 
-from adminRole.lending import lending as Lending
-from adminRole.book_management import BookManagement
-from adminRole.ReturnReport  import ReturnReport 
-from adminRole.MemberManagement  import MemberManagement
+# Screens are imported when first opened: BookManagement needs tkcalendar,
+# MemberManagement cv2 and Lending the prediction model.
 
 
 class AdminPanel:
@@ -85,6 +80,7 @@ class AdminPanel:
 
     # Simple menu functions that show info messages
     def book_management(self):
+        from adminRole.book_management import BookManagement
         self.clear_frame()
         BookManagement(
             parent=self.content_frame,
@@ -92,6 +88,7 @@ class AdminPanel:
         )
 
     def membership_management(self):
+        from adminRole.MemberManagement import MemberManagement
         self.clear_frame()
         MemberManagement(
             parent=self.content_frame,
@@ -99,6 +96,7 @@ class AdminPanel:
         )
         
     def returns(self):
+        from adminRole.returns import Returns
         returns_ui = Returns(
         parent=self.parent,
         content_frame=self.content_frame,
@@ -111,6 +109,7 @@ class AdminPanel:
         
 
     def reporting(self):
+        from adminRole.ReturnReport import ReturnReport
         report_ui = ReturnReport(
             parent=self.parent,
             content_frame=self.content_frame,
@@ -122,6 +121,7 @@ class AdminPanel:
         report_ui.show_report()
 
     def lending(self):
+        from adminRole.lending import lending as Lending
         lending_ui = Lending(
             parent=self.parent,
             content_frame=self.content_frame,
@@ -0,0 +1,69 @@
+# bench_prediction.py
+"""Single-row vs batch throughput of the holding-days model.
+
+Run from the project root (the model is loaded from ./model):
+
+    python benchmarks/bench_prediction.py --rows 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prediction_model import (  # noqa: E402
+    build_features, predict_holding_days, predict_holding_days_batch,
+)
+
+ROLES = ["staff", "student"]
+CATEGORIES = ["fiction", "history", "non-fiction", "science"]
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        build_features(
+            int(rng.integers(50, 1200)),
+            ROLES[int(rng.integers(len(ROLES)))],
+            CATEGORIES[int(rng.integers(len(CATEGORIES)))],
+            int(rng.integers(1, 999)),
+            int(rng.integers(1, 5000)),
+        )
+        for _ in range(n)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    predict_holding_days(rows[0])            # warm up
+    predict_holding_days_batch(rows[:2])
+
+    single = batch = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        one_by_one = [predict_holding_days(r) for r in rows]
+        single = min(single, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        together = predict_holding_days_batch(rows)
+        batch = min(batch, time.perf_counter() - start)
+
+    if not np.allclose(one_by_one, together, rtol=1e-5, atol=1e-5):
+        print("WARNING: batch and single-row predictions differ")
+
+    print(f"rows: {args.rows}  (best of {args.repeat})")
+    print(f"single-row: {single:8.3f}s  {args.rows / single:12.0f} rows/s")
+    print(f"batch:      {batch:8.3f}s  {args.rows / batch:12.0f} rows/s")
+    print(f"speed-up:   {single / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
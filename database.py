@@ -1,11 +1,178 @@
 # database.py
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty, Full
+
 import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+class ConnectionPool:
+    """Process-wide pool of MySQL connections with borrow/return semantics.
+
+    Connections are created lazily up to `size`. A borrower that finds the
+    pool empty waits up to `timeout` seconds for another screen to return one
+    before a PoolError is raised. Every checkout pings the connection first
+    so a connection dropped by the server is replaced instead of handed out.
+    """
+
+    def __init__(self, factory, size=5, timeout=10.0):
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle = Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self.stats = {
+            "checkouts": 0,
+            "created": 0,
+            "discarded": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+        }
+
+    def _healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+            self.stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _try_create(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        return conn
+
+    def acquire(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                conn = self._try_create()
+                if conn is None:
+                    # Pool exhausted: wait for a connection to come back
+                    start = time.perf_counter()
+                    with self._lock:
+                        self.stats["waits"] += 1
+                    try:
+                        conn = self._idle.get(timeout=self.timeout)
+                    except Empty:
+                        with self._lock:
+                            self.stats["timeouts"] += 1
+                        raise PoolError(
+                            f"No database connection available after {self.timeout:.0f}s "
+                            f"(pool size {self.size})"
+                        )
+                    finally:
+                        with self._lock:
+                            self.stats["wait_time"] += time.perf_counter() - start
+                else:
+                    with self._lock:
+                        self.stats["checkouts"] += 1
+                    return conn
+
+            if self._healthy(conn):
+                with self._lock:
+                    self.stats["checkouts"] += 1
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        try:
+            # Never hand the next borrower a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            self._discard(conn)
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self.stats)
+            data["open"] = self._created
+        data["idle"] = self._idle.qsize()
+        data["in_use"] = data["open"] - data["idle"]
+        data["size"] = self.size
+        return data
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
 
 class Database:
+    POOL_SIZE = 5          # connections shared by every screen in this process
+    POOL_TIMEOUT = 10.0    # seconds to wait for a free connection
+
     def connect(self):
+        """Open a new raw connection. Screens should use connection() instead."""
         return mysql.connector.connect(
             host="localhost",
             user="root",            # Use your MySQL username
             password="cbc@123",  # Use your MySQL password
             database="library_db"   # Use your actual database name
         )
+
+    @classmethod
+    def configure_pool(cls, size=None, timeout=None):
+        """Change pool settings. Takes effect for the pool created next."""
+        if size is not None:
+            cls.POOL_SIZE = size
+        if timeout is not None:
+            cls.POOL_TIMEOUT = timeout
+
+    def pool(self):
+        global _pool
+        if _pool is None:
+            with _pool_lock:
+                if _pool is None:
+                    _pool = ConnectionPool(self.connect, size=self.POOL_SIZE, timeout=self.POOL_TIMEOUT)
+        return _pool
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a `with` block.
+
+        Uncommitted work is rolled back when the block exits, so callers must
+        commit explicitly, exactly as they did with their own connections.
+        """
+        pool = self.pool()
+        conn = pool.acquire()
+        try:
+            yield conn
+        finally:
+            pool.release(conn)
+
+    def pool_stats(self):
+        return self.pool().snapshot()
+
+
+def like_prefix(term):
+    """LIKE pattern matching values that start with term (wildcards in term escaped)."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
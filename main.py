@@ -1,11 +1,27 @@
+import os
+import sys
+from utils import startup_report
+
+# Must run before the imports below so they show up in the report
+if "--startup-report" in sys.argv or os.environ.get("LIBRARY_STARTUP_REPORT"):
+    startup_report.enable()
+
 import tkinter as tk
 from tkinter import font
 from PIL import Image, ImageTk
-from admin_panel import AdminPanel
-from user_panel import UserPanel
 from tkinter import font, simpledialog, messagebox
-import os
+import mysql.connector
+from mysql.connector.errors import PoolError
 from database import Database
+from utils.task_runner import TaskRunner
+from utils.warmup import start_warmup
+
+# Admin and user panels (and pandas, xgboost, cv2, ... behind them) are
+# imported on first login, or earlier by the background warm-up.
+# Can't connect / unknown host / server gone away / lost connection
+DB_DOWN_ERRNOS = (2003, 2005, 2006, 2013)
+
+WARMUP = "--no-warmup" not in sys.argv and os.environ.get("LIBRARY_WARMUP", "1") != "0"
 
 class LibrarySystemApp:
     def __init__(self, root):
@@ -15,6 +31,7 @@ class LibrarySystemApp:
         self.root.configure(bg="#f0f2f5")
         
         self.db = Database()
+        self.schema_state = None    # None (not checked), "checking", "ready" or "failed"
         
         # Custom font setup
         self.title_font = font.Font(family="Helvetica", size=28, weight="bold")
@@ -24,6 +41,7 @@ class LibrarySystemApp:
         # Create main container with background image
         self.main_frame = tk.Frame(root, bg="#f0f2f5")
         self.main_frame.pack(fill="both", expand=True)
+        self.runner = TaskRunner(self.main_frame)
         
         # Load background image
         self.bg_image_path = os.path.join("image", "main_frame.jpg")
@@ -36,6 +54,57 @@ class LibrarySystemApp:
         
         self.show_main_menu()
 
+    def on_first_frame(self):
+        """Runs once the login window has been drawn."""
+        startup_report.mark("first frame drawn")
+        if startup_report.is_enabled():
+            print(startup_report.report())
+        if WARMUP:
+            start_warmup()
+        self._check_schema()
+
+    # ---------- Schema migrations ----------
+    def _check_schema(self):
+        """Apply pending migrations off the Tk thread; logins wait for it."""
+        import migrations
+        self.schema_state = "checking"
+        self.runner.submit(migrations.migrate, on_success=self._on_schema_ready, on_error=self._on_schema_error)
+
+    def _on_schema_ready(self, ran):
+        self.schema_state = "ready"
+        if ran:
+            print(f"[INFO] Applied schema migration(s): {', '.join(map(str, ran))}")
+
+    def _on_schema_error(self, e):
+        import migrations
+        unreachable = (isinstance(e, (mysql.connector.InterfaceError, PoolError))
+                       or getattr(e, "errno", None) in DB_DOWN_ERRNOS)
+        if unreachable or isinstance(e, migrations.MigrationBusy):
+            # Not a schema problem: check again at the next login
+            self.schema_state = None
+            print(f"[WARNING] Schema check postponed: {e}")
+            return
+        self.schema_state = "failed"
+        print(f"[ERROR] Schema migration failed: {e}")
+        messagebox.showerror(
+            "Database Upgrade Failed",
+            f"The database schema could not be upgraded:\n\n{e}\n\n"
+            "Fix the problem, run 'python migrations.py' and restart the app.",
+        )
+
+    def _schema_ready(self):
+        """True if screens may use the database; otherwise tells the user why not."""
+        if self.schema_state == "ready":
+            return True
+        if self.schema_state == "failed":
+            messagebox.showerror("Database Upgrade Failed",
+                                 "The database schema is out of date. Run 'python migrations.py' and restart the app.")
+            return False
+        if self.schema_state is None:
+            self._check_schema()
+        messagebox.showinfo("Please Wait", "Checking the database, please try again in a moment.")
+        return False
+
     def show_main_menu(self):
         # Clear existing content
         for widget in self.main_frame.winfo_children():
@@ -151,11 +220,14 @@ class LibrarySystemApp:
                 font=("Helvetica", 18), bg="#3498db", fg="white").pack()
 
     def prompt_admin_login(self):
+        if not self._schema_ready():
+            return
         admin_id = simpledialog.askstring("Admin Login", "Enter Admin User Name :", parent=self.root, show='*')
         passsword = simpledialog.askstring("Admin Login", "Enter Admin Password  :", parent=self.root , show='*')
         if admin_id and passsword:
             if admin_id=='admin'and passsword=='admin':
-        
+                from admin_panel import AdminPanel
+
                 for widget in self.main_frame.winfo_children():
                     if widget != self.bg_label:  # Keep the background image
                         widget.destroy()
@@ -165,33 +237,42 @@ class LibrarySystemApp:
   
     
     def prompt_user_login(self):
+        if not self._schema_ready():
+            return
         user_id = simpledialog.askstring("User Login", "Enter your Member ID (e.g., 101):", parent=self.root, show='*')
         contact = simpledialog.askstring("User Login", "Enter your Contact Number (10 digits):", parent=self.root, show='*')
 
         if user_id and contact:
-            if self.validate_user(user_id.strip(), contact.strip()):
-                for widget in self.main_frame.winfo_children():
-                    if widget != getattr(self, 'bg_label', None):
-                        widget.destroy()
-                UserPanel(self.main_frame, self.show_main_menu, member_id=user_id.strip())
-            else:
-                messagebox.showerror("Login Failed", "Invalid Member ID or Contact Number.")
+            self.runner.submit(
+                self.validate_user, user_id.strip(), contact.strip(),
+                on_success=lambda ok: self._on_user_validated(ok, user_id.strip()),
+                on_error=lambda e: messagebox.showerror("Database Error", f"Error: {e}"),
+            )
+
+    def _on_user_validated(self, ok, user_id):
+        if ok:
+            from user_panel import UserPanel
+            for widget in self.main_frame.winfo_children():
+                if widget != getattr(self, 'bg_label', None):
+                    widget.destroy()
+            UserPanel(self.main_frame, self.show_main_menu, member_id=user_id)
+        else:
+            messagebox.showerror("Login Failed", "Invalid Member ID or Contact Number.")
 
 
     def validate_user(self, member_id, contact):
-        try:
-            conn = self.db.connect()
+        # Runs on a worker thread; errors are reported by the caller's on_error
+        with self.db.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM members WHERE member_id = %s AND contact = %s", (member_id, contact))
-            return cursor.fetchone() is not None
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Error: {e}")
-            return False
-        finally:
-            if 'conn' in locals() and conn.is_connected():
-                conn.close()
+            cursor.execute("SELECT 1 FROM members WHERE member_id = %s AND contact = %s", (member_id, contact))
+            found = cursor.fetchone() is not None
+            cursor.close()
+        return found
     
 if __name__ == "__main__":
     root = tk.Tk()
     app = LibrarySystemApp(root)
+    startup_report.mark("login window built")
+    # Idle callbacks run after the pending redraw, i.e. once the window is on screen
+    root.after_idle(app.on_first_frame)
     root.mainloop()
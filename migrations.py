@@ -0,0 +1,202 @@
+# migrations.py
+"""Schema migrations for library_db.
+
+Each migration runs once and is recorded in schema_migrations. MySQL
+commits DDL immediately, so every step is written to be safe to re-run:
+a migration that stops half way is simply run again next time.
+
+    python migrations.py            # apply pending migrations
+    python migrations.py status     # list applied / pending
+
+The app also applies them in the background on start-up. Terminals take
+a MySQL named lock around the run, so only one of them migrates.
+"""
+import argparse
+
+from database import Database
+
+LOCK_NAME = "library_migrations"
+LOCK_WAIT_S = 120       # how long a terminal waits for another one's run
+
+
+class MigrationBusy(RuntimeError):
+    """Another terminal held the migration lock for longer than LOCK_WAIT_S."""
+
+
+def _column_type(cur, table, column):
+    cur.execute("""
+        SELECT DATA_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    row = cur.fetchone()
+    return row[0].lower() if row else None
+
+
+def _add_index(cur, table, name, columns):
+    cur.execute("""
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+    """, (table, name))
+    if cur.fetchone() is None:
+        cur.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+
+
+# ---------- Migrations ----------
+def _m001_normalise_ids(cur):
+    # Refuse to start rather than let MODIFY truncate (or, in strict mode,
+    # half-apply) ids that don't fit in CHAR(3)
+    cur.execute("SELECT member_id FROM members WHERE CHAR_LENGTH(member_id) > 3 ORDER BY member_id LIMIT 10")
+    too_long = [row[0] for row in cur.fetchall()]
+    if too_long:
+        raise RuntimeError(
+            "Cannot convert members.member_id to CHAR(3); these ids are longer than 3 characters: "
+            + ", ".join(map(str, too_long)) + ". Fix or renumber them, then run the migration again."
+        )
+
+    # Member ids are the 3-digit strings MemberManagement accepts ('001');
+    # pad the '1'-style ids older screens wrote, everywhere they're stored.
+    for table, column in (
+        ("members", "member_id"),
+        ("lending_records", "user_id"),
+        ("return_records", "user_id"),
+        ("user_notifications", "user_id"),
+    ):
+        cur.execute(
+            f"UPDATE {table} SET {column} = LPAD({column}, 3, '0') "
+            f"WHERE {column} REGEXP '^[0-9]{{1,2}}$'"
+        )
+    cur.execute("ALTER TABLE members MODIFY member_id CHAR(3) NOT NULL")
+
+    # Book ids are numeric; store them as numbers so equality hits the index
+    for table, null in (
+        ("books", "NOT NULL"),
+        ("lending_records", "NULL"),
+        ("return_records", "NULL"),
+        ("user_notifications", "NULL"),
+    ):
+        if _column_type(cur, table, "book_id") != "bigint":
+            cur.execute(f"ALTER TABLE {table} MODIFY book_id BIGINT {null}")
+
+
+def _m002_lookup_indexes(cur):
+    _add_index(cur, "lending_records", "ix_lending_user_book_borrow", ("user_id", "book_id", "borrow_date"))
+    _add_index(cur, "user_notifications", "ix_notifications_status_created", ("status", "created_at"))
+    _add_index(cur, "return_records", "ix_returns_actual_date", ("actual_return_date",))
+
+
+def _m003_member_photo_thumbs(cur):
+    # Filled on save by MemberManagement; existing rows: python -m utils.member_photos backfill
+    if _column_type(cur, "members", "photo_thumb") is None:
+        cur.execute("ALTER TABLE members ADD COLUMN photo_thumb MEDIUMBLOB NULL AFTER photo")
+
+
+def _m004_member_search_indexes(cur):
+    # Prefix search in MemberManagement (member_id is the primary key already)
+    _add_index(cur, "members", "ix_members_name", ("name",))
+    _add_index(cur, "members", "ix_members_email", ("email",))
+    _add_index(cur, "members", "ix_members_contact", ("contact",))
+
+
+def _m005_book_search_indexes(cur):
+    # (title, book_id) is the BookManagement sort and keyset; the rest serve its search
+    _add_index(cur, "books", "ix_books_title_id", ("title", "book_id"))
+    _add_index(cur, "books", "ix_books_name", ("book_name",))
+    _add_index(cur, "books", "ix_books_author", ("author",))
+    _add_index(cur, "books", "ix_books_year", ("year",))
+
+
+def _m006_return_user_index(cur):
+    # The member profile's fine/count subqueries filter return_records by user_id
+    _add_index(cur, "return_records", "ix_returns_user", ("user_id",))
+
+
+# (version, description, function) in the order they must run
+MIGRATIONS = [
+    (1, "normalise member and book id types", _m001_normalise_ids),
+    (2, "indexes for lending, notification and return lookups", _m002_lookup_indexes),
+    (3, "member photo thumbnails", _m003_member_photo_thumbs),
+    (4, "indexes for member search", _m004_member_search_indexes),
+    (5, "indexes for catalogue search", _m005_book_search_indexes),
+    (6, "index for per-member return totals", _m006_return_user_index),
+]
+
+
+def _applied(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version     INT          NOT NULL PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at  DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def pending(db=None):
+    """Migrations not yet applied, as (version, description)."""
+    db = db or Database()
+    with db.connection() as conn:
+        cur = conn.cursor()
+        done = _applied(cur)
+        cur.close()
+    return [(v, d) for v, d, _fn in MIGRATIONS if v not in done]
+
+
+def migrate(db=None):
+    """Apply every pending migration in order. Returns the versions applied."""
+    db = db or Database()
+    ran = []
+    with db.connection() as conn:
+        cur = conn.cursor()
+        locked = False
+        try:
+            done = _applied(cur)
+            if all(v in done for v, _d, _fn in MIGRATIONS):
+                return ran            # the usual case: no lock needed
+
+            cur.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_WAIT_S))
+            locked = cur.fetchone()[0] == 1
+            if not locked:
+                raise MigrationBusy(f"Another terminal has been migrating for over {LOCK_WAIT_S}s")
+            done = _applied(cur)      # it may have applied them while we waited
+            for version, description, fn in MIGRATIONS:
+                if version in done:
+                    continue
+                print(f"[INFO] Applying migration {version}: {description}")
+                fn(cur)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                    (version, description),
+                )
+                conn.commit()
+                ran.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if locked:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cur.fetchone()
+            cur.close()
+    return ran
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply library_db schema migrations.")
+    parser.add_argument("command", nargs="?", choices=["migrate", "status"], default="migrate")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        todo = dict(pending())
+        for version, description, _fn in MIGRATIONS:
+            state = "pending" if version in todo else "applied"
+            print(f"{version:>4}  {state:<8} {description}")
+    else:
+        ran = migrate()
+        print(f"Applied {len(ran)} migration(s)" if ran else "Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,109 @@
 # === prediction_model.py ===
-import joblib
 import numpy as np
 import os
+import threading
 
 # ✅ Correct filenames
 model_path = os.path.join("model", "xgb_regressor_model.pkl")
 scaler_path = os.path.join("model", "scaler_for_xgb.pkl")
 
-# ✅ Load model and scaler with joblib
-model = joblib.load(model_path)
-scaler = joblib.load(scaler_path)
+# Model and scaler are unpickled on first use (joblib pulls in xgboost and
+# sklearn, which is most of the admin side's cold-start cost).
+_model = None
+_scaler = None
+_load_lock = threading.Lock()
+
+
+def load_model():
+    """Load the model and scaler once; safe to call from a warm-up thread."""
+    global _model, _scaler
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                import joblib
+                model = joblib.load(model_path)
+                _scaler = joblib.load(scaler_path)
+                _model = model   # set last: other threads test _model
+    return _model, _scaler
+
+
+def __getattr__(name):
+    # Keeps `prediction_model.model` / `.scaler` working without eager loading
+    if name == "model":
+        return load_model()[0]
+    if name == "scaler":
+        return load_model()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Column order the scaler and model were trained on (see lending.submit_lending)
+FEATURE_NAMES = [
+    "pages",
+    "user_role_staff",
+    "user_role_student",
+    "book_category_fiction",
+    "book_category_history",
+    "book_category_nonfiction",
+    "book_category_science",
+    "user_id",
+    "book_id",
+]
+
+
+def build_features(pages, user_role, book_category, user_id, book_id):
+    """One feature row in FEATURE_NAMES order."""
+    return [
+        pages,
+        1 if user_role == "staff" else 0,
+        1 if user_role == "student" else 0,
+        1 if book_category == "fiction" else 0,
+        1 if book_category == "history" else 0,
+        1 if book_category == "non-fiction" else 0,
+        1 if book_category == "science" else 0,
+        int(user_id),
+        int(book_id)
+    ]
+
+
+def _as_matrix(features):
+    """Validate a batch and return it as a float 2-D array in FEATURE_NAMES order."""
+    columns = getattr(features, "columns", None)
+    if columns is not None:
+        # DataFrame: match columns by name, reordering if needed
+        names = [str(c) for c in columns]
+        missing = [c for c in FEATURE_NAMES if c not in names]
+        extra = [c for c in names if c not in FEATURE_NAMES]
+        if missing or extra:
+            raise ValueError(
+                f"Feature columns do not match the model. Missing: {missing or '-'}; unexpected: {extra or '-'}"
+            )
+        features = features[FEATURE_NAMES].to_numpy()
+
+    arr = np.asarray(features, dtype=float)
+    if arr.ndim == 1 and arr.size == len(FEATURE_NAMES):
+        arr = arr.reshape(1, -1)
+    if arr.ndim != 2 or arr.shape[1] != len(FEATURE_NAMES):
+        raise ValueError(
+            f"Expected an (n, {len(FEATURE_NAMES)}) feature array in the order {FEATURE_NAMES}, got shape {arr.shape}"
+        )
+    return arr
+
 
 def predict_holding_days(input_features):
+    model, scaler = load_model()
     input_array = np.array(input_features).reshape(1, -1)
     scaled_input = scaler.transform(input_array)
     return model.predict(scaled_input)[0]
+
+
+def predict_holding_days_batch(features):
+    """Predict holding days for many rows with one scaler and one model call.
+
+    features: 2-D array-like with columns in FEATURE_NAMES order, or a
+    DataFrame whose column names are exactly FEATURE_NAMES (any order).
+    Returns a 1-D numpy array with one prediction per row.
+    """
+    arr = _as_matrix(features)
+    if arr.shape[0] == 0:
+        return np.empty(0, dtype=float)
+    model, scaler = load_model()
+    return np.asarray(model.predict(scaler.transform(arr)))
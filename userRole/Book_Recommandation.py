@@ -1,12 +1,7 @@
 import os
-import difflib
-import threading
-import tempfile
-from io import BytesIO
-
-import numpy as np
-import pandas as pd
-import requests
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
 from PIL import Image, ImageTk
 import sqlite3
 from tkinter import simpledialog
@@ -14,6 +9,20 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database import Database
+from userRole.artifact_store import get_store
+from userRole.cover_loader import CoverLoader
+from utils import notification_bus
+from utils.task_runner import TaskRunner
+from userRole.similarity_matrix import top_neighbours
+
+SUGGEST_DELAY_MS = 200    # debounce between the last keystroke and the lookup
+SUGGEST_MIN_CHARS = 2
+SUGGEST_LIMIT = 8
+SUGGEST_POLL_MS = 30      # how often finished lookups are handed to Tk
+
+# One worker is enough: a new keystroke cancels whatever is still queued
+_suggest_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="title-suggest")
+
 
 class BookRecommendation:
     def __init__(self, parent, content_frame, title_font, label_font, button_font, go_back_callback):
@@ -25,47 +34,32 @@ class BookRecommendation:
         self.go_back_callback = go_back_callback
         self.db = Database()
         self._thumb_refs = {}          # keep PhotoImage refs alive
-        self._artifacts_loaded = False
 
-        # --- Resolve paths robustly ---
+        # Search-as-you-type state
+        self._suggest_job = None       # pending debounce timer
+        self._suggest_future = None    # lookup queued or running on the worker
+        self._suggest_seq = 0          # bumps on each keystroke; older results are ignored
+        self._suggest_results = queue.Queue()   # (seq, matches) from the worker
+        self._suggest_poll_job = None  # drains _suggest_results on the Tk thread
+
+        # Artifacts are shared by every screen in the process
+        self.store = get_store()
         self.base_dir = os.path.dirname(os.path.abspath(__file__))      # ...\LibrarySystem\userRole
-        parent_dir    = os.path.dirname(self.base_dir)                   # ...\LibrarySystem
-        cwd_dir       = os.getcwd()
-
-        model_candidates = [
-            os.path.join(self.base_dir, "model"),
-            os.path.join(parent_dir, "model"),
-            os.path.join(cwd_dir,   "model"),
-        ]
-        self.model_dir = next((p for p in model_candidates if os.path.isdir(p)), None)
-        if not self.model_dir:
-            self.model_dir = os.path.join(parent_dir, "model")  # best guess
-
-        db_candidates = [
-            os.path.join(parent_dir, "database"),
-            os.path.join(self.base_dir, "database"),
-            os.path.join(cwd_dir, "database"),
-        ]
-        self.database_dir = next((p for p in db_candidates if os.path.isdir(p)), None)
-
-        self.files = {
-            "popular": os.path.join(self.model_dir, "popular.parquet"),
-            "pt":      os.path.join(self.model_dir, "pt.parquet"),
-            "books":   os.path.join(self.model_dir, "books.parquet"),
-            "sims":    os.path.join(self.model_dir, "similarity_scores.npy"),
-        }
-
-        # Cache for cover images
-        self._cache_dir = os.path.join(tempfile.gettempdir(), "book_reco_cache_tk")
-        os.makedirs(self._cache_dir, exist_ok=True)
+        self.model_dir = self.store.model_dir
+        self.files = self.store.files
+
+        # Cover images (thumbnails cached process-wide, see cover_cache)
+        self.covers = CoverLoader(self.parent, size=(140, 180))
 
         # Placeholders set in _load_artifacts()
         self.POPULAR = None
         self.PT = None
         self.BOOKS = None
         self.SIMS = None
+        self.NEIGHBOURS = None
+        self.META = {}
         self.TITLES = None
-        self.TITLES_LOWER = None
+        self.SEARCH = None
 
     
     def book_predictions(self,member_id):
@@ -80,19 +74,19 @@ class BookRecommendation:
         # Outer frame
         outer = tk.Frame(self.content_frame, bg="#e6f2ff", bd=2, relief="groove")
         outer.pack(fill="both", expand=True)
+        self.runner = TaskRunner(outer)   # cancelled when the screen is torn down
 
         tk.Label(
             outer, text="📚 Book Recommendation", font=self.title_font,
             bg="#e6f2ff", fg="#033974"
         ).pack(pady=(20, 10))
 
-        # Try load artifacts once
-        if not self._artifacts_loaded:
-            try:
-                self._load_artifacts()
-            except Exception as e:
-                messagebox.showerror("Data Load Error", f"Failed to load artifacts:\n{e}")
-                return
+        # Shared store only re-reads files that changed since the last load
+        try:
+            self._load_artifacts()
+        except Exception as e:
+            messagebox.showerror("Data Load Error", f"Failed to load artifacts:\n{e}")
+            return
 
         # Main container: only recommender UI (no Top-50, no prediction)
         main = tk.Frame(outer, bg="#e6f2ff")
@@ -113,58 +107,15 @@ class BookRecommendation:
 
     # ---------- Data loading ----------
     def _load_artifacts(self):
-        # Ensure files exist
-        missing = [k for k in ("popular", "pt", "books", "sims") if not os.path.exists(self.files[k])]
-        if missing:
-            lines = [f"- {k}: {self.files[k]}" for k in missing]
-            raise FileNotFoundError("Missing data file(s):\n" + "\n".join(lines))
-
-        # Parquet/NumPy
-        try:
-            self.POPULAR = pd.read_parquet(self.files["popular"])
-            self.PT      = pd.read_parquet(self.files["pt"])
-            self.BOOKS   = pd.read_parquet(self.files["books"])
-            self.SIMS    = np.load(self.files["sims"])
-        except ImportError as e:
-            raise ImportError("Parquet engine missing. Install with:  pip install pyarrow") from e
-        except Exception as e:
-            raise RuntimeError(f"Error reading artifacts: {e}") from e
-
-        # Optional: override/fill cover images from Books.csv
-        try:
-            if self.database_dir:
-                csv_books = os.path.join(self.database_dir, "Books.csv")
-                if os.path.exists(csv_books):
-                    df_csv = pd.read_csv(csv_books)
-                    # prefer medium, else large, else small
-                    for col in ["Image-URL-M", "Image-URL-L", "Image-URL-S"]:
-                        if col not in df_csv.columns:
-                            df_csv[col] = ""
-                    df_csv = df_csv[["Book-Title", "Image-URL-M", "Image-URL-L", "Image-URL-S"]].drop_duplicates("Book-Title")
-                    self.BOOKS = (
-                        self.BOOKS.drop_duplicates("Book-Title")
-                        .merge(df_csv, on="Book-Title", how="left", suffixes=("", "_csv"))
-                    )
-                    # Choose best available url into a single column
-                    def pick_url(row):
-                        for col in ["Image-URL-M_csv", "Image-URL-M", "Image-URL-L_csv", "Image-URL-L", "Image-URL-S_csv", "Image-URL-S"]:
-                            v = str(row.get(col, "") or "").strip()
-                            if v:
-                                return v
-                        return ""
-                    self.BOOKS["Image-URL-M"] = self.BOOKS.apply(pick_url, axis=1)
-                    # Drop helper columns
-                    dropcols = [c for c in self.BOOKS.columns if c.endswith("_csv")]
-                    if dropcols:
-                        self.BOOKS.drop(columns=dropcols, inplace=True)
-        except Exception as e:
-            print(f"⚠️ CSV image merge skipped: {e}")
-
-        # Index helpers
-        self.TITLES = pd.Index(self.PT.index)
-        self.TITLES_LOWER = pd.Index([str(t).lower() for t in self.TITLES])
-
-        self._artifacts_loaded = True
+        data = self.store.recommendation()
+        self.POPULAR = data.POPULAR
+        self.PT = data.PT
+        self.BOOKS = data.BOOKS
+        self.SIMS = data.SIMS
+        self.NEIGHBOURS = data.NEIGHBOURS
+        self.META = data.META
+        self.TITLES = data.TITLES
+        self.SEARCH = data.SEARCH
 
     # ---------- Recommend UI ----------
     def _build_recommend_ui(self, master):
@@ -184,6 +135,20 @@ class BookRecommendation:
         tk.Button(row, text="Recommend", font=self.button_font, bg="#033974", fg="white", padx=20,pady=10,
                 command=self._on_recommend_click).pack(side="left")
 
+        # Live suggestions drop down under the entry while typing
+        self.suggest_box = tk.Listbox(master, height=6, font=("Segoe UI", 11),
+                                      bg="white", fg="#2c3e50", activestyle="none",
+                                      highlightthickness=1, highlightbackground="#bdc3c7",
+                                      selectbackground="#3498db", selectforeground="white")
+        self.suggest_box.bind("<ButtonRelease-1>", self._on_suggestion_pick)
+        self.suggest_box.bind("<Return>", self._on_suggestion_pick)
+        self.suggest_box.bind("<Escape>", lambda _e: self._hide_suggestions())
+        self.entry.bind("<KeyRelease>", self._on_entry_key)
+        self.entry.bind("<Return>", lambda _e: self._on_recommend_click())
+        self.entry.bind("<Down>", self._focus_suggestions)
+        self.entry.bind("<Escape>", lambda _e: self._hide_suggestions())
+        self.entry.bind("<Destroy>", lambda _e: self._cancel_suggest())
+
         # Info label
         self.info_label = tk.Label(master, text="", font=self.label_font, bg="#e6f2ff", fg="#2c3e50")
         self.info_label.pack(anchor="w", pady=(0, 10))
@@ -212,39 +177,164 @@ class BookRecommendation:
             lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         )
         self.canvas.bind("<Configure>", self._on_canvas_configure)
+        # Leaving the screen drops any cover downloads still pending
+        self.cards_frame.bind("<Destroy>", lambda _e: self.covers.cancel_all())
 
     def _on_canvas_configure(self, event):
         # Make inner frame width match the visible canvas width
         self.canvas.itemconfig(self.cards_frame_id, width=event.width)
 
+    # ---------- Search-as-you-type ----------
+    def _on_entry_key(self, event):
+        if event.keysym in ("Return", "Escape", "Down", "Up", "Left", "Right", "Tab"):
+            return
+        # Debounce: restart the timer on every keystroke
+        if self._suggest_job is not None:
+            self.parent.after_cancel(self._suggest_job)
+        self._suggest_job = self.parent.after(SUGGEST_DELAY_MS, self._start_suggest)
+
+    def _start_suggest(self):
+        self._suggest_job = None
+        text = (self.entry.get() or "").strip()
+
+        # A newer keystroke supersedes any lookup still queued or running
+        self._suggest_seq += 1
+        seq = self._suggest_seq
+        if self._suggest_future is not None:
+            self._suggest_future.cancel()
+            self._suggest_future = None
+
+        if len(text) < SUGGEST_MIN_CHARS or self.SEARCH is None:
+            self._hide_suggestions()
+            return
+
+        search = self.SEARCH
+        results = self._suggest_results
+        def worker():
+            # Never touches Tk: the poll below hands results over, stale ones are dropped there
+            try:
+                matches = search.search(text, limit=SUGGEST_LIMIT)
+            except Exception as e:
+                print(f"[ERROR] Title suggestion failed: {e!r}")
+                matches = []
+            results.put((seq, matches))
+
+        self._suggest_future = _suggest_pool.submit(worker)
+        if self._suggest_poll_job is None:
+            self._suggest_poll_job = self.parent.after(SUGGEST_POLL_MS, self._poll_suggest)
+
+    def _poll_suggest(self):
+        self._suggest_poll_job = None
+        fut = self._suggest_future
+        # Checked before draining: the worker queues its result before it is done
+        pending = fut is not None and not fut.done()
+        while True:
+            try:
+                seq, matches = self._suggest_results.get_nowait()
+            except queue.Empty:
+                break
+            self._show_suggestions(seq, matches)
+        if pending:
+            self._suggest_poll_job = self.parent.after(SUGGEST_POLL_MS, self._poll_suggest)
+
+    def _cancel_suggest(self):
+        self._suggest_seq += 1
+        if self._suggest_job is not None:
+            try:
+                self.parent.after_cancel(self._suggest_job)
+            except Exception:
+                pass
+            self._suggest_job = None
+        if self._suggest_poll_job is not None:
+            try:
+                self.parent.after_cancel(self._suggest_poll_job)
+            except Exception:
+                pass
+            self._suggest_poll_job = None
+        if self._suggest_future is not None:
+            self._suggest_future.cancel()
+            self._suggest_future = None
+
+    def _show_suggestions(self, seq, matches):
+        if seq != self._suggest_seq or not self.suggest_box.winfo_exists():
+            return
+        self._suggest_future = None
+        self.suggest_box.delete(0, tk.END)
+        if not matches:
+            self._hide_suggestions()
+            return
+        for m in matches:
+            self.suggest_box.insert(tk.END, m.title)
+        self.suggest_box.configure(height=min(len(matches), SUGGEST_LIMIT))
+        self.suggest_box.place(in_=self.entry, x=0, rely=1.0, relwidth=1.0)
+        self.suggest_box.lift()
+
+    def _hide_suggestions(self):
+        if self.suggest_box.winfo_exists():
+            self.suggest_box.place_forget()
+
+    def _focus_suggestions(self, _event=None):
+        if self.suggest_box.winfo_ismapped() and self.suggest_box.size():
+            self.suggest_box.focus_set()
+            self.suggest_box.selection_clear(0, tk.END)
+            self.suggest_box.selection_set(0)
+            self.suggest_box.activate(0)
+        return "break"
+
+    def _on_suggestion_pick(self, _event=None):
+        sel = self.suggest_box.curselection()
+        if not sel:
+            return
+        title = self.suggest_box.get(sel[0])
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, title)
+        self._on_recommend_click()
+        self.entry.focus_set()
+
     def _on_recommend_click(self):
+        self._cancel_suggest()
+        self._hide_suggestions()
         title = (self.entry.get() or "").strip()
         if not title:
             messagebox.showinfo("Info", "Please type a book title.")
             return
 
-        idx, matched = self._find_title_index(title)
-        if idx is None:
+        matches = self._search_titles(title, limit=4)
+        if not matches:
             self.info_label.config(text=f"No match for “{title}”. Try another title.")
             self._clear_cards()
             return
 
-        if matched and matched.lower() != title.lower():
+        idx, matched, kind = matches[0].idx, matches[0].title, matches[0].kind
+        if kind == "fuzzy":
+            others = ", ".join(m.title for m in matches[1:])
+            text = f"Did you mean: {matched}?"
+            if others:
+                text += f"  Other close titles: {others}"
+            self.info_label.config(text=text)
+        elif matched.lower() != title.lower():
             self.info_label.config(text=f"Showing recommendations for: {matched}")
         else:
             self.info_label.config(text="")
 
-        def worker():
-            recs = self._get_similar(idx, top_k=12)  # get more; grid will wrap 4/row
-            self.parent.after(0, lambda: self._show_cards(recs))
-
-        threading.Thread(target=worker, daemon=True).start()
+        # get more; grid will wrap 4/row
+        self.runner.submit(self._get_similar, idx, top_k=12, on_success=self._show_cards)
 
     def _clear_cards(self):
+        self.covers.cancel_all()   # covers still downloading belong to the old cards
         for w in self.cards_frame.winfo_children():
             w.destroy()
         self._thumb_refs.clear()
 
+    def _set_cover(self, label, key, img):
+        """Swap a card's placeholder for its downloaded cover (Tk thread)."""
+        if not label.winfo_exists():
+            return
+        tk_img = ImageTk.PhotoImage(img)
+        self._thumb_refs[key] = tk_img
+        label.configure(image=tk_img)
+        label.image = tk_img
+
     def _show_cards(self, recs):
         self._clear_cards()
         if not recs:
@@ -258,6 +348,10 @@ class BookRecommendation:
         CARD_W = 220
         CARD_H = 320
 
+        # Every card starts with the same placeholder; covers arrive as they download
+        placeholder = ImageTk.PhotoImage(Image.new("RGB", (140, 180), color=(230, 230, 230)))
+        self._thumb_refs["placeholder"] = placeholder
+
         for i, rec in enumerate(recs):
             r = i // COLS
             c = i % COLS
@@ -270,12 +364,11 @@ class BookRecommendation:
             inner = tk.Frame(card, bg="#ffffff")
             inner.pack(fill="both", expand=True, padx=8, pady=8)
 
-            img = self._fetch_image(rec.get("image"), size=(140, 180))
-            tk_img = ImageTk.PhotoImage(img)
-            self._thumb_refs[str(i)] = tk_img
-            img_lbl = tk.Label(inner, image=tk_img, bg="#ffffff")
-            img_lbl.image = tk_img
+            img_lbl = tk.Label(inner, image=placeholder, bg="#ffffff")
+            img_lbl.image = placeholder
             img_lbl.pack(pady=(4, 6))
+            self.covers.load(rec.get("image"),
+                             lambda img, lbl=img_lbl, key=str(i): self._set_cover(lbl, key, img))
 
             title_lbl = tk.Label(
                 inner, text=rec.get("title", ""), bg="#ffffff",
@@ -298,94 +391,30 @@ class BookRecommendation:
                 w.bind("<Button-1>", lambda _e, rec=rec: self._on_card_click(rec))
 
     # ---------- Helpers ----------
-    def _fetch_image(self, url: str, size=(140, 180)) -> Image.Image:
-        """Download image with browser-like headers; cache to temp; graceful fallback."""
-        if not url or not isinstance(url, str) or not url.strip():
-            return Image.new("RGB", size, color=(230, 230, 230))
-
-        safe = "".join(ch if ch.isalnum() else "_" for ch in url)[:200]
-        path = os.path.join(self._cache_dir, safe)
-
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/123.0 Safari/537.36"
-            ),
-            "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Connection": "keep-alive",
-        }
-
-        try:
-            if os.path.exists(path):
-                with open(path, "rb") as f:
-                    data = f.read()
-            else:
-                # First try with plain headers
-                r = requests.get(url, timeout=8, headers=headers, allow_redirects=True)
-                if r.status_code == 403 and "amazon" in url.lower():
-                    # Some CDNs (e.g., old Amazon image links) block default requests
-                    headers2 = dict(headers)
-                    headers2["Referer"] = "https://www.amazon.com/"
-                    r = requests.get(url, timeout=8, headers=headers2, allow_redirects=True)
-                r.raise_for_status()
-                data = r.content
-                with open(path, "wb") as f:
-                    f.write(data)
-
-            img = Image.open(BytesIO(data)).convert("RGB")
-            return img.resize(size, Image.LANCZOS)
-        except Exception:
-            return Image.new("RGB", size, color=(230, 230, 230))
-
     def _find_title_index(self, user_input: str):
         if not user_input:
             return None, None
-        u = user_input.strip().lower()
+        return self.SEARCH.best(user_input)
 
-        # exact (case-insensitive)
-        try:
-            pos = self.TITLES_LOWER.get_loc(u)
-            idx = pos if isinstance(pos, int) else pos[0]
-            return idx, self.TITLES[idx]
-        except KeyError:
-            pass
-
-        # substring
-        mask = self.TITLES_LOWER.str.contains(u, na=False)
-        candidates = self.TITLES[mask]
-        if len(candidates) > 0:
-            return self.TITLES.get_loc(candidates[0]), candidates[0]
-
-        # fuzzy
-        match = difflib.get_close_matches(user_input, self.TITLES.tolist(), n=1, cutoff=0.6)
-        if match:
-            return self.TITLES.get_loc(match[0]), match[0]
-        return None, None
+    def _search_titles(self, user_input: str, limit=5):
+        """Ranked Match(idx, title, score, kind) candidates for user_input."""
+        if not user_input:
+            return []
+        return self.SEARCH.search(user_input, limit=limit)
+
+    def _neighbours(self, idx: int, top_k: int):
+        """Top-k neighbour indices and scores, from the prebuilt index when it is deep enough."""
+        if self.NEIGHBOURS is not None and top_k <= self.NEIGHBOURS.k:
+            return self.NEIGHBOURS.lookup(idx, top_k)
+        return top_neighbours(self.SIMS.row(idx), idx, top_k)
 
     def _get_similar(self, idx: int, top_k=4):
-        sims = list(enumerate(self.SIMS[idx]))
-        sims_sorted = sorted(sims, key=lambda x: x[1], reverse=True)[1:1 + top_k]
         recs = []
-        for i, _score in sims_sorted:
-            title = self.TITLES[i]
-            temp = self.BOOKS[self.BOOKS['Book-Title'] == title].drop_duplicates('Book-Title')
-            if temp.empty:
+        for i, _score in zip(*self._neighbours(idx, top_k)):
+            meta = self.META.get(str(self.TITLES[i]))
+            if meta is None:
                 continue
-            row = temp.iloc[0]
-            # prefer M, else L, else S
-            img_url = ""
-            for col in ["Image-URL-M", "Image-URL-L", "Image-URL-S"]:
-                v = str(row.get(col, "") or "").strip()
-                if v:
-                    img_url = v
-                    break
-            recs.append({
-                "title":  str(row.get('Book-Title', "")),
-                "author": str(row.get('Book-Author', "")),
-                "image":  img_url,
-            })
+            recs.append(meta.as_card())
         return recs
 
 
@@ -408,13 +437,12 @@ class BookRecommendation:
             return
 
       
-        try:
-            rows = self._insert_loan_mysql(user_id, rec)
-            self.parent.after(0, messagebox.showinfo, "Success",
-                            f"Lending recorded. Rows affected: {rows}")
-        except Exception as e:
-            # This ensures the exception text is preserved when the lambda runs later
-            self.parent.after(0, messagebox.showerror, "Error", f"Failed to save:\n{e}")
+        self.runner.submit(
+            self._insert_loan_mysql, user_id, rec,
+            on_success=lambda rows: messagebox.showinfo(
+                "Success", f"Lending recorded. Rows affected: {rows}"),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save:\n{e}"),
+        )
 
 
     def _insert_loan_mysql(self, member_id: str, rec: dict) -> int:
@@ -427,61 +455,65 @@ class BookRecommendation:
         if not title:
             raise ValueError("book record is empty or missing title")
 
-        conn = self.db.connect()
-        try:
-            conn.ping(reconnect=True)
-            with conn.cursor(dictionary=True) as cur:
+        with self.db.connection() as conn:
+            try:
+                with conn.cursor(dictionary=True) as cur:
                
-                cur.execute(
-                    """
-                    SELECT book_id
-                    FROM library_db.books
-                    WHERE book_name = %s AND author = %s
-                    """,
-                    (title, author)
-                )
-                rows = cur.fetchall()
-
-                if not rows:
                     cur.execute(
                         """
                         SELECT book_id
                         FROM library_db.books
-                        WHERE LOWER(book_name) = LOWER(%s) AND LOWER(author) = LOWER(%s)
+                        WHERE book_name = %s AND author = %s
                         """,
                         (title, author)
                     )
                     rows = cur.fetchall()
 
-                if not rows:
+                    if not rows:
+                        cur.execute(
+                            """
+                            SELECT book_id
+                            FROM library_db.books
+                            WHERE LOWER(book_name) = LOWER(%s) AND LOWER(author) = LOWER(%s)
+                            """,
+                            (title, author)
+                        )
+                        rows = cur.fetchall()
+
+                    if not rows:
                     
-                    raise ValueError(f"Book not found in 'books' table for title='{title}', author='{author}'")
+                        raise ValueError(f"Book not found in 'books' table for title='{title}', author='{author}'")
 
-                if len(rows) > 1:
+                    if len(rows) > 1:
                     
-                    pass
+                        pass
 
-                book_id = rows[0]["book_id"]
+                    book_id = rows[0]["book_id"]
 
               
-                cur.execute(
-                    """
-                    INSERT INTO library_db.user_notifications
-                        (user_id, book_id, book_title, book_author, image_url, created_at)
-                    VALUES (%s, %s, %s, %s, %s, NOW())
-                    """,
-                    (str(member_id), book_id, title[:255], author[:255], image[:500])
-                )
-                affected = cur.rowcount
-
-            conn.commit()
-            return affected
+                    cur.execute(
+                        """
+                        INSERT INTO library_db.user_notifications
+                            (user_id, book_id, book_title, book_author, image_url, created_at)
+                        VALUES (%s, %s, %s, %s, %s, NOW())
+                        """,
+                        (str(member_id), book_id, title[:255], author[:255], image[:500])
+                    )
+                    affected = cur.rowcount
+                    notification_id = cur.lastrowid
+
+                conn.commit()
+                # Wake admin sidebars now instead of at their next poll
+                notification_bus.publish(notification_bus.LOAN_REQUEST, {
+                    "notification_id": notification_id,
+                    "user_id": str(member_id),
+                    "book_id": book_id,
+                })
+                return affected
 
-        except Exception as e:
-            print("[DB ERROR]", repr(e))
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            except Exception as e:
+                print("[DB ERROR]", repr(e))
+                conn.rollback()
+                raise
 
     
\ No newline at end of file
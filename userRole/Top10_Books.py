@@ -1,17 +1,16 @@
 # top10books.py
 import os
-import tempfile
-from io import BytesIO
 
 from tkinter import simpledialog
-import pandas as pd
-import numpy as np
-import requests
 from PIL import Image, ImageTk
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database import Database
+from userRole.artifact_store import get_store
+from userRole.cover_loader import CoverLoader
+from utils import notification_bus
+from utils.task_runner import TaskRunner
 
 class Top10_Books:
  
@@ -27,43 +26,24 @@ class Top10_Books:
         # Keep PhotoImage references alive
         self._thumb_refs = {}
 
-        # ---- Resolve folders robustly ----
+        # Artifacts are shared with BookRecommendation (see artifact_store)
+        self.store = get_store()
         self.base_dir = os.path.dirname(os.path.abspath(__file__))      # ...\LibrarySystem\userRole
-        parent_dir    = os.path.dirname(self.base_dir)                   # ...\LibrarySystem
-        cwd_dir       = os.getcwd()
-
-        # Model folder detection
-        model_candidates = [
-            os.path.join(self.base_dir, "model"),
-            os.path.join(parent_dir, "model"),
-            os.path.join(cwd_dir,   "model"),
-        ]
-        self.model_dir = next((p for p in model_candidates if os.path.isdir(p)), None)
-        if not self.model_dir:
-            self.model_dir = os.path.join(parent_dir, "model")  # best guess
-
-        # Optional database folder (for Books.csv fallback)
-        db_candidates = [
-            os.path.join(parent_dir, "database"),
-            os.path.join(self.base_dir, "database"),
-            os.path.join(cwd_dir, "database"),
-        ]
-        self.database_dir = next((p for p in db_candidates if os.path.isdir(p)), None)
-
-        # Files map
-        self.files = {
-            "popular": os.path.join(self.model_dir, "popular.parquet"),
-            "books":   os.path.join(self.model_dir, "books.parquet"),   # optional
-        }
-
-        # Image cache
-        self._cache_dir = os.path.join(tempfile.gettempdir(), "book_top10_cache_tk")
-        os.makedirs(self._cache_dir, exist_ok=True)
+        self.model_dir = self.store.model_dir
+        self.files = self.store.files
+
+        # Cover images (thumbnails cached process-wide, see cover_cache)
+        self.covers = CoverLoader(
+            self.parent, size=(140, 180),
+            # relative cover paths: next to this file, project root, cwd
+            search_dirs=(self.base_dir, os.path.dirname(self.base_dir), os.getcwd()),
+        )
 
         # Data placeholders
         self.POPULAR = None    # DataFrame
         self.BOOKS   = None    # DataFrame (optional)
         self.TOP10   = None    # DataFrame of 10 rows with needed columns
+        self.RECORDS = []      # card dicts built from TOP10 at load time
 
         # UI containers
         self.canvas = None
@@ -84,6 +64,7 @@ class Top10_Books:
         # Outer frame
         outer = tk.Frame(self.content_frame, bg="#e6f2ff", bd=2, relief="groove")
         outer.pack(fill="both", expand=True)
+        self.runner = TaskRunner(outer)   # cancelled when the screen is torn down
 
         tk.Label(
             outer, text="🏆 Top 10 Books", font=self.title_font,
@@ -121,6 +102,8 @@ class Top10_Books:
 
         self.cards_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
         self.canvas.bind("<Configure>", self._on_canvas_configure)
+        # Leaving the screen drops any cover downloads still pending
+        self.cards_frame.bind("<Destroy>", lambda _e: self.covers.cancel_all())
 
         # Render the top 10 as cards
         recs = self._top10_records()
@@ -139,90 +122,22 @@ class Top10_Books:
 
     # ---------- Data loading ----------
     def _load_artifacts(self):
-        # Check popular
-        if not os.path.exists(self.files["popular"]):
-            raise FileNotFoundError(f"Missing file: {self.files['popular']}")
-
-        # Read parquet (requires pyarrow installed)
-        try:
-            self.POPULAR = pd.read_parquet(self.files["popular"])
-        except ImportError as e:
-            raise ImportError("Parquet engine missing. Install with:\n  pip install pyarrow") from e
-        except Exception as e:
-            raise RuntimeError(f"Error reading popular.parquet: {e}") from e
-
-        # If available, load books.parquet for image backfill
-        if os.path.exists(self.files["books"]):
-            try:
-                self.BOOKS = pd.read_parquet(self.files["books"])
-            except Exception:
-                self.BOOKS = None
-        else:
-            self.BOOKS = None
-
-        # Try Books.csv to backfill covers (optional)
-        if self.BOOKS is None and self.database_dir:
-            csv_path = os.path.join(self.database_dir, "Books.csv")
-            if os.path.exists(csv_path):
-                try:
-                    df_csv = pd.read_csv(csv_path)
-                    # Keep relevant columns only
-                    keep = [c for c in ["Book-Title", "Book-Author", "Image-URL-M", "ISBN"] if c in df_csv.columns]
-                    if keep:
-                        self.BOOKS = df_csv[keep].drop_duplicates("Book-Title")
-                except Exception:
-                    self.BOOKS = None
-
-        # Build TOP10 with the needed columns
-        needed_cols = ["Book-Title", "Book-Author", "num_ratings", "avg_rating"]
-        for c in needed_cols:
-            if c not in self.POPULAR.columns:
-                raise ValueError(f"'popular.parquet' must include column: {c}")
-
-        top = self.POPULAR.head(10).copy()
-
-        # Make sure there's an Image-URL-M
-        if "Image-URL-M" not in top.columns or top["Image-URL-M"].isna().all():
-            # Try to merge/bring images from BOOKS if available
-            if self.BOOKS is not None and "Image-URL-M" in self.BOOKS.columns:
-                top = (
-                    top.merge(
-                        self.BOOKS[["Book-Title", "Image-URL-M"]],
-                        on="Book-Title",
-                        how="left",
-                        suffixes=("", "_src")
-                    )
-                )
-                if "Image-URL-M_src" in top.columns:
-                    # prefer the merged one if present
-                    if "Image-URL-M" in top.columns:
-                        top["Image-URL-M"] = top["Image-URL-M_src"].fillna(top["Image-URL-M"])
-                    else:
-                        top["Image-URL-M"] = top["Image-URL-M_src"]
-                    top.drop(columns=[c for c in top.columns if c.endswith("_src")], inplace=True)
-            else:
-                # Create a blank image column so UI doesn't break
-                top["Image-URL-M"] = np.nan
-
-        self.TOP10 = top
+        data = self.store.top10()
+        self.POPULAR = data.POPULAR
+        self.BOOKS = data.BOOKS
+        self.TOP10 = data.TOP10
+        self.RECORDS = data.RECORDS
 
     # ---------- Build card data ----------
     def _top10_records(self):
-        recs = []
-        for _, r in self.TOP10.iterrows():
-            recs.append({
-                "title":  str(r.get("Book-Title", "")),
-                "author": str(r.get("Book-Author", "")),
-                "image":  str(r.get("Image-URL-M", "")) if not pd.isna(r.get("Image-URL-M", np.nan)) else "",
-                "votes":  str(r.get("num_ratings", "")),
-                "rating": str(r.get("avg_rating", "")),
-            })
-        return recs
+        # Copies, so a card handler can't alter the shared records
+        return [dict(r) for r in self.RECORDS]
 
     
     
     def _show_cards(self, recs):
-        # Clear old
+        # Clear old (and drop covers still downloading for them)
+        self.covers.cancel_all()
         for w in self.cards_frame.winfo_children():
             w.destroy()
         self._thumb_refs.clear()
@@ -238,6 +153,10 @@ class Top10_Books:
         CARD_W = 240
         CARD_H = 360
 
+        # Cards render at once with a placeholder; covers are swapped in as they arrive
+        placeholder = ImageTk.PhotoImage(self._placeholder((140, 180)))
+        self._thumb_refs["placeholder"] = placeholder
+
         for i, rec in enumerate(recs):
             r = i // COLS
             c = i % COLS
@@ -252,13 +171,11 @@ class Top10_Books:
             inner.pack(fill="both", expand=True, padx=10, pady=10)
 
             # Image
-            img = self._fetch_image(rec.get("image"), size=(140, 180))
-            tk_img = ImageTk.PhotoImage(img)
-            self._thumb_refs[str(i)] = tk_img
-
-            img_lbl = tk.Label(inner, image=tk_img, bg="#ffffff")
-            img_lbl.image = tk_img
+            img_lbl = tk.Label(inner, image=placeholder, bg="#ffffff")
+            img_lbl.image = placeholder
             img_lbl.pack(pady=(2, 6))
+            self.covers.load(rec.get("image"),
+                             lambda img, lbl=img_lbl, key=str(i): self._set_cover(lbl, key, img))
 
             # Title / Author / Stats — keep references to the widgets
             title_lbl = tk.Label(
@@ -296,79 +213,16 @@ class Top10_Books:
 
     def _placeholder(self, size):
         # light gray fallback
-        from PIL import Image
         return Image.new("RGB", size, color=(240, 240, 240))
 
-
-    def _fetch_image(self, url: str, size=(140, 180)):
-        from PIL import Image
-        import os
-        from io import BytesIO
-        import requests
-
-        # 1) Validate URL value
-        if not url or not isinstance(url, str):
-            return self._placeholder(size)
-        url = url.strip()
-        if not url or url.lower() in {"nan", "none", "null"}:
-            return self._placeholder(size)
-
-        # 2) If it's a local path (absolute)
-        if os.path.isabs(url) and os.path.exists(url):
-            try:
-                return Image.open(url).convert("RGB").resize(size, Image.LANCZOS)
-            except Exception:
-                return self._placeholder(size)
-
-        # 3) If it's a relative path, try relative to a few roots
-        rel_candidates = [
-            os.path.join(self.base_dir, url),
-            os.path.join(os.path.dirname(self.base_dir), url),   # project root
-            os.path.join(os.getcwd(), url),
-        ]
-        for p in rel_candidates:
-            if os.path.exists(p):
-                try:
-                    return Image.open(p).convert("RGB").resize(size, Image.LANCZOS)
-                except Exception:
-                    break  # fall through to HTTP attempt
-
-        # 4) Otherwise assume it's HTTP(S)
-        #    – Some old datasets have http://…; switch to https where possible
-        if url.startswith("http://"):
-            url = "https://" + url[len("http://"):]
-
-        # Use a browser-like UA; Amazon often 403s default Python UA
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0 Safari/537.36"
-            ),
-            "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-        }
-        if "amazon" in url:
-            headers["Referer"] = "https://www.amazon.com/"
-
-        # Simple disk cache
-        safe = "".join(ch if ch.isalnum() else "_" for ch in url)[:200]
-        cache_path = os.path.join(self._cache_dir, safe)
-
-        try:
-            if os.path.exists(cache_path):
-                with open(cache_path, "rb") as f:
-                    data = f.read()
-            else:
-                r = requests.get(url, headers=headers, timeout=10)
-                r.raise_for_status()
-                data = r.content
-                with open(cache_path, "wb") as f:
-                    f.write(data)
-
-            img = Image.open(BytesIO(data)).convert("RGB")
-            return img.resize(size, Image.LANCZOS)
-        except Exception:
-            return self._placeholder(size)
+    def _set_cover(self, label, key, img):
+        """Swap a card's placeholder for its downloaded cover (Tk thread)."""
+        if not label.winfo_exists():
+            return
+        tk_img = ImageTk.PhotoImage(img)
+        self._thumb_refs[key] = tk_img
+        label.configure(image=tk_img)
+        label.image = tk_img
 
 
     def _on_card_click(self, rec: dict):
@@ -390,13 +244,12 @@ class Top10_Books:
                 return
 
         
-            try:
-                rows = self._insert_loan_mysql(user_id, rec)
-                self.parent.after(0, messagebox.showinfo, "Success",
-                                f"Lending recorded. Rows affected: {rows}")
-            except Exception as e:
-                # This ensures the exception text is preserved when the lambda runs later
-                self.parent.after(0, messagebox.showerror, "Error", f"Failed to save:\n{e}")
+            self.runner.submit(
+                self._insert_loan_mysql, user_id, rec,
+                on_success=lambda rows: messagebox.showinfo(
+                    "Success", f"Lending recorded. Rows affected: {rows}"),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to save:\n{e}"),
+            )
 
 
     def _insert_loan_mysql(self, member_id: str, rec: dict) -> int:
@@ -409,62 +262,66 @@ class Top10_Books:
             if not title:
                 raise ValueError("book record is empty or missing title")
 
-            conn = self.db.connect()
-            try:
-                conn.ping(reconnect=True)
-                with conn.cursor(dictionary=True) as cur:
+            with self.db.connection() as conn:
+                try:
+                    with conn.cursor(dictionary=True) as cur:
                 
-                    cur.execute(
-                        """
-                        SELECT book_id
-                        FROM library_db.books
-                        WHERE book_name = %s AND author = %s
-                        """,
-                        (title, author)
-                    )
-                    rows = cur.fetchall()
-
-                    if not rows:
                         cur.execute(
                             """
                             SELECT book_id
                             FROM library_db.books
-                            WHERE LOWER(book_name) = LOWER(%s) AND LOWER(author) = LOWER(%s)
+                            WHERE book_name = %s AND author = %s
                             """,
                             (title, author)
                         )
                         rows = cur.fetchall()
 
-                    if not rows:
+                        if not rows:
+                            cur.execute(
+                                """
+                                SELECT book_id
+                                FROM library_db.books
+                                WHERE LOWER(book_name) = LOWER(%s) AND LOWER(author) = LOWER(%s)
+                                """,
+                                (title, author)
+                            )
+                            rows = cur.fetchall()
+
+                        if not rows:
                         
-                        raise ValueError(f"Book not found in 'books' table for title='{title}', author='{author}'")
+                            raise ValueError(f"Book not found in 'books' table for title='{title}', author='{author}'")
 
-                    if len(rows) > 1:
+                        if len(rows) > 1:
                         
-                        pass
+                            pass
 
-                    book_id = rows[0]["book_id"]
+                        book_id = rows[0]["book_id"]
 
                 
-                    cur.execute(
-                        """
-                        INSERT INTO library_db.user_notifications
-                            (user_id, book_id, book_title, book_author, image_url, created_at)
-                        VALUES (%s, %s, %s, %s, %s, NOW())
-                        """,
-                        (str(member_id), book_id, title[:255], author[:255], image[:500])
-                    )
-                    affected = cur.rowcount
-
-                conn.commit()
-                return affected
-
-            except Exception as e:
-                print("[DB ERROR]", repr(e))
-                conn.rollback()
-                raise
-            finally:
-                conn.close()
+                        cur.execute(
+                            """
+                            INSERT INTO library_db.user_notifications
+                                (user_id, book_id, book_title, book_author, image_url, created_at)
+                            VALUES (%s, %s, %s, %s, %s, NOW())
+                            """,
+                            (str(member_id), book_id, title[:255], author[:255], image[:500])
+                        )
+                        affected = cur.rowcount
+                        notification_id = cur.lastrowid
+
+                    conn.commit()
+                    # Wake admin sidebars now instead of at their next poll
+                    notification_bus.publish(notification_bus.LOAN_REQUEST, {
+                        "notification_id": notification_id,
+                        "user_id": str(member_id),
+                        "book_id": book_id,
+                    })
+                    return affected
+
+                except Exception as e:
+                    print("[DB ERROR]", repr(e))
+                    conn.rollback()
+                    raise
 
         
 
@@ -5,6 +5,10 @@ from tkinter import messagebox
 from PIL import Image, ImageTk
 from io import BytesIO
 
+from userRole.member_profile import get_profile
+from utils.member_photos import ensure_thumbnail, load_full_photo
+from utils.task_runner import TaskRunner
+
 class UserProfile:
     def __init__(self, parent, content_frame, title_font, label_font, button_font, go_back_callback):
         self.parent = parent
@@ -28,24 +32,65 @@ class UserProfile:
 
         tk.Label(profile_frame, text="📘 Library Membership Profile", font=self.title_font, bg="#e6f2ff", fg="#033974").pack(pady=(20, 10))
 
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT name, age, email, contact, created_at, photo 
-                FROM members WHERE member_id = %s
-            """, (member_id,))
-            row = cursor.fetchone()
-            if not row:
-                messagebox.showerror("Not Found", "Member not found!")
+        loading = tk.Label(profile_frame, text="Loading…", font=self.label_font, bg="#e6f2ff", fg="#555")
+        loading.pack(pady=20)
+
+        self._member_id = member_id
+        self.runner = TaskRunner(profile_frame)
+        self.runner.submit(
+            self._load_profile, member_id,
+            on_success=lambda data: (loading.destroy(), self._render_profile(profile_frame, data)),
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load member data: {e}"),
+        )
+
+    def _load_profile(self, member_id):
+        """Worker thread: cached profile plus its decoded photo."""
+        profile = get_profile(member_id, self.db)
+        if not profile:
+            return None
+
+        # Decode here; only the PhotoImage has to be made on the Tk thread.
+        # The thumbnail is already avatar-sized, so there's nothing to resize.
+        img = None
+        if profile["has_photo"]:
+            try:
+                thumb = profile["thumb"]
+                if not thumb:
+                    # Saved before thumbnails: build it once and keep it in the
+                    # cached profile so reopening doesn't fetch the full photo again
+                    thumb = profile["thumb"] = ensure_thumbnail(member_id, self.db)
+                img = Image.open(BytesIO(thumb))
+                img.load()
+            except Exception:
+                img = False
+        return profile, img
+
+    def _show_full_photo(self, member_id):
+        def show(data):
+            if not data:
                 return
-            full_name, age, email, contact, joined_date, photo_data = row
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to load member data: {e}")
+            img = Image.open(BytesIO(data))
+            img.thumbnail((800, 800), Image.LANCZOS)   # fit on screen, keep aspect
+            win = tk.Toplevel(self.parent)
+            win.title("Member Photo")
+            photo = ImageTk.PhotoImage(img)
+            label = tk.Label(win, image=photo)
+            label.image = photo
+            label.pack()
+
+        self.runner.submit(
+            load_full_photo, member_id, self.db,
+            on_success=show,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load photo: {e}"),
+        )
+
+    def _render_profile(self, profile_frame, data):
+        if not data:
+            messagebox.showerror("Not Found", "Member not found!")
             return
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        library_data, img = data
+        full_name, age, email, contact = (library_data[k] for k in ("name", "age", "email", "contact"))
+        joined_date, photo_data = library_data["joined"], library_data["has_photo"]
 
         content = tk.Frame(profile_frame, bg="#e6f2ff")
         content.pack(padx=10, pady=10, fill="both", expand=True)
@@ -59,11 +104,14 @@ class UserProfile:
 
         if photo_data:
             try:
-                img = Image.open(BytesIO(photo_data)).resize((180, 220), Image.LANCZOS)
+                if img is False:
+                    raise ValueError("unreadable photo")
                 photo = ImageTk.PhotoImage(img)
-                img_label = tk.Label(photo_section, image=photo, bg="#e6f2ff", bd=2, relief="solid")
+                img_label = tk.Label(photo_section, image=photo, bg="#e6f2ff", bd=2, relief="solid", cursor="hand2")
                 img_label.image = photo
                 img_label.pack()
+                # Full-resolution photo only when asked for
+                img_label.bind("<Button-1>", lambda _e: self._show_full_photo(self._member_id))
             except Exception as e:
                 tk.Label(photo_section, text="🖼️ Error loading photo", bg="#e6f2ff", fg="red").pack()
         else:
@@ -91,8 +139,6 @@ class UserProfile:
         tk.Label(lib_section, text="📚 Library Details", font=("Segoe UI", 16, "bold"),
                 bg="#e6f2ff", fg="#2c3e50").pack(anchor="w", pady=(10, 5))
 
-        library_data = self.get_library_data(member_id)
-
         tk.Label(lib_section, text=f"📘 Total Books Borrowed: {library_data['total_borrowed']}",
                 font=self.label_font, bg="#e6f2ff", fg="#2c3e50").pack(anchor="w", pady=2)
 
@@ -140,43 +186,3 @@ class UserProfile:
             activeforeground="white",
             cursor="hand2"
         ).pack(side="right")
-        
-    def get_library_data(self, member_id):
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT COUNT(*) FROM lending_records WHERE user_id = %s", (member_id,))
-            total = cursor.fetchone()[0]
-
-            cursor.execute(""" SELECT b.book_id,b.book_name, l.borrow_date,l.return_date, l.predict_date FROM lending_records l
-                JOIN books b ON l.book_id = b.book_id
-                WHERE l.user_id = %s
-            """, (member_id,))
-            books = cursor.fetchall()
-            cursor.execute("SELECT SUM(fine), COUNT(user_id) FROM return_records WHERE user_id = %s", (member_id,))
-
-            #cursor.execute("SELECT SUM(fine) ,count (user_id) FROM return_records WHERE user_id = %s", (member_id,))
-            fine, read_book = cursor.fetchone()
-            fine = fine or 0.0
-            read_book = read_book or 0
-
-            return {
-                "total_borrowed": total,
-                "borrowed_books": books,
-                "total_fine": fine,
-                "read_books": read_book
-            }
-        except Exception as e:
-            return {
-                "total_borrowed": 0,
-                "borrowed_books": [],
-                "total_fine": 0.0,
-                "read_books": 0
-            }
-        finally:
-            cursor.close()
-            conn.close()    
-
-
-
@@ -0,0 +1,309 @@
+# artifact_store.py
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from userRole.book_metadata import BookMeta, build_title_index, top_records
+from userRole.title_search import TitleSearchIndex
+from userRole.similarity_matrix import (
+    TOPK_NAME, NeighbourIndex, SimilarityMatrix, resolve_path as resolve_sims_path,
+)
+
+
+def _first_dir(candidates):
+    return next((p for p in candidates if os.path.isdir(p)), None)
+
+
+def _nbytes(obj):
+    """Approximate resident size of a loaded artifact."""
+    if obj is None:
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (np.memmap, SimilarityMatrix)):
+        return 0  # pages live in the OS file cache, not in our heap
+    if isinstance(obj, NeighbourIndex):
+        return int(obj.indices.nbytes + obj.scores.nbytes)
+    if isinstance(obj, TitleSearchIndex):
+        return sum(sys.getsizeof(v) for v in obj._postings.values()) + _nbytes(obj.lower)
+    if isinstance(obj, BookMeta):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(getattr(obj, s)) for s in BookMeta.__slots__)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, SimpleNamespace):
+        return sum(_nbytes(v) for v in vars(obj).values())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_nbytes(v) for v in obj)
+    if isinstance(obj, str):
+        return sys.getsizeof(obj)
+    return 0
+
+
+class ArtifactStore:
+    """Process-wide, lazily loaded recommendation data.
+
+    Each bundle is built on first use and kept until one of the files it was
+    built from changes on disk (mtime or size), so opening the recommendation
+    or Top 10 screen again costs only a few stat() calls.
+    """
+
+    def __init__(self):
+        base_dir   = os.path.dirname(os.path.abspath(__file__))   # ...\LibrarySystem\userRole
+        parent_dir = os.path.dirname(base_dir)                     # ...\LibrarySystem
+        cwd_dir    = os.getcwd()
+
+        self.model_dir = _first_dir([
+            os.path.join(base_dir, "model"),
+            os.path.join(parent_dir, "model"),
+            os.path.join(cwd_dir, "model"),
+        ]) or os.path.join(parent_dir, "model")  # best guess
+
+        self.database_dir = _first_dir([
+            os.path.join(parent_dir, "database"),
+            os.path.join(base_dir, "database"),
+            os.path.join(cwd_dir, "database"),
+        ])
+
+        self.files = {
+            "popular": os.path.join(self.model_dir, "popular.parquet"),
+            "pt":      os.path.join(self.model_dir, "pt.parquet"),
+            "books":   os.path.join(self.model_dir, "books.parquet"),
+            "sims":    resolve_sims_path(self.model_dir),
+            "topk":    os.path.join(self.model_dir, TOPK_NAME),
+            "books_csv": os.path.join(self.database_dir, "Books.csv") if self.database_dir else None,
+        }
+
+        self._lock = threading.RLock()
+        self._cache = {}   # bundle name -> (signature, value)
+        self.stats = {}    # bundle name -> {"loads", "seconds", "bytes"}
+
+    # ---------- Cache plumbing ----------
+    def _signature(self, keys):
+        sig = []
+        for k in keys:
+            path = self.files.get(k)
+            try:
+                st = os.stat(path) if path else None
+            except OSError:
+                st = None
+            sig.append((k, st.st_mtime_ns, st.st_size) if st else (k, None, None))
+        return tuple(sig)
+
+    def _get(self, name, keys, builder):
+        with self._lock:
+            sig = self._signature(keys)
+            hit = self._cache.get(name)
+            if hit and hit[0] == sig:
+                return hit[1]
+
+            start = time.perf_counter()
+            value = builder()
+            elapsed = time.perf_counter() - start
+            size = _nbytes(value)
+
+            self._cache[name] = (sig, value)
+            entry = self.stats.setdefault(name, {"loads": 0, "seconds": 0.0, "bytes": 0})
+            entry["loads"] += 1
+            entry["seconds"] = elapsed
+            entry["bytes"] = size
+            print(f"[INFO] Loaded '{name}' artifacts in {elapsed:.2f}s ({size / 1e6:.1f} MB)")
+            return value
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    def report(self):
+        """Return {bundle: {"loads", "seconds", "bytes"}} for loaded bundles."""
+        with self._lock:
+            return {k: dict(v) for k, v in self.stats.items()}
+
+    def _require(self, keys):
+        missing = [k for k in keys if not self.files.get(k) or not os.path.exists(self.files[k])]
+        if missing:
+            lines = [f"- {k}: {self.files[k]}" for k in missing]
+            raise FileNotFoundError("Missing data file(s):\n" + "\n".join(lines))
+
+    def _read_parquet(self, key):
+        try:
+            return pd.read_parquet(self.files[key])
+        except ImportError as e:
+            raise ImportError("Parquet engine missing. Install with:  pip install pyarrow") from e
+
+    def _read_books_csv(self):
+        path = self.files.get("books_csv")
+        if not path or not os.path.exists(path):
+            return None
+        return pd.read_csv(path)
+
+    # ---------- Bundles ----------
+    def recommendation(self):
+        """POPULAR, PT, BOOKS, SIMS, NEIGHBOURS, META, TITLES and SEARCH for BookRecommendation.
+
+        SIMS is a SimilarityMatrix; use SIMS.row(i) rather than indexing a
+        full in-memory array. NEIGHBOURS is the precomputed top-K index, or
+        None when it has not been built (or no longer matches SIMS).
+        """
+        # Pick up a compact similarity file written since the store was created
+        self.files["sims"] = resolve_sims_path(self.model_dir)
+        return self._get("recommendation", ("popular", "pt", "books", "sims", "topk", "books_csv"),
+                         self._build_recommendation)
+
+    def top10(self):
+        """POPULAR, BOOKS, the 10-row TOP10 frame and its card RECORDS for Top10_Books."""
+        return self._get("top10", ("popular", "books", "books_csv"), self._build_top10)
+
+    def _build_recommendation(self):
+        self._require(("popular", "pt", "books", "sims"))
+        try:
+            popular = self._read_parquet("popular")
+            pt      = self._read_parquet("pt")
+            books   = self._read_parquet("books")
+            sims    = SimilarityMatrix(self.files["sims"])   # memory-mapped, rows read on demand
+        except ImportError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error reading artifacts: {e}") from e
+
+        # Optional: override/fill cover images from Books.csv
+        try:
+            df_csv = self._read_books_csv()
+            if df_csv is not None:
+                books = _merge_csv_covers(books, df_csv)
+        except Exception as e:
+            print(f"⚠️ CSV image merge skipped: {e}")
+
+        # Optional: precomputed neighbour lists (python -m userRole.similarity_matrix topk)
+        neighbours = None
+        if os.path.exists(self.files["topk"]):
+            try:
+                neighbours = NeighbourIndex(self.files["topk"])
+                if neighbours.n != sims.n:
+                    print(f"[WARNING] {TOPK_NAME} covers {neighbours.n} items, matrix has {sims.n}; ignoring it")
+                    neighbours = None
+            except Exception as e:
+                print(f"[WARNING] Failed to load {TOPK_NAME}: {e}")
+                neighbours = None
+
+        titles = pd.Index(pt.index)
+        return SimpleNamespace(
+            POPULAR=popular,
+            PT=pt,
+            BOOKS=books,
+            SIMS=sims,
+            NEIGHBOURS=neighbours,
+            META=build_title_index(books),   # title -> BookMeta, no per-card DataFrame scans
+            TITLES=titles,
+            SEARCH=TitleSearchIndex(titles),   # exact / prefix / substring / fuzzy lookups
+        )
+
+    def _build_top10(self):
+        self._require(("popular",))
+        try:
+            popular = self._read_parquet("popular")
+        except ImportError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error reading popular.parquet: {e}") from e
+
+        # If available, load books.parquet for image backfill
+        books = None
+        if os.path.exists(self.files["books"]):
+            try:
+                books = self._read_parquet("books")
+            except Exception:
+                books = None
+
+        # Try Books.csv to backfill covers (optional)
+        if books is None:
+            try:
+                df_csv = self._read_books_csv()
+                if df_csv is not None:
+                    keep = [c for c in ["Book-Title", "Book-Author", "Image-URL-M", "ISBN"] if c in df_csv.columns]
+                    if keep:
+                        books = df_csv[keep].drop_duplicates("Book-Title")
+            except Exception:
+                books = None
+
+        needed_cols = ["Book-Title", "Book-Author", "num_ratings", "avg_rating"]
+        for c in needed_cols:
+            if c not in popular.columns:
+                raise ValueError(f"'popular.parquet' must include column: {c}")
+
+        top = popular.head(10).copy()
+
+        # Make sure there's an Image-URL-M
+        if "Image-URL-M" not in top.columns or top["Image-URL-M"].isna().all():
+            if books is not None and "Image-URL-M" in books.columns:
+                top = top.merge(
+                    books[["Book-Title", "Image-URL-M"]],
+                    on="Book-Title",
+                    how="left",
+                    suffixes=("", "_src")
+                )
+                if "Image-URL-M_src" in top.columns:
+                    if "Image-URL-M" in top.columns:
+                        top["Image-URL-M"] = top["Image-URL-M_src"].fillna(top["Image-URL-M"])
+                    else:
+                        top["Image-URL-M"] = top["Image-URL-M_src"]
+                    top.drop(columns=[c for c in top.columns if c.endswith("_src")], inplace=True)
+            else:
+                # Create a blank image column so UI doesn't break
+                top["Image-URL-M"] = np.nan
+
+        return SimpleNamespace(POPULAR=popular, BOOKS=books, TOP10=top, RECORDS=top_records(top))
+
+
+def _merge_csv_covers(books, df_csv):
+    """Merge Books.csv cover URLs into BOOKS and pick the best one per title."""
+    for col in ["Image-URL-M", "Image-URL-L", "Image-URL-S"]:
+        if col not in df_csv.columns:
+            df_csv[col] = ""
+    df_csv = df_csv[["Book-Title", "Image-URL-M", "Image-URL-L", "Image-URL-S"]].drop_duplicates("Book-Title")
+    books = (
+        books.drop_duplicates("Book-Title")
+        .merge(df_csv, on="Book-Title", how="left", suffixes=("", "_csv"))
+    )
+
+    # Prefer medium, else large, else small; CSV wins over parquet at each size.
+    # Column-wise instead of a row-wise apply: lowest priority first, each
+    # higher-priority column overwrites wherever it has a value.
+    priority = ["Image-URL-M_csv", "Image-URL-M", "Image-URL-L_csv", "Image-URL-L", "Image-URL-S_csv", "Image-URL-S"]
+    best = pd.Series("", index=books.index, dtype=object)
+    for col in reversed(priority):
+        if col not in books.columns:
+            continue
+        v = books[col].fillna("").astype(str).str.strip()
+        best = v.where(v != "", best)
+    books["Image-URL-M"] = best
+
+    dropcols = [c for c in books.columns if c.endswith("_csv")]
+    if dropcols:
+        books.drop(columns=dropcols, inplace=True)
+    return books
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the shared ArtifactStore, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
@@ -0,0 +1,65 @@
+# book_metadata.py
+IMAGE_COLUMNS = ["Image-URL-M", "Image-URL-L", "Image-URL-S"]   # preferred first
+
+
+def _text(v):
+    # None and NaN (the only value not equal to itself) become ""
+    if v is None or v != v:
+        return ""
+    return str(v)
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name].tolist()
+    return [None] * len(df)
+
+
+class BookMeta:
+    """Card data for one title, precomputed so the UI never touches pandas."""
+
+    __slots__ = ("title", "author", "image", "isbn")
+
+    def __init__(self, title, author, image, isbn):
+        self.title = title
+        self.author = author
+        self.image = image
+        self.isbn = isbn
+
+    def as_card(self):
+        return {"title": self.title, "author": self.author, "image": self.image}
+
+
+def build_title_index(books):
+    """Map Book-Title -> BookMeta, keeping the first row per title.
+
+    The image is the first non-blank of the M, L and S cover URLs. Columns are
+    read once as Python lists and zipped, so building is one linear pass.
+    """
+    index = {}
+    if books is None or "Book-Title" not in books.columns:
+        return index
+
+    columns = [_column(books, c) for c in ["Book-Title", "Book-Author", "ISBN"] + IMAGE_COLUMNS]
+    for title, author, isbn, *images in zip(*columns):
+        title = _text(title)
+        if title in index:
+            continue
+        image = next((u for u in (_text(v).strip() for v in images) if u), "")
+        index[title] = BookMeta(title, _text(author), image, _text(isbn))
+    return index
+
+
+def top_records(top):
+    """Card dicts for the Top 10 frame (title, author, image, votes, rating)."""
+    columns = [_column(top, c) for c in ["Book-Title", "Book-Author", "Image-URL-M", "num_ratings", "avg_rating"]]
+    return [
+        {
+            "title":  _text(title),
+            "author": _text(author),
+            "image":  _text(image),
+            "votes":  _text(votes),
+            "rating": _text(rating),
+        }
+        for title, author, image, votes, rating in zip(*columns)
+    ]
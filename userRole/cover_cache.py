@@ -0,0 +1,173 @@
+# cover_cache.py
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "book_cover_thumbs_tk")
+MEMORY_LIMIT = 32 * 1024 * 1024     # decoded thumbnails kept in RAM
+DISK_LIMIT = 200 * 1024 * 1024      # resized JPEGs kept on disk
+
+
+class CoverCache:
+    """Two-tier cache of cover thumbnails shared by every screen.
+
+    Tier 1 is an LRU of decoded PIL images capped by their pixel bytes.
+    Tier 2 is a directory of already-resized JPEGs named by the SHA-1 of the
+    URL and the thumbnail size, capped by total file size; the oldest files
+    are evicted first. A disk hit costs one small JPEG decode and no resize.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._mem = OrderedDict()     # key -> PIL image, oldest first
+        self._mem_bytes = 0
+        self._disk_bytes = None       # computed lazily on first store
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def key(url, size):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return f"{digest}_{size[0]}x{size[1]}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".jpg")
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    # ---------- Lookup ----------
+    def get(self, url, size):
+        """Cached thumbnail for (url, size), or None."""
+        key = self.key(url, size)
+        with self._lock:
+            img = self._mem.get(key)
+            if img is not None:
+                self._mem.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return img
+
+        path = self._path(key)
+        try:
+            with Image.open(path) as f:
+                img = f.convert("RGB")
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        try:
+            os.utime(path)      # keep recently used files away from eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, img)
+        return img
+
+    # ---------- Store ----------
+    def put(self, url, size, img):
+        """Store an already-resized thumbnail in both tiers."""
+        key = self.key(url, size)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp, format="JPEG", quality=85)
+            os.replace(tmp, path)
+            written = os.path.getsize(path)
+        except OSError:
+            written = 0
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+        with self._lock:
+            self._remember(key, img)
+            if written:
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk()
+                else:
+                    self._disk_bytes += written
+                if self._disk_bytes > self.disk_limit:
+                    self._evict_disk()
+
+    def _remember(self, key, img):
+        # caller holds the lock
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= self._image_bytes(old)
+        self._mem[key] = img
+        self._mem_bytes += self._image_bytes(img)
+        while self._mem_bytes > self.memory_limit and len(self._mem) > 1:
+            _k, dropped = self._mem.popitem(last=False)
+            self._mem_bytes -= self._image_bytes(dropped)
+            self.stats["memory_evictions"] += 1
+
+    def _scan_disk(self):
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                total += entry.stat().st_size
+        return total
+
+    def _evict_disk(self):
+        # caller holds the lock; trim to 90% so we don't evict on every store
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        files.sort()
+        total = sum(size for _m, size, _p in files)
+        target = int(self.disk_limit * 0.9)
+        for _mtime, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["disk_evictions"] += 1
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def snapshot(self):
+        """Hit/miss counters plus current tier sizes."""
+        with self._lock:
+            data = dict(self.stats)
+            data["memory_items"] = len(self._mem)
+            data["memory_bytes"] = self._mem_bytes
+            data["disk_bytes"] = self._disk_bytes
+        lookups = data["memory_hits"] + data["disk_hits"] + data["misses"]
+        data["hit_rate"] = (data["memory_hits"] + data["disk_hits"]) / lookups if lookups else 0.0
+        return data
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cover_cache():
+    """Return the shared CoverCache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CoverCache()
+    return _cache
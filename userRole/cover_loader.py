@@ -0,0 +1,181 @@
+# cover_loader.py
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+from userRole.cover_cache import get_cover_cache
+
+MAX_WORKERS = 6      # concurrent downloads shared by every screen
+TIMEOUT = 8          # seconds per request
+POLL_MS = 50         # how often finished covers are handed to Tk
+
+HEADERS = {
+    # Browser-like UA; Amazon often 403s the default Python UA
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="cover")
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Shared requests.Session so covers reuse keep-alive connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update(HEADERS)
+                _session = s
+    return _session
+
+
+def _download(url):
+    headers = {"Referer": "https://www.amazon.com/"} if "amazon" in url.lower() else None
+    r = get_session().get(url, timeout=TIMEOUT, headers=headers, allow_redirects=True)
+    r.raise_for_status()
+    return r.content
+
+
+def _load_local(path, size, cache):
+    # mtime in the key so an edited file isn't served stale
+    try:
+        key = f"{os.path.abspath(path)}@{os.path.getmtime(path)}"
+    except OSError:
+        return None
+    img = cache.get(key, size)
+    if img is not None:
+        return img
+    img = Image.open(path).convert("RGB").resize(size, Image.LANCZOS)
+    cache.put(key, size, img)
+    return img
+
+
+def fetch_cover(url, size, search_dirs=()):
+    """Return a resized RGB cover for url, or None if it can't be loaded.
+
+    url may be an http(s) link or a local path, absolute or relative to one
+    of search_dirs. Thumbnails come from, and go to, the shared CoverCache,
+    so each cover is downloaded and resized once.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not url or url.lower() in {"nan", "none", "null"}:
+        return None
+
+    cache = get_cover_cache()
+
+    # Local files (absolute, or relative to a few roots)
+    local = [url] if os.path.isabs(url) else [os.path.join(d, url) for d in search_dirs]
+    for p in local:
+        if os.path.exists(p):
+            try:
+                return _load_local(p, size, cache)
+            except Exception:
+                break  # fall through to HTTP attempt
+
+    # Some old datasets have http://…; switch to https where possible
+    if url.startswith("http://"):
+        url = "https://" + url[len("http://"):]
+
+    img = cache.get(url, size)
+    if img is not None:
+        return img
+    try:
+        data = _download(url)
+        img = Image.open(BytesIO(data)).convert("RGB").resize(size, Image.LANCZOS)
+    except Exception:
+        return None
+    cache.put(url, size, img)
+    return img
+
+
+class CoverLoader:
+    """Loads card covers on a bounded thread pool for one screen.
+
+    load() returns immediately; downloads put their image on a queue that
+    is drained with widget.after() on the Tk thread, where on_ready(image)
+    runs, so workers never touch Tk. cancel_all() drops queued downloads and
+    makes any download already running discard its result, so covers never
+    land on cards that have been torn down.
+    """
+
+    def __init__(self, widget, size=(140, 180), search_dirs=()):
+        self.widget = widget
+        self.size = size
+        self.search_dirs = tuple(search_dirs)
+        self._futures = []
+        self._generation = 0
+        self._ready = queue.Queue()    # (generation, on_ready, image) from workers
+        self._poll_job = None
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def load(self, url, on_ready):
+        gen = self._generation
+        ready = self._ready
+
+        def job():
+            img = fetch_cover(url, self.size, self.search_dirs)
+            if img is not None and gen == self._generation:
+                ready.put((gen, on_ready, img))
+
+        fut = _pool.submit(job)
+        self._futures.append(fut)
+        self._schedule_poll()
+        return fut
+
+    def cancel_all(self):
+        self._generation += 1
+        for fut in self._futures:
+            fut.cancel()
+        self._futures = []
+
+    # ---------- Internals ----------
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.cancel_all()
+            if self._poll_job is not None:
+                try:
+                    self.widget.after_cancel(self._poll_job)
+                except Exception:
+                    pass
+                self._poll_job = None
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.widget.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        # Checked before draining: a job queues its cover before it is done
+        self._futures = [f for f in self._futures if not f.done()]
+        while True:
+            try:
+                gen, on_ready, img = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self._generation:
+                continue
+            try:
+                on_ready(img)
+            except Exception as e:
+                print(f"[ERROR] Cover callback failed: {e!r}")
+        if self._futures:
+            self._schedule_poll()
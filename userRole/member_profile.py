@@ -0,0 +1,89 @@
+# member_profile.py
+import threading
+import time
+
+from database import Database
+
+TTL = 30.0      # seconds a cached profile is served without asking the DB
+
+# Member, return totals and borrowed books in one round trip. The lending
+# rows come from the LEFT JOIN (member columns repeat on each of them, which
+# is why only the small thumbnail is selected, never the full photo); the
+# return totals are scalar subqueries on the indexed user_id.
+_PROFILE_SQL = """
+    SELECT m.name, m.age, m.email, m.contact, m.created_at, m.photo_thumb, m.photo IS NOT NULL,
+           (SELECT COALESCE(SUM(r.fine), 0) FROM return_records r WHERE r.user_id = m.member_id),
+           (SELECT COUNT(*) FROM return_records r WHERE r.user_id = m.member_id),
+           l.user_id, b.book_id, b.book_name, l.borrow_date, l.return_date, l.predict_date
+    FROM members m
+    LEFT JOIN lending_records l ON l.user_id = m.member_id
+    LEFT JOIN books b ON b.book_id = l.book_id
+    WHERE m.member_id = %s
+"""
+
+_cache = {}         # member key -> (expires_at, profile)
+_lock = threading.Lock()
+
+
+def _key(member_id):
+    text = str(member_id).strip()
+    return text.zfill(3) if text.isdigit() else text
+
+
+def _fetch(member_id, db):
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_PROFILE_SQL, (member_id,))
+        rows = cursor.fetchall()
+        cursor.close()
+    if not rows:
+        return None
+
+    name, age, email, contact, joined, thumb, has_photo, fine, read_books = rows[0][:9]
+    borrowed = []
+    total = 0
+    for *_member, lent_to, book_id, book_name, borrow_date, return_date, predict_date in rows:
+        if lent_to is None:
+            continue                # member has no lendings: one all-NULL row
+        total += 1
+        if book_id is not None:     # same as the old inner join on books
+            borrowed.append((book_id, book_name, borrow_date, return_date, predict_date))
+
+    return {
+        "name": name,
+        "age": age,
+        "email": email,
+        "contact": contact,
+        "joined": joined,
+        "thumb": thumb,                  # JPEG at member_photos.THUMB_SIZE
+        "has_photo": bool(has_photo),    # full image: member_photos.load_full_photo()
+        "total_borrowed": total,
+        "borrowed_books": borrowed,
+        "total_fine": fine or 0.0,
+        "read_books": read_books or 0,
+    }
+
+
+def get_profile(member_id, db=None):
+    """Profile dict for member_id (None if there is no such member), cached for TTL seconds."""
+    key = _key(member_id)
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+    profile = _fetch(key, db or Database())
+    if profile is not None:
+        with _lock:
+            _cache[key] = (time.monotonic() + TTL, profile)
+    return profile
+
+
+def invalidate(member_id=None):
+    """Drop one member's cached profile (or all of them) after a write."""
+    with _lock:
+        if member_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(_key(member_id), None)
@@ -0,0 +1,211 @@
+# similarity_matrix.py
+import argparse
+import os
+
+import numpy as np
+
+# Compact files written by convert(), most compact first. The store picks the
+# first one that exists and falls back to the original float64 matrix.
+COMPACT_NAMES = [
+    "similarity_scores.float16.tri.npy",
+    "similarity_scores.float16.npy",
+    "similarity_scores.float32.tri.npy",
+    "similarity_scores.float32.npy",
+]
+ORIGINAL_NAME = "similarity_scores.npy"
+TOPK_NAME = "similarity_topk.npz"
+
+
+def resolve_path(model_dir):
+    """Best similarity file available in model_dir."""
+    for name in COMPACT_NAMES + [ORIGINAL_NAME]:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(model_dir, ORIGINAL_NAME)
+
+
+def _tri_offsets(rows, n):
+    """Start of each row in a packed upper triangle (diagonal included)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    return rows * n - rows * (rows - 1) // 2
+
+
+class SimilarityMatrix:
+    """Read-only, memory-mapped view of the item-item similarity matrix.
+
+    Supports the original square .npy as well as the compact float16/float32
+    files, either square or as a packed upper triangle (the matrix is
+    symmetric). Only the pages backing the requested row are touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.triangular = path.endswith(".tri.npy")
+        self._data = np.load(path, mmap_mode="r")
+
+        if self.triangular:
+            if self._data.ndim != 1:
+                raise ValueError(f"{path}: packed triangle must be 1-D, got shape {self._data.shape}")
+            # len = n(n+1)/2  ->  n = (sqrt(8*len+1) - 1) / 2
+            length = self._data.shape[0]
+            n = int((np.sqrt(8 * length + 1) - 1) // 2)
+            if n * (n + 1) // 2 != length:
+                raise ValueError(f"{path}: length {length} is not a triangular number")
+            self.n = n
+        else:
+            if self._data.ndim != 2 or self._data.shape[0] != self._data.shape[1]:
+                raise ValueError(f"{path}: expected a square matrix, got shape {self._data.shape}")
+            self.n = self._data.shape[0]
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    def __len__(self):
+        return self.n
+
+    def row(self, i):
+        """Similarity of item i to every item, as a float32 array of length n."""
+        if not 0 <= i < self.n:
+            raise IndexError(f"row {i} out of range for {self.n} items")
+        if not self.triangular:
+            return np.asarray(self._data[i], dtype=np.float32)
+
+        n = self.n
+        out = np.empty(n, dtype=np.float32)
+        # j >= i: contiguous run in row i of the packed triangle
+        start = int(_tri_offsets(i, n))
+        out[i:] = self._data[start:start + (n - i)]
+        # j < i: read (j, i) from each earlier row
+        if i:
+            cols = np.arange(i, dtype=np.int64)
+            out[:i] = self._data[_tri_offsets(cols, n) + (i - cols)]
+        return out
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+
+def top_neighbours(row, idx, k):
+    """Indices and scores of the k items most similar to idx, best first.
+
+    Uses argpartition so only the k winners are sorted. The item itself is
+    excluded; ties keep ascending index order like a stable full sort would.
+    """
+    row = np.array(row, dtype=np.float32)   # private copy, memmap rows are read-only
+    row[idx] = -np.inf
+    k = min(k, len(row) - 1)
+    if k <= 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    part = np.argpartition(-row, k - 1)[:k]
+    part.sort()
+    order = part[np.argsort(-row[part], kind="stable")]
+    return order.astype(np.int32), row[order]
+
+
+class NeighbourIndex:
+    """Precomputed top-K neighbours per item, built offline by build_topk()."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.indices = np.ascontiguousarray(data["indices"], dtype=np.int32)
+            self.scores = np.ascontiguousarray(data["scores"], dtype=np.float32)
+        if self.indices.shape != self.scores.shape or self.indices.ndim != 2:
+            raise ValueError(f"{path}: indices/scores shape mismatch")
+        self.n, self.k = self.indices.shape
+
+    def lookup(self, idx, k):
+        """O(k) slice of the stored neighbour list for idx."""
+        return self.indices[idx, :k], self.scores[idx, :k]
+
+
+def build_topk(sims, k=50, dst=None):
+    """Store the top-k neighbours of every row of `sims` as int32/float32 arrays."""
+    if not isinstance(sims, SimilarityMatrix):
+        sims = SimilarityMatrix(sims)
+    n = sims.n
+    k = min(k, n - 1)
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    for i in range(n):
+        indices[i], scores[i] = top_neighbours(sims.row(i), i, k)
+
+    if dst is None:
+        dst = os.path.join(os.path.dirname(sims.path), TOPK_NAME)
+    tmp = dst + ".tmp.npz"
+    np.savez(tmp, indices=indices, scores=scores)
+    os.replace(tmp, dst)
+    return dst
+
+
+def convert(src, dst=None, dtype="float16", triangular=False):
+    """Write a compact copy of the square similarity matrix in src.
+
+    The source is memory-mapped and copied one row at a time, so converting
+    never needs the whole float64 matrix in RAM.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.dtype("float16"), np.dtype("float32")):
+        raise ValueError("dtype must be float16 or float32")
+
+    sims = np.load(src, mmap_mode="r")
+    if sims.ndim != 2 or sims.shape[0] != sims.shape[1]:
+        raise ValueError(f"{src}: expected a square matrix, got shape {sims.shape}")
+    n = sims.shape[0]
+
+    if dst is None:
+        suffix = f".{dtype.name}.tri.npy" if triangular else f".{dtype.name}.npy"
+        dst = os.path.join(os.path.dirname(src), "similarity_scores" + suffix)
+
+    tmp = dst + ".tmp"
+    if triangular:
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(n * (n + 1) // 2,))
+        pos = 0
+        for i in range(n):
+            out[pos:pos + (n - i)] = sims[i, i:]
+            pos += n - i
+    else:
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(n, n))
+        for i in range(n):
+            out[i] = sims[i]
+    out.flush()
+    del out
+    os.replace(tmp, dst)   # readers never see a half-written file
+    return dst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline build steps for the similarity matrix.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="write a compact memory-mappable copy")
+    conv.add_argument("src", nargs="?", default=os.path.join("model", ORIGINAL_NAME))
+    conv.add_argument("-o", "--output", default=None, help="output path (default: next to src)")
+    conv.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    conv.add_argument("--triangular", action="store_true", help="store only the upper triangle")
+
+    topk = sub.add_parser("topk", help="precompute the top-K neighbour index")
+    topk.add_argument("src", nargs="?", default=None, help="similarity file (default: best one in model/)")
+    topk.add_argument("-o", "--output", default=None, help=f"output path (default: {TOPK_NAME} next to src)")
+    topk.add_argument("-k", type=int, default=50)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        dst = convert(args.src, args.output, dtype=args.dtype, triangular=args.triangular)
+        before = os.path.getsize(args.src)
+        after = os.path.getsize(dst)
+        print(f"Wrote {dst}: {after / 1e6:.1f} MB (was {before / 1e6:.1f} MB)")
+    else:
+        src = args.src or resolve_path("model")
+        dst = build_topk(SimilarityMatrix(src), k=args.k, dst=args.output)
+        print(f"Wrote {dst}: top-{args.k} neighbours from {src}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# title_search.py
+import bisect
+import difflib
+import re
+from array import array
+from collections import Counter, namedtuple
+
+# kind is one of "exact", "prefix", "substring", "fuzzy"; score is in [0, 1]
+Match = namedtuple("Match", "idx title score kind")
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text):
+    return _SPACES.sub(" ", str(text).strip().lower())
+
+
+def _grams(text):
+    """Distinct trigrams of text (as stored in the index, i.e. unpadded)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded_grams(text):
+    # Padding lets short words and word boundaries contribute to fuzzy scores
+    return _grams(f"  {text} ")
+
+
+class TitleSearchIndex:
+    """Exact, prefix, substring and fuzzy lookup over a fixed list of titles.
+
+    Built once when the artifacts load:
+      * a dict for exact (case-insensitive) hits,
+      * a sorted list searched with bisect for prefixes,
+      * a trigram inverted index (padded grams, so it serves both substring
+        and fuzzy queries) whose rarest posting lists prune the candidates
+        before anything is compared character by character.
+    """
+
+    FUZZY_CUTOFF = 0.6        # same cutoff difflib.get_close_matches used
+    FUZZY_CANDIDATES = 50     # best trigram candidates re-ranked with difflib
+
+    def __init__(self, titles):
+        self.titles = [str(t) for t in titles]
+        self.lower = [normalize(t) for t in self.titles]
+
+        self._exact = {}
+        for i, t in enumerate(self.lower):
+            self._exact.setdefault(t, i)
+
+        self._sorted = sorted((t, i) for i, t in enumerate(self.lower))
+        self._sorted_keys = [t for t, _ in self._sorted]
+
+        postings = {}
+        self._gram_counts = array("I")
+        for i, t in enumerate(self.lower):
+            grams = _padded_grams(t)
+            self._gram_counts.append(len(grams))
+            for g in grams:
+                lst = postings.get(g)
+                if lst is None:
+                    lst = postings[g] = array("I")
+                lst.append(i)          # ids arrive in order, so lists stay sorted
+        self._postings = postings
+
+    def __len__(self):
+        return len(self.titles)
+
+    # ---------- Public API ----------
+    def search(self, query, limit=10):
+        """Ranked matches for query: exact, then prefix, substring, fuzzy."""
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+
+        def add(matches):
+            for m in matches:
+                if m.idx not in seen and len(results) < limit:
+                    seen.add(m.idx)
+                    results.append(m)
+
+        i = self._exact.get(q)
+        if i is not None:
+            add([Match(i, self.titles[i], 1.0, "exact")])
+        if len(results) < limit:
+            add(self._prefix(q, limit))
+        if len(results) < limit:
+            add(self._substring(q, limit + len(seen)))
+        if not results:
+            add(self._fuzzy(q, limit))
+        return results
+
+    def best(self, query):
+        """(idx, title) of the top match, or (None, None)."""
+        matches = self.search(query, limit=1)
+        if not matches:
+            return None, None
+        return matches[0].idx, matches[0].title
+
+    # ---------- Strategies ----------
+    def _prefix(self, q, limit):
+        out = []
+        pos = bisect.bisect_left(self._sorted_keys, q)
+        while pos < len(self._sorted):
+            t, i = self._sorted[pos]
+            if not t.startswith(q):
+                break
+            out.append(Match(i, self.titles[i], 0.8 + 0.2 * len(q) / len(t), "prefix"))
+            pos += 1
+        # Every hit is collected first: alphabetical order isn't score order
+        out.sort(key=lambda m: (-m.score, m.idx))
+        return out[:limit]
+
+    def _substring(self, q, limit):
+        grams = _grams(q)
+        if grams and all(g in self._postings for g in grams):
+            # Intersect posting lists, rarest first, then verify the candidates
+            lists = sorted((self._postings[g] for g in grams), key=len)
+            candidates = set(lists[0])
+            for lst in lists[1:]:
+                candidates.intersection_update(lst)
+                if not candidates:
+                    break
+            candidates = sorted(candidates)
+        elif grams:
+            return []        # some trigram of the query occurs in no title
+        else:
+            candidates = range(len(self.lower))   # 1-2 characters: plain scan
+
+        out = []
+        for i in candidates:
+            t = self.lower[i]
+            if q in t:
+                out.append(Match(i, self.titles[i], 0.6 + 0.2 * len(q) / len(t), "substring"))
+        out.sort(key=lambda m: (-m.score, m.idx))
+        return out[:limit]
+
+    def _fuzzy(self, q, limit):
+        qgrams = [g for g in _padded_grams(q) if g in self._postings]
+        if not qgrams:
+            return []
+        total = len(_padded_grams(q))
+
+        # A title needs `need` shared grams to be worth comparing. Any such
+        # title must appear in at least one of the (m - need + 1) rarest
+        # lists, so only those are scanned to collect candidates.
+        need = max(1, int(total * 0.3))
+        qgrams.sort(key=lambda g: len(self._postings[g]))
+        probe = qgrams[:max(1, len(qgrams) - need + 1)]
+        candidates = set()
+        for g in probe:
+            candidates.update(self._postings[g])
+
+        overlap = Counter()
+        qset = set(qgrams)
+        for i in candidates:
+            overlap[i] = len(qset & _padded_grams(self.lower[i]))
+
+        ranked = sorted(
+            (2.0 * n / (total + self._gram_counts[i]), i)
+            for i, n in overlap.items() if n >= need
+        )
+        ranked = ranked[::-1][:self.FUZZY_CANDIDATES]
+
+        out = []
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(q)
+        for _dice, i in ranked:
+            matcher.set_seq1(self.lower[i])
+            ratio = matcher.ratio()
+            if ratio >= self.FUZZY_CUTOFF:
+                out.append(Match(i, self.titles[i], 0.6 * ratio, "fuzzy"))
+        out.sort(key=lambda m: (-m.score, m.idx))
+        return out[:limit]
@@ -6,8 +6,11 @@ from tkinter.font import Font
 import time
 from database import Database  
 from userRole.UserProfile  import UserProfile
-from userRole.Book_Recommandation import BookRecommendation
-from userRole.Top10_Books  import Top10_Books
+from userRole.member_profile import get_profile
+from utils.task_runner import TaskRunner
+
+# BookRecommendation and Top10_Books (pandas, numpy, requests) are imported
+# when their card is first opened.
 class UserPanel:
     def __init__(self, parent, go_back_callback, member_id):
         self.parent = parent
@@ -15,22 +18,24 @@ class UserPanel:
         self.member_id = member_id
         self.db = Database()
 
-        self.member_name = self.get_member_name()  # ✅ Must be initialized BEFORE setup_ui
+        self.member_name = "Reader"  # ✅ Must be initialized BEFORE setup_ui; real name fills in when loaded
         self.setup_ui()
 
+        self.runner = TaskRunner(self.main_frame)
+        self.runner.submit(self.get_member_name, on_success=self._set_member_name)
+
     def get_member_name(self):
+        # Runs on a worker thread; also warms the profile cache for "My Profile"
         try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM members WHERE member_id = %s", (self.member_id,))
-            result = cursor.fetchone()
-            return result[0] if result else "Reader"
+            profile = get_profile(self.member_id, self.db)
+            return profile["name"] if profile else "Reader"
         except Exception as e:
             print(f"[ERROR] Failed to fetch member name: {e}")
             return "Reader"
-        finally:
-            if 'conn' in locals():
-                conn.close()
+
+    def _set_member_name(self, name):
+        self.member_name = name
+        self.user_name.config(text=f"Welcome, {name}")
     
     def setup_ui(self):
         # Configure main window
@@ -255,6 +260,7 @@ class UserPanel:
         profile_ui.show_profile(self.member_id)
         
     def view_book_recommandation(self):
+        from userRole.Book_Recommandation import BookRecommendation
         user_book_recommand = BookRecommendation(
         parent=self.parent,
         content_frame=self.content_frame,
@@ -274,6 +280,7 @@ class UserPanel:
         
  
     def view_top10_books(self):
+        from userRole.Top10_Books import Top10_Books
         top10_books_for_users = Top10_Books(
         parent=self.parent,
         content_frame=self.content_frame,
@@ -0,0 +1,105 @@
+# member_photos.py
+"""Member photo thumbnails.
+
+members.photo keeps the full-resolution image; members.photo_thumb (added
+by migration 3) keeps a small JPEG at the size the profile shows, so the
+profile never has to transfer or decode the original. Rows saved before
+the column existed are filled in by
+
+    python -m utils.member_photos backfill
+"""
+import argparse
+from io import BytesIO
+
+from PIL import Image
+
+from database import Database
+
+THUMB_SIZE = (180, 220)     # the profile avatar
+THUMB_QUALITY = 85
+BATCH = 50                  # rows per backfill round trip
+
+
+def make_thumbnail(data, size=THUMB_SIZE):
+    """JPEG bytes of the photo resized to size (the same crop-free resize the profile used)."""
+    img = Image.open(BytesIO(data)).convert("RGB").resize(size, Image.LANCZOS)
+    out = BytesIO()
+    img.save(out, format="JPEG", quality=THUMB_QUALITY)
+    return out.getvalue()
+
+
+def load_full_photo(member_id, db=None):
+    """Full-resolution photo bytes for one member, or None."""
+    db = db or Database()
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT photo FROM members WHERE member_id = %s", (member_id,))
+        row = cursor.fetchone()
+        cursor.close()
+    return row[0] if row else None
+
+
+def ensure_thumbnail(member_id, db=None):
+    """Build and store the thumbnail for a member saved before thumbnails existed."""
+    db = db or Database()
+    data = load_full_photo(member_id, db)
+    if not data:
+        return None
+    thumb = make_thumbnail(data)
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE members SET photo_thumb = %s WHERE member_id = %s", (thumb, member_id))
+        conn.commit()
+        cursor.close()
+    return thumb
+
+
+def backfill(db=None, batch=BATCH):
+    """Generate missing thumbnails, a batch at a time. Returns (made, failed)."""
+    db = db or Database()
+    made = failed = 0
+    last_id = ""
+    while True:
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT member_id, photo FROM members
+                WHERE photo IS NOT NULL AND photo_thumb IS NULL AND member_id > %s
+                ORDER BY member_id
+                LIMIT %s
+            """, (last_id, batch))
+            rows = cursor.fetchall()
+            if not rows:
+                cursor.close()
+                break
+
+            updates = []
+            for member_id, data in rows:
+                try:
+                    updates.append((make_thumbnail(data), member_id))
+                except Exception as e:
+                    failed += 1
+                    print(f"[WARNING] Member {member_id}: unreadable photo ({e})")
+            if updates:
+                cursor.executemany("UPDATE members SET photo_thumb = %s WHERE member_id = %s", updates)
+                conn.commit()
+            cursor.close()
+        made += len(updates)
+        last_id = rows[-1][0]
+    return made, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Member photo thumbnail maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bf = sub.add_parser("backfill", help="create thumbnails for members that lack one")
+    bf.add_argument("--batch", type=int, default=BATCH)
+    args = parser.parse_args(argv)
+
+    if args.command == "backfill":
+        made, failed = backfill(batch=args.batch)
+        print(f"Created {made} thumbnail(s), {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# notification_bus.py
+"""Local publish/subscribe channel for loan-request notifications.
+
+No external service: the first process that subscribes binds a
+multiprocessing Listener on localhost and acts as the broker for every
+other terminal on the machine. If that process exits, the remaining
+subscribers reconnect and one of them takes the port over.
+
+Everything here is best effort. publish() returns False when no broker
+is running, and screens keep polling the database in that case.
+
+The bus only runs when LIBRARY_BUS_KEY holds a per-install secret shared
+by the terminals (e.g. `python -c "import secrets; print(secrets.token_hex(16))"`).
+Frames are JSON, never pickles, so a peer can only ever send data.
+"""
+import json
+import os
+import queue
+import threading
+from multiprocessing.connection import Client, Listener
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("LIBRARY_BUS_PORT", "47321"))
+AUTHKEY = os.environ.get("LIBRARY_BUS_KEY", "").encode("utf-8")
+ENABLED = bool(AUTHKEY) and os.environ.get("LIBRARY_BUS", "1") != "0"
+
+LOAN_REQUEST = "loan_request"
+
+BACKLOG = 64         # pending connects; Listener's default of 1 strands bursts of publishers
+RETRY_S = 5          # wait between reconnect attempts
+DRAIN_MS = 250       # how often subscribers hand events to Tk
+MAX_FRAME = 64 * 1024  # events are a few ids; anything bigger is refused
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv(conn):
+    """One JSON object from conn; ValueError if the frame is anything else."""
+    try:
+        message = json.loads(conn.recv_bytes(MAX_FRAME).decode("utf-8"))
+    except UnicodeDecodeError as e:
+        raise ValueError(str(e)) from None
+    if not isinstance(message, dict) or not isinstance(message.get("topic"), str):
+        raise ValueError("malformed bus frame")
+    return message
+
+
+class _Broker:
+    """Fans published events out to the subscribers of their topic.
+
+    Publishers are handled on their own threads, but only the fan-out
+    thread ever writes to subscriber connections, so concurrent publishes
+    can't interleave frames on one connection.
+    """
+
+    def __init__(self, listener):
+        self.listener = listener
+        self._subs = []               # (topic, connection)
+        self._lock = threading.Lock()
+        self._outbox = queue.Queue()  # (topic, payload) waiting to be fanned out
+        self.thread = threading.Thread(target=self._accept_loop, name="bus-broker", daemon=True)
+        self.thread.start()
+        threading.Thread(target=self._fan_out_loop, name="bus-fan-out", daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return                # listener closed
+            except Exception as e:    # failed handshake from a stranger on the port
+                print(f"[WARNING] Notification bus rejected a connection: {e}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        try:
+            message = _recv(conn)     # OSError covers frames over MAX_FRAME
+        except (EOFError, OSError, ValueError):
+            conn.close()
+            return
+        kind, topic, payload = message.get("kind"), message["topic"], message.get("payload")
+        if kind == "sub":
+            with self._lock:
+                self._subs.append((topic, conn))
+        elif kind == "pub":
+            self._outbox.put((topic, payload))
+            conn.close()
+        else:
+            conn.close()
+
+    def _fan_out_loop(self):
+        while True:
+            self._fan_out(*self._outbox.get())
+
+    def _fan_out(self, topic, payload):
+        with self._lock:
+            subs = list(self._subs)
+        dead = []
+        for sub_topic, conn in subs:
+            if sub_topic != topic:
+                continue
+            try:
+                _send(conn, {"topic": topic, "payload": payload})
+            except (OSError, ValueError):
+                dead.append(conn)
+        if dead:
+            with self._lock:
+                self._subs = [(t, c) for t, c in self._subs if c not in dead]
+            for conn in dead:
+                conn.close()
+
+
+def ensure_broker():
+    """Become the broker if nobody on this machine is. True if this process is it."""
+    global _broker
+    if not ENABLED:
+        return False
+    with _broker_lock:
+        if _broker is None:
+            try:
+                listener = Listener((HOST, PORT), backlog=BACKLOG, authkey=AUTHKEY)
+            except OSError:
+                return False          # port taken: another process is the broker
+            _broker = _Broker(listener)
+            print(f"[INFO] Notification bus broker listening on {HOST}:{PORT}")
+        return True
+
+
+def publish(topic, payload=None):
+    """Send one event to the broker. Returns False if it couldn't be delivered."""
+    if not ENABLED:
+        return False
+    try:
+        conn = Client((HOST, PORT), authkey=AUTHKEY)
+    except Exception:
+        return False
+    try:
+        _send(conn, {"kind": "pub", "topic": topic, "payload": payload})
+        return True
+    except Exception:
+        return False
+    finally:
+        conn.close()
+
+
+class Subscriber:
+    """Listens for one topic and calls on_event(payload) on the Tk thread.
+
+    The connection lives on a daemon thread that reconnects (or takes over
+    as broker) every RETRY_S seconds while it is down; `connected` tells the
+    screen whether it can rely on pushes or should keep polling. Stops by
+    itself when `widget` is destroyed.
+    """
+
+    def __init__(self, widget, on_event, topic=LOAN_REQUEST):
+        self.widget = widget
+        self.on_event = on_event
+        self.topic = topic
+        self.connected = False
+        self._events = queue.Queue()
+        self._stop = threading.Event()
+        self._drain_job = None
+
+        if not ENABLED:
+            return
+        threading.Thread(target=self._run, name=f"bus-sub-{topic}", daemon=True).start()
+        self._drain_job = widget.after(DRAIN_MS, self._drain)
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def close(self):
+        self._stop.set()
+        self.connected = False
+        if self._drain_job is not None:
+            try:
+                self.widget.after_cancel(self._drain_job)
+            except Exception:
+                pass
+            self._drain_job = None
+
+    # ---------- Internals ----------
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            ensure_broker()
+            try:
+                conn = Client((HOST, PORT), authkey=AUTHKEY)
+                _send(conn, {"kind": "sub", "topic": self.topic})
+            except Exception:
+                self._stop.wait(RETRY_S)
+                continue
+
+            self.connected = True
+            try:
+                while not self._stop.is_set():
+                    if conn.poll(1.0):
+                        self._events.put(_recv(conn).get("payload"))
+            except (EOFError, OSError, ValueError):
+                pass                  # broker went away (or sent garbage)
+            finally:
+                self.connected = False
+                conn.close()
+            self._stop.wait(RETRY_S)
+
+    def _drain(self):
+        self._drain_job = None
+        while True:
+            try:
+                payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self.on_event(payload)
+            except Exception as e:
+                print(f"[ERROR] Notification handler failed: {e!r}")
+        if not self._stop.is_set():
+            self._drain_job = self.widget.after(DRAIN_MS, self._drain)
@@ -0,0 +1,132 @@
+# paged_search.py
+import tkinter as tk
+
+PAGE_SIZE = 100          # rows per page; the Treeview never holds more
+SEARCH_DELAY_MS = 300    # debounce between the last keystroke and the query
+IMPORT_POLL_MS = 200     # how often a running import's progress is shown
+
+
+class PagedSearch:
+    """Search bar with keyset paging for the admin management screens.
+
+    The screen supplies three callables:
+      fetch(term, after)  worker thread: up to PAGE_SIZE + 1 rows after key `after`
+      key_of(row)         the keyset key of a row (the next page starts after it)
+      show(rows)          Tk thread: put one page of rows in the screen's list
+    Searches are debounced, results of an older search or page are dropped,
+    and the start key of every page up to the current one is kept so Prev
+    can go back without OFFSET.
+    """
+
+    def __init__(self, parent, runner, label, fetch, key_of, show, on_error, noun="rows", first_key=None):
+        self.parent = parent
+        self.runner = runner
+        self.fetch = fetch
+        self.key_of = key_of
+        self.show = show
+        self.on_error = on_error
+        self.noun = noun
+        self.first_key = first_key
+
+        self.page_starts = [first_key]
+        self.last_key = None        # key of the last row shown
+        self.has_next = False
+        self._job = None
+        self._seq = 0
+        self._import_status = None
+        self._import_running = False
+
+        frame = tk.Frame(parent, padx=10)
+        frame.pack(fill="x")
+        tk.Label(frame, text=label).pack(side="left")
+        self.var = tk.StringVar()
+        entry = tk.Entry(frame, textvariable=self.var)
+        entry.pack(side="left", fill="x", expand=True, padx=5, ipady=3)
+        entry.bind("<KeyRelease>", self._on_key)
+        self.next_btn = tk.Button(frame, text="Next ▶", command=self.next_page, state="disabled")
+        self.next_btn.pack(side="right", padx=2)
+        self.prev_btn = tk.Button(frame, text="◀ Prev", command=self.prev_page, state="disabled")
+        self.prev_btn.pack(side="right", padx=2)
+        self.page_label = tk.Label(frame, text="", fg="#555")
+        self.page_label.pack(side="right", padx=8)
+
+    @property
+    def term(self):
+        return self.var.get().strip()
+
+    # ---------- Search and paging ----------
+    def _on_key(self, _event=None):
+        if self._job is not None:
+            self.parent.after_cancel(self._job)
+        self._job = self.parent.after(SEARCH_DELAY_MS, self.restart)
+
+    def restart(self):
+        """Back to the first page of the current search."""
+        self._job = None
+        self.page_starts = [self.first_key]
+        self.reload()
+
+    def next_page(self):
+        if self.has_next:
+            self.page_starts.append(self.last_key)
+            self.reload()
+
+    def prev_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.reload()
+
+    def reload(self):
+        """(Re)load the current page of the current search."""
+        self._seq += 1
+        seq = self._seq
+        self.runner.submit(
+            self.fetch, self.term, self.page_starts[-1],
+            on_success=lambda rows: self._loaded(seq, rows),
+            on_error=self.on_error,
+        )
+
+    def _loaded(self, seq, rows):
+        if seq != self._seq:
+            return      # a newer search or page was requested meanwhile
+        self.has_next = len(rows) > PAGE_SIZE
+        rows = rows[:PAGE_SIZE]
+        self.last_key = self.key_of(rows[-1]) if rows else None
+        self.show(rows)
+
+        page = len(self.page_starts)
+        self.page_label.config(text=f"Page {page}" + ("" if rows else f" (no {self.noun})"))
+        self.prev_btn.config(state="normal" if page > 1 else "disabled")
+        self.next_btn.config(state="normal" if self.has_next else "disabled")
+
+    # ---------- Bulk import progress ----------
+    def run_import(self, fn, *args, progress_text, on_success, on_error):
+        """Run an importer fn(*args, on_progress=...) on the runner.
+
+        Its progress is shown in the page label until it finishes; then the
+        callback runs and the list goes back to the first page.
+        """
+        self._import_status = None
+        self._import_running = True
+
+        def finished(callback, result):
+            self._import_running = False
+            callback(result)
+            self.restart()
+
+        self.runner.submit(
+            fn, *args,
+            on_progress=lambda stats: setattr(self, "_import_status", stats),
+            on_success=lambda stats: finished(on_success, stats),
+            on_error=lambda e: finished(on_error, e),
+        )
+        self._poll_import(progress_text)
+
+    def _poll_import(self, progress_text):
+        if not self.parent.winfo_exists():
+            self._import_running = False    # screen left mid-import; the result is dropped too
+            return
+        if self._import_status:
+            self.page_label.config(text=progress_text(self._import_status))
+        if self._import_running:
+            self.parent.after(IMPORT_POLL_MS, self._poll_import, progress_text)
@@ -0,0 +1,76 @@
+# startup_report.py
+import builtins
+import sys
+import threading
+import time
+
+_original_import = builtins.__import__
+_enabled = False
+_t0 = time.perf_counter()
+_local = threading.local()
+_lock = threading.Lock()
+_modules = {}   # module name -> [cumulative seconds, self seconds, thread name]
+_phases = []    # (label, seconds since start)
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Only first-time absolute imports cost anything worth reporting
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)                # time spent in nested imports
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with _lock:
+            if name not in _modules:
+                _modules[name] = [elapsed, elapsed - children, threading.current_thread().name]
+
+
+def enable():
+    """Start timing imports. Call before the heavy imports in main.py."""
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        builtins.__import__ = _timed_import
+
+
+def disable():
+    global _enabled
+    if _enabled:
+        builtins.__import__ = _original_import
+        _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def mark(label):
+    """Record a startup milestone (e.g. 'first frame drawn')."""
+    if _enabled:
+        _phases.append((label, time.perf_counter() - _t0))
+
+
+def report(top=20):
+    """Cold-start breakdown: milestones, then the slowest modules by self time."""
+    with _lock:
+        modules = sorted(_modules.items(), key=lambda kv: kv[1][1], reverse=True)
+    lines = ["=== Startup report ==="]
+    for label, at in _phases:
+        lines.append(f"{at * 1000:9.1f} ms  {label}")
+
+    total = sum(v[1] for _k, v in modules)
+    lines.append(f"--- imports: {len(modules)} modules, {total * 1000:.1f} ms self time ---")
+    lines.append(f"{'self ms':>9} {'cumul ms':>9}  module  [thread]")
+    for name, (cumulative, own, thread) in modules[:top]:
+        lines.append(f"{own * 1000:9.1f} {cumulative * 1000:9.1f}  {name}  [{thread}]")
+    return "\n".join(lines)
@@ -0,0 +1,180 @@
+# task_runner.py
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared by every screen; DB calls are I/O bound and the pool caps concurrency
+# at the connection pool size anyway.
+MAX_WORKERS = 4
+POLL_MS = 30
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="task")
+
+# Busy indicators per toplevel window: the cursor is shared, so it only goes
+# back to normal when none of the screens in that window has work running
+_busy_toplevels = {}
+
+
+class BusyIndicator:
+    """Watch cursor (and optional status label) while a screen has work running."""
+
+    def __init__(self, widget, label=None, text="Working…"):
+        self.widget = widget
+        self.label = label
+        self.text = text
+        self._count = 0
+
+    def start(self):
+        self._count += 1
+        if self._count == 1:
+            self._show(True)
+
+    def stop(self):
+        if self._count:
+            self._count -= 1
+            if self._count == 0:
+                self._show(False)
+
+    def _show(self, busy):
+        # Count per toplevel, taken when work starts: by the time it stops the
+        # screen's own widget may already be destroyed
+        if busy:
+            try:
+                self._top = self.widget.winfo_toplevel()
+            except Exception:
+                self._top = None
+        top = getattr(self, "_top", None)
+        if top is not None:
+            key = str(top)
+            count = _busy_toplevels.get(key, 0) + (1 if busy else -1)
+            _busy_toplevels[key] = max(0, count)
+            try:
+                if busy and count == 1:
+                    top.configure(cursor="watch")
+                elif not busy and count <= 0:
+                    top.configure(cursor="")
+            except Exception:
+                pass   # window already gone
+        try:
+            if self.label is not None and self.label.winfo_exists():
+                self.label.configure(text=self.text if busy else "")
+        except Exception:
+            pass
+
+
+class Task:
+    def __init__(self, future, on_success, on_error, busy=True):
+        self.future = future
+        self.on_success = on_success
+        self.on_error = on_error
+        self.busy = busy
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+
+class TaskRunner:
+    """Runs blocking calls on a worker thread and hands results back to Tk.
+
+    Workers never touch widgets: they put (task, result, error) on a queue
+    that this runner drains with widget.after() on the Tk thread, where
+    on_success(result) or on_error(exc) is called. When `widget` is
+    destroyed every pending task is cancelled and its callbacks are dropped,
+    so a screen that has been left can't be updated by a late result.
+    """
+
+    def __init__(self, widget, busy=None):
+        self.widget = widget
+        self.busy = busy or BusyIndicator(widget)
+        self._results = queue.Queue()
+        self._tasks = set()
+        self._poll_job = None
+        self._closed = False
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def submit(self, fn, *args, on_success=None, on_error=None, busy=True, **kwargs):
+        """Run fn(*args, **kwargs) off the Tk thread. Returns a cancellable Task.
+
+        busy=False keeps background work (polls the user didn't ask for)
+        from showing the watch cursor.
+        """
+        if self._closed:
+            raise RuntimeError("TaskRunner is closed")
+
+        results = self._results
+
+        def job():
+            try:
+                value = fn(*args, **kwargs)
+            except BaseException as e:
+                results.put((task, None, e))
+            else:
+                results.put((task, value, None))
+
+        task = Task(None, on_success, on_error, busy)
+        task.future = _executor.submit(job)
+        self._tasks.add(task)
+        if busy:
+            self.busy.start()
+        self._schedule_poll()
+        return task
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+            self._finish(task)
+
+    def close(self):
+        self._closed = True
+        self.cancel_all()
+        if self._poll_job is not None:
+            try:
+                self.widget.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+
+    @property
+    def pending(self):
+        return len(self._tasks)
+
+    # ---------- Internals ----------
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+
+    def _schedule_poll(self):
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.widget.after(POLL_MS, self._poll)
+
+    def _finish(self, task):
+        if task in self._tasks:
+            self._tasks.discard(task)
+            if task.busy:
+                self.busy.stop()
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                task, value, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if task not in self._tasks or task.cancelled:
+                continue
+            self._finish(task)
+            try:
+                if error is not None:
+                    if task.on_error:
+                        task.on_error(error)
+                    else:
+                        print(f"[ERROR] Background task failed: {error!r}")
+                elif task.on_success:
+                    task.on_success(value)
+            except Exception as e:
+                print(f"[ERROR] Task callback failed: {e!r}")
+            if self._closed:
+                return
+        if self._tasks:
+            self._schedule_poll()
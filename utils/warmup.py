@@ -0,0 +1,60 @@
+# warmup.py
+import threading
+import time
+
+from utils import startup_report
+
+# Screen modules the first Admin/User click would otherwise import on the Tk thread
+MODULES = [
+    "admin_panel",
+    "adminRole.lending",
+    "adminRole.returns",
+    "adminRole.ReturnReport",
+    "adminRole.book_management",
+    "adminRole.MemberManagement",
+    "user_panel",
+    "userRole.UserProfile",
+    "userRole.Book_Recommandation",
+    "userRole.Top10_Books",
+]
+
+
+def warm_up():
+    """Import the screens and load the model and artifacts ahead of first use.
+
+    Runs off the Tk thread and never touches widgets; every step is optional,
+    a failure only means that screen pays the cost when it is opened.
+    """
+    start = time.perf_counter()
+    for name in MODULES:
+        try:
+            __import__(name)
+        except Exception as e:
+            print(f"[WARNING] Warm-up import of {name} failed: {e}")
+    startup_report.mark("warm-up: screen modules imported")
+
+    try:
+        from prediction_model import load_model
+        load_model()
+        startup_report.mark("warm-up: prediction model loaded")
+    except Exception as e:
+        print(f"[WARNING] Warm-up model load failed: {e}")
+
+    try:
+        from userRole.artifact_store import get_store
+        store = get_store()
+        store.top10()
+        store.recommendation()
+        startup_report.mark("warm-up: recommendation artifacts loaded")
+    except Exception as e:
+        print(f"[WARNING] Warm-up artifact load failed: {e}")
+
+    print(f"[INFO] Warm-up finished in {time.perf_counter() - start:.2f}s")
+    if startup_report.is_enabled():
+        print(startup_report.report())
+
+
+def start_warmup():
+    t = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    t.start()
+    return t